@@ -1,4 +1,4 @@
-from smoothcrawler.components.httpio import HTTP, AsyncHTTP
+from smoothcrawler.components.httpio import HTTP, AsyncHTTP, PooledHTTP
 import requests
 import urllib3
 import aiohttp
@@ -12,16 +12,11 @@ _HTTP_Header = {
                 }
 
 
-class Urllib3HTTPRequest(HTTP):
+class Urllib3HTTPRequest(PooledHTTP):
 
-    __Http_Response = None
-
-    def get(self, url: str, *args, **kwargs):
-        _http = urllib3.PoolManager()
-        # _random_sleep = random.randrange(0, 10)
-        # time.sleep(_random_sleep)
-        self.__Http_Response = _http.request("GET", url)
-        return self.__Http_Response
+    def __init__(self):
+        # The connections are kept alive in the pools, so it doesn't create a new PoolManager for every request.
+        super().__init__(pool_size=10, headers=_HTTP_Header)
 
 
 
@@ -42,17 +37,7 @@ class AsyncHTTPRequest(AsyncHTTP):
     __Http_Response = None
 
     async def get(self, url: str, *args, **kwargs):
-        async with aiohttp.ClientSession() as _async_sess:
-            # async with _async_sess.get(url) as _resp:
-            #     print(f"[DEBUG] _resp: {_resp}")
-            #     # assert _resp.status == 200
-            #     # print(f"[DEBUG] _resp.status: {_resp.status}")
-            #     # _html = await _resp.read()
-            #     _html = await _resp.json()
-            #     print(f"[DEBUG] Result HTML: {_html}")
-            #     return _html
-            #     # return _resp
-
-            _resp = await _async_sess.get(url)
-            return _resp
+        # The session is shared by all the requests in the event loop.
+        _resp = await self.session.get(url)
+        return _resp
 
@@ -0,0 +1,35 @@
+from smoothcrawler.urls import URL
+import timeit
+
+
+Benchmark_Formatters = ["yyyymmdd", "yyyy/mm/dd", "yyyy-mm-dd HH:MM:SS", "%Y%m%d"]
+Benchmark_Symbols = [str(_symbol) for _symbol in range(1000, 6000)]
+Benchmark_Number = 20000
+
+
+def resolve_without_cache(formatter: str) -> str:
+    # The path before the formatter was cached: check and convert it every time.
+    if URL._is_py_datetime_format(formatter=formatter) is True:
+        return formatter
+    return URL._convert_formatter(formatter=formatter)
+
+
+def resolve_with_cache(formatter: str) -> str:
+    return URL._resolve_formatter(formatter=formatter, rule="DATE")[0]
+
+
+def generate_urls_per_symbol() -> None:
+    for _symbol in Benchmark_Symbols:
+        URL(base=f"https://www.example.com?code={_symbol}&date={{date}}", start="2022-06-01", end="2022-06-05", formatter="yyyy-mm-dd").generate()
+
+
+if __name__ == '__main__':
+
+    for _formatter in Benchmark_Formatters:
+        _without_cache = timeit.timeit(lambda: resolve_without_cache(_formatter), number=Benchmark_Number)
+        _with_cache = timeit.timeit(lambda: resolve_with_cache(_formatter), number=Benchmark_Number)
+        print(f"Resolve formatter '{_formatter}' {Benchmark_Number} times: "
+              f"{_without_cache:.4f} seconds without cache, {_with_cache:.4f} seconds with cache.")
+
+    _generating_time = timeit.timeit(generate_urls_per_symbol, number=1)
+    print(f"Generate URLs with {len(Benchmark_Symbols)} URL objects (one per symbol): {_generating_time:.4f} seconds.")
@@ -0,0 +1,95 @@
+from multirunnable.api import retry as _retry
+from smoothcrawler.components.httpio import HTTP, AsyncHTTP, HTTPMethod
+import asyncio
+import timeit
+import re
+
+
+Benchmark_URL = "https://www.example.com"
+Benchmark_Methods = ["GET", "post", "OPTION", HTTPMethod.HEAD]
+Benchmark_Number = 20000
+
+
+class NoOpHTTP(HTTP):
+
+    def get(self, url: str, *args, **kwargs):
+        return None
+
+
+
+class AsyncNoOpHTTP(AsyncHTTP):
+
+    async def get(self, url: str, *args, **kwargs):
+        return None
+
+
+
+class LegacyNoOpHTTP(NoOpHTTP):
+
+    # The path before the request pipeline was built once: decorate the nested closures and match
+    # the HTTP method with regular expressions in every request.
+    def request(self, url, method="GET", timeout=1, *args, **kwargs):
+
+        @_retry.function(timeout=timeout)
+        def __retry_request_process(_method="GET", _timeout=1, *_args, **_kwargs):
+            return self.__request_process(url=url, method=_method, timeout=_timeout, *_args, **_kwargs)
+
+        @__retry_request_process.initialization
+        def _before_request(*_args, **_kwargs):
+            self.before_request(*_args, **_kwargs)
+
+        @__retry_request_process.done_handling
+        def _request_done(result):
+            return self.request_done(result)
+
+        @__retry_request_process.final_handling
+        def _request_final():
+            self.request_final()
+
+        @__retry_request_process.error_handling
+        def _request_error(error):
+            return self.request_fail(error)
+
+        return __retry_request_process(method, timeout, *args, **kwargs)
+
+
+    def __request_process(self, url, method="GET", timeout=1, *args, **kwargs):
+        if re.search(r"get", method, re.IGNORECASE) or method is HTTPMethod.GET:
+            return self.get(url, *args, **kwargs)
+        elif re.search(r"post", method, re.IGNORECASE) or method is HTTPMethod.POST:
+            return self.post(url, *args, **kwargs)
+        elif re.search(r"put", method, re.IGNORECASE) or method is HTTPMethod.PUT:
+            return self.put(url, *args, **kwargs)
+        elif re.search(r"delete", method, re.IGNORECASE) or method is HTTPMethod.DELETE:
+            return self.delete(url, *args, **kwargs)
+        elif re.search(r"head", method, re.IGNORECASE) or method is HTTPMethod.HEAD:
+            return self.head(url, *args, **kwargs)
+        elif re.search(r"option", method, re.IGNORECASE) or method is HTTPMethod.OPTION:
+            return self.option(url, *args, **kwargs)
+        return TypeError(f"Invalid HTTP method it got: '{method.upper()}'.")
+
+
+
+async def send_async_requests(http: AsyncHTTP) -> None:
+    for _ in range(Benchmark_Number):
+        await http.request(url=Benchmark_URL)
+
+
+if __name__ == '__main__':
+
+    _legacy_http = LegacyNoOpHTTP()
+    _http = NoOpHTTP()
+
+    for _method in Benchmark_Methods:
+        _new_time = timeit.timeit(lambda: _http.request(url=Benchmark_URL, method=_method), number=Benchmark_Number)
+        if isinstance(_method, str):
+            _legacy_time = timeit.timeit(lambda: _legacy_http.request(url=Benchmark_URL, method=_method), number=Benchmark_Number)
+            _legacy_result = f"{_legacy_time / Benchmark_Number * 1e6:.2f} us per request before, "
+        else:
+            # The regular expressions of the legacy path cannot match a member of HTTPMethod.
+            _legacy_result = ""
+        print(f"Send {Benchmark_Number} no-op requests with method '{_method}': "
+              f"{_legacy_result}{_new_time / Benchmark_Number * 1e6:.2f} us per request after.")
+
+    _async_time = timeit.timeit(lambda: asyncio.run(send_async_requests(AsyncNoOpHTTP())), number=1)
+    print(f"Send {Benchmark_Number} no-op asynchronous requests: {_async_time / Benchmark_Number * 1e6:.2f} us per request.")
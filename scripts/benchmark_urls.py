@@ -0,0 +1,49 @@
+from smoothcrawler.urls import URL
+import smoothcrawler.urls as urls_module
+import time
+
+
+Benchmark_URL = "https://www.example.com?datetime={datetime}"
+Benchmark_Start = "20220101000000"
+Benchmark_End = "20220112134639"    # 1,000,000 values with period 1 second.
+Benchmark_Chunk_Size = 10000
+
+
+def _new_url() -> URL:
+    _url = URL(base=Benchmark_URL, start=Benchmark_Start, end=Benchmark_End, formatter="yyyymmddHHMMSS")
+    _url.set_period(days=0, hours=0, minutes=0, seconds=1)
+    return _url
+
+
+def benchmark_per_url() -> float:
+    _url = _new_url()
+    _sequence = _url.sequence()
+    _start = time.perf_counter()
+    for _index in range(len(_sequence)):
+        _sequence[_index]
+    return time.perf_counter() - _start
+
+
+def benchmark_chunks() -> float:
+    _url = _new_url()
+    _start = time.perf_counter()
+    _count = sum(len(_chunk) for _chunk in _url.iter_url_chunks(chunk_size=Benchmark_Chunk_Size))
+    assert _count == 1000000, f"It should generate 1,000,000 URLs but it got {_count}."
+    return time.perf_counter() - _start
+
+
+def benchmark_chunks_without_numpy() -> float:
+    _numpy = urls_module._numpy
+    urls_module._numpy = None
+    try:
+        return benchmark_chunks()
+    finally:
+        urls_module._numpy = _numpy
+
+
+if __name__ == '__main__':
+
+    print(f"Generate 1,000,000 datetime URLs one by one: {benchmark_per_url():.3f} seconds.")
+    if urls_module._numpy is not None:
+        print(f"Generate 1,000,000 datetime URLs chunk by chunk with numpy: {benchmark_chunks():.3f} seconds.")
+    print(f"Generate 1,000,000 datetime URLs chunk by chunk with pure Python: {benchmark_chunks_without_numpy():.3f} seconds.")
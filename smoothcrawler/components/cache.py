@@ -0,0 +1,360 @@
+from typing import Any, Dict, Tuple, Iterable, Optional, Hashable
+from collections import OrderedDict
+from hashlib import sha256
+import threading
+import tempfile
+import sqlite3
+import json
+import time
+import os
+
+from .response import ResponseSnapshot, ResponseHeaders
+
+
+class ResponseCache:
+
+    """
+    The in-memory cache of HTTP responses in front of *HTTP.request* / *AsyncHTTP.request*. The responses of HTTP
+    methods *GET* and *HEAD* are cached by HTTP method, URL and the values of the selected request headers. It
+    evicts the least recently used response if it's full, and a response expires after *ttl* seconds.
+
+    It's thread-safe, and it never waits for anything with the lock so it's also safe for coroutines. Every process
+    has its own cache with running mode *RunAsParallel*.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = None, headers: Iterable[str] = (), statuses: Iterable[int] = (200,)):
+        """
+        Configure the cache.
+
+        :param max_size: How many responses it keeps at most.
+        :param ttl: How many seconds a response is kept. It never expires if it's None (default).
+        :param headers: The names of request headers (option *headers* of *request*) which are part of the key, e.g.,
+                        ["Accept-Language"]. The requests with different values of them are cached separately.
+        :param statuses: The HTTP status of responses which could be cached.
+        """
+
+        if max_size <= 0:
+            raise ValueError("The option *max_size* should be bigger than 0.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("The option *ttl* should be bigger than 0.")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._headers = tuple(_header.lower() for _header in headers)
+        self._statuses = frozenset(statuses)
+
+        self._responses: "OrderedDict[Hashable, Tuple[float, ResponseSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+    @property
+    def hits(self) -> int:
+        """
+        How many times it got the response from the cache.
+
+        :return: An int type value.
+        """
+
+        return self._hits
+
+
+    @property
+    def misses(self) -> int:
+        """
+        How many times it didn't have the response (or the response has expired).
+
+        :return: An int type value.
+        """
+
+        return self._misses
+
+
+    @property
+    def evictions(self) -> int:
+        """
+        How many responses it evicted because it's full.
+
+        :return: An int type value.
+        """
+
+        return self._evictions
+
+
+    def key(self, method: str, url: str, headers: Optional[Dict[str, str]] = None) -> Hashable:
+        """
+        The key of the HTTP request.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param headers: The request headers.
+        :return: A hashable key.
+        """
+
+        if not self._headers:
+            return method, url
+        _headers = {str(_name).lower(): _value for _name, _value in (headers or {}).items()}
+        return (method, url) + tuple(_headers.get(_name) for _name in self._headers)
+
+
+    def is_cacheable(self, status: Optional[int]) -> bool:
+        """
+        Check whether the response could be cached.
+
+        :param status: The HTTP status of response.
+        :return: It returns True if the HTTP status could be cached, or it returns False.
+        """
+
+        return status in self._statuses
+
+
+    def get(self, key: Hashable) -> Optional[ResponseSnapshot]:
+        """
+        Get the response which isn't expired.
+
+        :param key: The key of the HTTP request.
+        :return: A **ResponseSnapshot** object, or None if it doesn't have the response.
+        """
+
+        with self._lock:
+            _entry = self._responses.get(key)
+            if _entry is not None and _entry[0] < time.monotonic():
+                del self._responses[key]
+                _entry = None
+            if _entry is None:
+                self._misses += 1
+                return None
+            self._responses.move_to_end(key)
+            self._hits += 1
+            return _entry[1]
+
+
+    def set(self, key: Hashable, snapshot: ResponseSnapshot) -> None:
+        """
+        Keep the response, and evict the least recently used one if it's full.
+
+        :param key: The key of the HTTP request.
+        :param snapshot: The snapshot of response.
+        :return: None
+        """
+
+        _expires = time.monotonic() + self._ttl if self._ttl is not None else float("inf")
+        with self._lock:
+            self._responses[key] = (_expires, snapshot)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self._max_size:
+                self._responses.popitem(last=False)
+                self._evictions += 1
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state.update(_lock=None)
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+
+class DiskResponseCache:
+
+    """
+    The persistent cache of HTTP responses on disk which revalidates the responses with their validators. The
+    responses of *GET* which have header *ETag* or *Last-Modified* are stored, and the later HTTP request of the
+    same URL is sent with header *If-None-Match* / *If-Modified-Since*. If the server responds 304 (Not Modified),
+    the stored response is served as a 200 one, so it only costs the headers to crawl an unchanged page again.
+
+    The bodies are content-addressed files (the same body is only stored once) and the index is a SQLite file, so
+    all the processes of running mode *RunAsParallel* (and the later crawls) share the cache.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache directory.
+
+        :param path: The path of cache directory.
+        """
+
+        self._path = path
+        self._bodies_path = os.path.join(path, "bodies")
+        os.makedirs(self._bodies_path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        with self._connect() as _connection:
+            _connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, url TEXT NOT NULL, headers TEXT NOT NULL, digest TEXT NOT NULL, stored REAL NOT NULL)")
+
+
+    @property
+    def path(self) -> str:
+        """
+        The path of cache directory.
+
+        :return: A string type value.
+        """
+
+        return self._path
+
+
+    @property
+    def hits(self) -> int:
+        """
+        How many times the server responded 304 and it served the stored response in this process.
+
+        :return: An int type value.
+        """
+
+        return self._hits
+
+
+    @property
+    def misses(self) -> int:
+        """
+        How many times it revalidated the stored response but it had been modified in this process.
+
+        :return: An int type value.
+        """
+
+        return self._misses
+
+
+    def get(self, url: str, method: str = "GET") -> Optional[ResponseSnapshot]:
+        """
+        Get the stored response.
+
+        :param url: URL.
+        :param method: HTTP method.
+        :return: A **ResponseSnapshot** object, or None if it doesn't have the response.
+        """
+
+        with self._lock:
+            _row = self._connect().execute(
+                "SELECT headers, digest FROM responses WHERE key = ?", (f"{method} {url}",)).fetchone()
+        if _row is None:
+            return None
+        try:
+            with open(self._body_path(_row[1]), "rb") as _body_file:
+                _body = _body_file.read()
+        except FileNotFoundError:
+            return None
+        _headers = tuple(tuple(_header) for _header in json.loads(_row[0]))
+        return ResponseSnapshot(url=url, status=200, headers=_headers, body=_body)
+
+
+    def set(self, snapshot: ResponseSnapshot, method: str = "GET") -> bool:
+        """
+        Store the response if it's a 200 one and it has header *ETag* or *Last-Modified*.
+
+        :param snapshot: The snapshot of response.
+        :param method: HTTP method.
+        :return: It returns True if it has stored the response, or it returns False.
+        """
+
+        if snapshot.status != 200 or not DiskResponseCache.conditional_headers(snapshot):
+            return False
+
+        _digest = sha256(snapshot.body).hexdigest()
+        _body_path = self._body_path(_digest)
+        if not os.path.exists(_body_path):
+            os.makedirs(os.path.dirname(_body_path), exist_ok=True)
+            # Write it to a temporary file and rename it, so the other processes never read a partial body.
+            _fd, _temporary_path = tempfile.mkstemp(dir=self._bodies_path)
+            with os.fdopen(_fd, "wb") as _body_file:
+                _body_file.write(snapshot.body)
+            os.replace(_temporary_path, _body_path)
+
+        with self._lock:
+            with self._connect() as _connection:
+                _connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, url, headers, digest, stored) VALUES (?, ?, ?, ?, ?)",
+                    (f"{method} {snapshot.url}", snapshot.url, json.dumps(snapshot.headers), _digest, time.time()))
+        return True
+
+
+    def revalidate(self, stored: ResponseSnapshot, status: Optional[int]) -> Optional[ResponseSnapshot]:
+        """
+        Check the HTTP status of the conditional HTTP request.
+
+        :param stored: The stored response whose validators were sent.
+        :param status: The HTTP status of response.
+        :return: The stored response if the server responded 304 (Not Modified), or None.
+        """
+
+        if status == 304:
+            self._hits += 1
+            return stored
+        self._misses += 1
+        return None
+
+
+    @staticmethod
+    def conditional_headers(snapshot: ResponseSnapshot) -> Dict[str, str]:
+        """
+        The headers of conditional HTTP request which are built from the validators of the response.
+
+        :param snapshot: The snapshot of response.
+        :return: A dict of headers *If-None-Match* and *If-Modified-Since*. It's empty if it doesn't have validators.
+        """
+
+        _headers = ResponseHeaders(snapshot.headers)
+        _conditional_headers = {}
+        if "ETag" in _headers:
+            _conditional_headers["If-None-Match"] = _headers["ETag"]
+        if "Last-Modified" in _headers:
+            _conditional_headers["If-Modified-Since"] = _headers["Last-Modified"]
+        return _conditional_headers
+
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get the SQLite connection of the current process. The connection which is inherited from the parent
+        process cannot be used, so every process opens its own one.
+
+        :return: A *sqlite3.Connection* object.
+        """
+
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(os.path.join(self._path, "index.sqlite"), timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection_pid = os.getpid()
+        return self._connection
+
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self._bodies_path, digest[:2], digest)
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state.update(_lock=None, _connection=None, _connection_pid=None)
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
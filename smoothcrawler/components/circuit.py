@@ -0,0 +1,187 @@
+from typing import Any, Dict, List, Iterable, Optional
+from urllib.parse import urlsplit
+import threading
+import time
+
+from .response import _response_status
+
+
+# The least seconds the requests wait while the probe is being sent, so they aren't retried at once with cool-down 0.
+_Min_Probe_Wait = 0.1
+
+
+class CircuitOpenError(Exception):
+
+    """
+    The HTTP request isn't sent because the circuit of the host is open. Property *retry_after* is the seconds until
+    the circuit lets a probe through, so the URL could be deferred instead of being dropped.
+    """
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"The circuit of host '{host}' is open, it could be retried after {retry_after:.2f} seconds.")
+        self.host = host
+        self.retry_after = retry_after
+
+
+
+class CircuitBreaker:
+
+    """
+    The per-host circuit breaker of *HTTP* sender. It counts the consecutive failures (the exceptions which
+    *request_fail* gets, and the HTTP status of *statuses*) of every host. The circuit of the host opens after
+    *failure_threshold* failures, and the later requests of the host fail fast with **CircuitOpenError** without
+    sending anything. After *cool_down* seconds, it lets one request through as a probe (half-open), the circuit
+    closes if the probe succeeds, or it opens again. The other requests wait another *cool_down* seconds (at least 0.1
+    seconds) while the probe is being sent.
+
+    It's thread-safe, and it never waits for anything with the lock so it's also safe for coroutines. Every process
+    has its own circuits with running mode *RunAsParallel*.
+    """
+
+    _Closed = "closed"
+    _Open = "open"
+    _Half_Open = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, cool_down: float = 30.0, statuses: Iterable[int] = ()):
+        """
+        Configure the circuit breaker.
+
+        :param failure_threshold: How many consecutive failures of one host open its circuit.
+        :param cool_down: How many seconds the circuit keeps open before it lets a probe through.
+        :param statuses: The HTTP status which are regarded as failures, e.g., (502, 503, 504). It's empty in default,
+                         only the exceptions are failures.
+        """
+
+        if failure_threshold <= 0:
+            raise ValueError("The option *failure_threshold* should be bigger than 0.")
+        if cool_down < 0:
+            raise ValueError("The option *cool_down* should be bigger than or equal to 0.")
+        self._failure_threshold = failure_threshold
+        self._cool_down = cool_down
+        self._statuses = frozenset(statuses)
+
+        # The circuit of a host: [state, consecutive failures, the time it opened, whether a probe is being sent].
+        self._circuits: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+
+    @property
+    def failure_threshold(self) -> int:
+        """
+        How many consecutive failures of one host open its circuit.
+
+        :return: An int type value.
+        """
+
+        return self._failure_threshold
+
+
+    @property
+    def cool_down(self) -> float:
+        """
+        How many seconds the circuit keeps open before it lets a probe through.
+
+        :return: A float type value.
+        """
+
+        return self._cool_down
+
+
+    def state(self, url: str) -> str:
+        """
+        The state of the circuit of the host of URL.
+
+        :param url: URL.
+        :return: One of "closed", "open" and "half-open".
+        """
+
+        _circuit = self._circuits.get(_host_of(url))
+        return _circuit[0] if _circuit is not None else CircuitBreaker._Closed
+
+
+    def allow(self, url: str) -> Optional[CircuitOpenError]:
+        """
+        Check whether it could send the HTTP request of URL. It lets the first request after the cool-down through
+        as the probe.
+
+        :param url: URL.
+        :return: None if it could send the HTTP request, or a **CircuitOpenError** object.
+        """
+
+        _host = _host_of(url)
+        with self._lock:
+            _circuit = self._circuits.get(_host)
+            if _circuit is None or _circuit[0] == CircuitBreaker._Closed:
+                return None
+            _retry_after = _circuit[2] + self._cool_down - time.monotonic()
+            if _circuit[0] == CircuitBreaker._Open and _retry_after <= 0:
+                _circuit[0] = CircuitBreaker._Half_Open
+            if _circuit[0] == CircuitBreaker._Half_Open:
+                if _circuit[3] is False:
+                    _circuit[3] = True
+                    return None
+                # The probe is being sent, so don't retry at once and use up the retries before it's done.
+                _retry_after = max(self._cool_down, _Min_Probe_Wait)
+        return CircuitOpenError(_host, _retry_after)
+
+
+    def record(self, url: str, response: Any = None, error: BaseException = None) -> None:
+        """
+        Record the result of the HTTP request which *allow* let through.
+
+        :param url: URL.
+        :param response: The HTTP response it got.
+        :param error: The exception it got when it sent the HTTP request.
+        :return: None
+        """
+
+        _failed = error is not None or _response_status(response) in self._statuses
+        _host = _host_of(url)
+        with self._lock:
+            _circuit = self._circuits.get(_host)
+            if _failed is False:
+                if _circuit is not None:
+                    del self._circuits[_host]
+                return
+            if _circuit is None:
+                _circuit = self._circuits[_host] = [CircuitBreaker._Closed, 0, 0.0, False]
+            _circuit[1] += 1
+            if _circuit[0] == CircuitBreaker._Half_Open or _circuit[1] >= self._failure_threshold:
+                _circuit[0], _circuit[2], _circuit[3] = CircuitBreaker._Open, time.monotonic(), False
+
+
+    def cancel(self, url: str) -> None:
+        """
+        The HTTP request which *allow* let through is cancelled without result. If it's the probe, the next request
+        becomes the probe.
+
+        :param url: URL.
+        :return: None
+        """
+
+        with self._lock:
+            _circuit = self._circuits.get(_host_of(url))
+            if _circuit is not None:
+                _circuit[3] = False
+
+
+    def reset(self) -> None:
+        with self._lock:
+            self._circuits.clear()
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state.update(_lock=None, _circuits={})
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+
+def _host_of(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
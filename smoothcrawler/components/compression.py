@@ -0,0 +1,154 @@
+from typing import Any, Dict, Mapping, Optional, Tuple
+import threading
+
+try:
+    import urllib3 as _urllib3
+except ImportError:
+    _urllib3 = None
+
+
+def accept_encoding() -> str:
+    """
+    The content codings which could be decoded, for header *Accept-Encoding*. It's *gzip* and *deflate*, and *br*
+    and *zstd* are included if their native codecs (package *brotli* or *brotlicffi*, and *zstd* of Python 3.14 or
+    package *backports.zstd*) are installed. It follows *urllib3* which decodes the HTTP response, so it only has
+    *gzip* and *deflate* without *urllib3*.
+
+    :return: A string value, e.g., "gzip, deflate, br, zstd".
+    """
+
+    if _urllib3 is None:
+        return "gzip, deflate"
+    return ", ".join(_urllib3.util.request.ACCEPT_ENCODING.split(","))
+
+
+
+class ByteCounter:
+
+    """
+    The byte counter of *HTTP* sender. It records how many bytes of HTTP response bodies it receives on the wire
+    (compressed) and how many bytes they're decoded to, so the saving of compression could be measured. It's
+    thread-safe, and every process has its own counts with running mode *RunAsParallel*.
+    """
+
+    def __init__(self):
+        self._wire_bytes = 0
+        self._decoded_bytes = 0
+        self._responses = 0
+        self._lock = threading.Lock()
+
+
+    @property
+    def wire_bytes(self) -> int:
+        """
+        How many bytes of HTTP response bodies it has received on the wire.
+
+        :return: An int type value.
+        """
+
+        return self._wire_bytes
+
+
+    @property
+    def decoded_bytes(self) -> int:
+        """
+        How many bytes the HTTP response bodies have been decoded to.
+
+        :return: An int type value.
+        """
+
+        return self._decoded_bytes
+
+
+    @property
+    def responses(self) -> int:
+        """
+        How many HTTP responses it has counted.
+
+        :return: An int type value.
+        """
+
+        return self._responses
+
+
+    @property
+    def ratio(self) -> float:
+        """
+        The compression ratio, i.e., the decoded bytes divided by the bytes on the wire.
+
+        :return: A float type value. It's 1.0 if it hasn't received anything.
+        """
+
+        return self._decoded_bytes / self._wire_bytes if self._wire_bytes > 0 else 1.0
+
+
+    def record(self, wire_bytes: int, decoded_bytes: int) -> None:
+        """
+        Record the sizes of a HTTP response body.
+
+        :param wire_bytes: The bytes it received on the wire.
+        :param decoded_bytes: The bytes it has been decoded to.
+        :return: None
+        """
+
+        with self._lock:
+            self._wire_bytes += wire_bytes
+            self._decoded_bytes += decoded_bytes
+            self._responses += 1
+
+
+    def reset(self) -> None:
+        with self._lock:
+            self._wire_bytes = self._decoded_bytes = self._responses = 0
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state.update(_lock=None, _wire_bytes=0, _decoded_bytes=0, _responses=0)
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+
+def _with_accept_encoding(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """
+    Add header *Accept-Encoding* to the headers if they don't have it.
+
+    :param headers: The headers of HTTP request.
+    :return: A new dict of headers.
+    """
+
+    _headers = dict(headers or {})
+    if not any(_name.lower() == "accept-encoding" for _name in _headers):
+        _headers["Accept-Encoding"] = accept_encoding()
+    return _headers
+
+
+def _response_bytes(response: Any) -> Optional[Tuple[int, int]]:
+    """
+    Get the sizes of the body of HTTP response which has been read. It supports the response objects of *urllib3*
+    (with *preload_content*), *requests* and *aiohttp*.
+
+    :param response: A HTTP response object.
+    :return: A tuple of the bytes on the wire and the decoded bytes, or None if the body hasn't been read.
+    """
+
+    _body = getattr(response, "_body", None)
+    if not isinstance(_body, bytes):
+        # The response of *requests*.
+        _body = getattr(response, "_content", None)
+    if not isinstance(_body, bytes):
+        return None
+
+    # *aiohttp* counts the compressed bytes of the stream, *urllib3* counts the bytes it pulls over the wire.
+    _wire_bytes = getattr(getattr(response, "content", None), "total_raw_bytes", None)
+    if not isinstance(_wire_bytes, int):
+        _tell = getattr(getattr(response, "raw", response), "tell", None)
+        _wire_bytes = _tell() if callable(_tell) else None
+    if not isinstance(_wire_bytes, int) or _wire_bytes <= 0:
+        _wire_bytes = len(_body)
+    return _wire_bytes, len(_body)
@@ -0,0 +1,235 @@
+from typing import List, Optional
+import threading
+import asyncio
+import weakref
+import math
+import time
+
+from .deadline import _get_running_loop
+
+
+class _AIMDOptions:
+
+    """
+    The additive-increase / multiplicative-decrease (AIMD) algorithm of the concurrency limit. It checks the
+    latency percentile and the error rate of every *window* requests. The limit is multiplied by *decrease* if
+    the server looks overloaded, or it's increased by *increase*.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 1,
+                 min_limit: int = 1,
+                 max_limit: int = 100,
+                 increase: float = 1.0,
+                 decrease: float = 0.5,
+                 window: int = 20,
+                 latency_percentile: float = 0.9,
+                 latency_threshold: float = None,
+                 error_rate_threshold: float = 0.1):
+        """
+        Check the options.
+
+        :param initial_limit: The concurrency limit at the beginning.
+        :param min_limit: The lowest concurrency limit.
+        :param max_limit: The highest concurrency limit. It's meaningless to be bigger than the number of executors.
+        :param increase: How many it adds to the limit if the server isn't overloaded.
+        :param decrease: The ratio it multiplies the limit by if the server is overloaded. It should be in range 0 to 1 (excluded).
+        :param window: How many requests it checks every time it adjusts the limit.
+        :param latency_percentile: The latency percentile it checks, e.g., 0.9 is p90.
+        :param latency_threshold: The server is overloaded if the latency percentile (seconds) is bigger than it. In
+                                  default, it's double of the lowest latency percentile it has seen.
+        :param error_rate_threshold: The server is overloaded if the rate of errors, HTTP status 429 and 503 is
+                                     bigger than it.
+        """
+
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("The concurrency limits should satisfy 1 <= min_limit <= initial_limit <= max_limit.")
+        if increase <= 0:
+            raise ValueError("The option *increase* should be bigger than 0.")
+        if not 0 < decrease < 1:
+            raise ValueError("The option *decrease* should be in range 0 to 1 (excluded).")
+        if window <= 0:
+            raise ValueError("The option *window* should be bigger than 0.")
+        if not 0 < latency_percentile <= 1:
+            raise ValueError("The option *latency_percentile* should be in range 0 (excluded) to 1.")
+
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase = increase
+        self._decrease = decrease
+        self._window = window
+        self._latency_percentile = latency_percentile
+        self._latency_threshold = latency_threshold
+        self._error_rate_threshold = error_rate_threshold
+
+        self._in_flight = 0
+        self._latencies: List[float] = []
+        self._overloaded_number = 0
+        self._lowest_latency: Optional[float] = None
+
+
+    @property
+    def limit(self) -> int:
+        """
+        How many requests it could send at the same time currently.
+
+        :return: An int type value.
+        """
+
+        return int(self._limit)
+
+
+    @property
+    def in_flight(self) -> int:
+        """
+        How many requests are being sent currently.
+
+        :return: An int type value.
+        """
+
+        return self._in_flight
+
+
+    def _record(self, latency: float, overloaded: bool) -> None:
+        """
+        Record the result of one request, and adjust the limit if it has recorded a window of requests. It should
+        be called with the lock.
+
+        :param latency: The seconds of sending the request.
+        :param overloaded: Whether it got an error or a HTTP status which means the server is overloaded.
+        :return: None
+        """
+
+        self._latencies.append(latency)
+        self._overloaded_number += overloaded
+        if len(self._latencies) < self._window:
+            return
+
+        _latencies = sorted(self._latencies)
+        _latency = _latencies[min(len(_latencies) - 1, math.ceil(len(_latencies) * self._latency_percentile) - 1)]
+        _error_rate = self._overloaded_number / len(_latencies)
+        self._latencies = []
+        self._overloaded_number = 0
+
+        if self._latency_threshold is not None:
+            _latency_threshold = self._latency_threshold
+        else:
+            self._lowest_latency = _latency if self._lowest_latency is None else min(self._lowest_latency, _latency)
+            _latency_threshold = self._lowest_latency * 2
+
+        if _error_rate > self._error_rate_threshold or _latency > _latency_threshold:
+            self._limit = max(float(self._min_limit), self._limit * self._decrease)
+        else:
+            self._limit = min(float(self._max_limit), self._limit + self._increase)
+
+
+
+class AIMDController(_AIMDOptions):
+
+    """
+    The adaptive concurrency controller of *HTTP* sender. It limits how many requests are being sent at the same
+    time, and adjusts the limit by the latency and errors of requests with additive-increase / multiplicative-decrease,
+    so the crawler stays near the capacity of server without tuning the number of executors for every site.
+
+    It's thread-safe for running mode *RunAsConcurrent*. Every process has its own controller with *RunAsParallel*.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = threading.Condition()
+
+
+    def acquire(self) -> float:
+        """
+        Block until the number of requests being sent is less than the limit.
+
+        :return: The time it starts to send the request, it should be passed to *release*.
+        """
+
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+
+    def release(self, started: float, overloaded: bool = False) -> None:
+        """
+        Record the request which is done and let the waiting requests go.
+
+        :param started: The time which *acquire* returns.
+        :param overloaded: Whether it got an error or a HTTP status which means the server is overloaded.
+        :return: None
+        """
+
+        _latency = time.monotonic() - started
+        with self._condition:
+            self._in_flight -= 1
+            self._record(_latency, overloaded)
+            self._condition.notify_all()
+
+
+    def __getstate__(self):
+        _state = self.__dict__.copy()
+        _state.update(_condition=None, _in_flight=0)
+        return _state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._condition = threading.Condition()
+
+
+
+class AsyncAIMDController(_AIMDOptions):
+
+    """
+    Asynchronous version of **AIMDController** for *AsyncHTTP* / *AsyncSimpleCrawler*. The coroutines wait for the
+    limit without blocking the event loop.
+    """
+
+    _Conditions: weakref.WeakKeyDictionary = None
+
+    async def acquire(self) -> float:
+        """
+        Asynchronous version of *AIMDController.acquire*.
+
+        :return: The time it starts to send the request, it should be passed to *release*.
+        """
+
+        _condition = self._condition
+        async with _condition:
+            await _condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+        return time.monotonic()
+
+
+    async def release(self, started: float, overloaded: bool = False) -> None:
+        """
+        Asynchronous version of *AIMDController.release*.
+
+        :param started: The time which *acquire* returns.
+        :param overloaded: Whether it got an error or a HTTP status which means the server is overloaded.
+        :return: None
+        """
+
+        _latency = time.monotonic() - started
+        _condition = self._condition
+        async with _condition:
+            self._in_flight -= 1
+            self._record(_latency, overloaded)
+            _condition.notify_all()
+
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        # An asyncio condition belongs to one event loop, and the crawler may run every batch in a new loop.
+        _loop = _get_running_loop()
+        if self._Conditions is None:
+            self._Conditions = weakref.WeakKeyDictionary()
+        _condition = self._Conditions.get(_loop)
+        if _condition is None:
+            _condition = asyncio.Condition()
+            self._Conditions[_loop] = _condition
+        return _condition
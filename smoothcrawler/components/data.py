@@ -1,7 +1,9 @@
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator, AsyncIterator
 from http import HTTPStatus
 from abc import ABCMeta, abstractmethod
 
+from .response import Default_Chunk_Size, iter_chunks, aiter_chunks
+
 
 T = TypeVar("T")
 
@@ -113,6 +115,111 @@ class BaseAsyncHTTPResponseParser(BaseHTTPResponseParser):
 
 
 
+class BaseStreamHTTPResponseParser(BaseHTTPResponseParser):
+
+    """
+    The HTTP response parser which handles the body of 200 response chunk by chunk, so the peak memory is set by
+    the chunk size instead of the size of the response. It needs the *HTTP* sender which doesn't read the body
+    before parsing, e.g., **PooledHTTP** with property *stream* is True.
+    """
+
+    _Chunk_Size: int = Default_Chunk_Size
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        The most bytes of one chunk. It's 64 KiB in default.
+
+        :return: An int type value.
+        """
+
+        return self._Chunk_Size
+
+
+    @chunk_size.setter
+    def chunk_size(self, size: int) -> None:
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("The chunk size should be an int type value which is bigger than 0.")
+        self._Chunk_Size = size
+
+
+    def handling_200_response(self, response) -> Generic[T]:
+        """
+        Hand the chunks of the body to *handling_200_chunks*.
+
+        :param response: The HTTP response object.
+        :return: The data which has been parsed from the chunks.
+        """
+
+        return self.handling_200_chunks(response=response, chunks=iter_chunks(response, self._Chunk_Size))
+
+
+    @abstractmethod
+    def handling_200_chunks(self, response, chunks: Iterator[bytes]) -> Generic[T]:
+        """
+        Handle the body of HTTP response incrementally if it's HTTP status code is 200.
+
+        :param response: The HTTP response object. Its body is read by *chunks*, it shouldn't be read again.
+        :param chunks: The iterator of the chunks of the body.
+        :return: The data which has been parsed from the chunks.
+        """
+
+        pass
+
+
+
+class BaseAsyncStreamHTTPResponseParser(BaseAsyncHTTPResponseParser):
+
+    """
+    Asynchronous version of **BaseStreamHTTPResponseParser**, e.g., for *AsyncHTTP* whose implementations of HTTP
+    methods don't read the body of the response of *aiohttp*.
+    """
+
+    _Chunk_Size: int = Default_Chunk_Size
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        The most bytes of one chunk. It's 64 KiB in default.
+
+        :return: An int type value.
+        """
+
+        return self._Chunk_Size
+
+
+    @chunk_size.setter
+    def chunk_size(self, size: int) -> None:
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("The chunk size should be an int type value which is bigger than 0.")
+        self._Chunk_Size = size
+
+
+    async def handling_200_response(self, response) -> Generic[T]:
+        """
+        The asynchronous version of *BaseStreamHTTPResponseParser.handling_200_response*.
+
+        :param response: The HTTP response object.
+        :return: The data which has been parsed from the chunks.
+        """
+
+        return await self.handling_200_chunks(response=response, chunks=aiter_chunks(response, self._Chunk_Size))
+
+
+    @abstractmethod
+    async def handling_200_chunks(self, response, chunks: AsyncIterator[bytes]) -> Generic[T]:
+        """
+        The asynchronous version of *BaseStreamHTTPResponseParser.handling_200_chunks*.
+
+        :param response: The HTTP response object. Its body is read by *chunks*, it shouldn't be read again.
+        :param chunks: The asynchronous iterator of the chunks of the body.
+        :return: The data which has been parsed from the chunks.
+        """
+
+        pass
+
+
+
 class BaseDataHandler(metaclass=ABCMeta):
 
     @abstractmethod
@@ -0,0 +1,275 @@
+from typing import Any, Callable, Iterator, Optional, Tuple, Union
+from contextlib import contextmanager
+from functools import partial
+import threading
+import asyncio
+import time
+
+try:
+    from contextvars import ContextVar, copy_context
+except ImportError:
+    # Python 3.6 doesn't have *contextvars*, so the deadline is kept per thread (see *_ThreadLocalVar*).
+    ContextVar, copy_context = None, None
+
+
+class DeadlineExceededError(TimeoutError):
+
+    """
+    The deadline has been exceeded, so it doesn't go on with the next step (e.g., sending HTTP request again,
+    parsing the HTTP response or doing data process).
+    """
+
+    def __init__(self, step: str):
+        super().__init__(f"The deadline has been exceeded before {step}.")
+        self.step = step
+
+
+
+class Timeouts:
+
+    """
+    The timeouts of *HTTP* sender. They're separate from option *timeout* of *request* which is how many times it
+    retries to send HTTP request.
+
+    * *connect*: The seconds it waits for connecting to the host.
+    * *read*: The seconds it waits between 2 reads of the HTTP response (the socket is idle).
+    * *total*: The seconds budget of one call of *request*, all the retries share it.
+
+    Each of them could be None, which means no limit.
+    """
+
+    def __init__(self, connect: Optional[float] = None, read: Optional[float] = None, total: Optional[float] = None):
+        """
+        Configure the timeouts.
+
+        :param connect: The seconds it waits for connecting to the host.
+        :param read: The seconds it waits between 2 reads of the HTTP response.
+        :param total: The seconds budget of one call of *request*, including the retries.
+        """
+
+        for _name, _seconds in (("connect", connect), ("read", read), ("total", total)):
+            if _seconds is not None and _seconds <= 0:
+                raise ValueError(f"The option *{_name}* should be bigger than 0 or None.")
+        self._connect = connect
+        self._read = read
+        self._total = total
+
+
+    @property
+    def connect(self) -> Optional[float]:
+        """
+        The seconds it waits for connecting to the host.
+
+        :return: A float type value or None.
+        """
+
+        return self._connect
+
+
+    @property
+    def read(self) -> Optional[float]:
+        """
+        The seconds it waits between 2 reads of the HTTP response.
+
+        :return: A float type value or None.
+        """
+
+        return self._read
+
+
+    @property
+    def total(self) -> Optional[float]:
+        """
+        The seconds budget of one call of *request*, including the retries.
+
+        :return: A float type value or None.
+        """
+
+        return self._total
+
+
+
+class Deadline:
+
+    """
+    A point in time which the work should be done before. The deadline of the running code is kept in a context
+    variable by *deadline_scope*, so it's carried through the HTTP sender (the retries and the connect/read
+    timeouts), the parser and the data handler without passing it around. The threads and the tasks which are
+    created in the scope (e.g., by *request_many* or the hedging policy) also have it.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        The deadline after the seconds from now.
+
+        :param seconds: How many seconds from now.
+        """
+
+        if seconds <= 0:
+            raise ValueError("The seconds of deadline should be bigger than 0.")
+        self._expires_at = time.monotonic() + seconds
+
+
+    @staticmethod
+    def current() -> Optional["Deadline"]:
+        """
+        The deadline of the running code.
+
+        :return: A **Deadline** object or None if there isn't any deadline.
+        """
+
+        return _Current_Deadline.get()
+
+
+    @staticmethod
+    def after(seconds: Optional[float]) -> Optional["Deadline"]:
+        """
+        The deadline after the seconds from now.
+
+        :param seconds: How many seconds from now. It could be None.
+        :return: A **Deadline** object or None if *seconds* is None.
+        """
+
+        return Deadline(seconds) if seconds is not None else None
+
+
+    def remaining(self) -> float:
+        """
+        The seconds until the deadline.
+
+        :return: A float type value. It's 0 if the deadline has been exceeded.
+        """
+
+        return max(0.0, self._expires_at - time.monotonic())
+
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+
+    def cap(self, seconds: Optional[float]) -> float:
+        """
+        Cap the timeout by the seconds until the deadline.
+
+        :param seconds: The timeout. It means no limit if it's None.
+        :return: The smaller one of *seconds* and the remaining seconds.
+        """
+
+        _remaining = self.remaining()
+        return _remaining if seconds is None else min(seconds, _remaining)
+
+
+    def check(self, step: str) -> None:
+        """
+        Raise **DeadlineExceededError** if the deadline has been exceeded.
+
+        :param step: The step it's going to do, it's shown in the error message.
+        :return: None
+        """
+
+        if self.expired():
+            raise DeadlineExceededError(step)
+
+
+
+class _ThreadLocalVar(threading.local):
+
+    """
+    The fallback of *ContextVar* on Python 3.6. Every thread has its own value, so the coroutines of one event loop
+    share the deadline of the event loop instead of having their own ones.
+    """
+
+    def __init__(self, name: str, default: Any = None):
+        self.name = name
+        self.value = default
+
+
+    def get(self) -> Any:
+        return self.value
+
+
+    def set(self, value: Any) -> Any:
+        _token, self.value = self.value, value
+        return _token
+
+
+    def reset(self, token: Any) -> None:
+        self.value = token
+
+
+
+if ContextVar is not None:
+    _Current_Deadline: "ContextVar[Optional[Deadline]]" = ContextVar("smoothcrawler_deadline", default=None)
+else:
+    _Current_Deadline: "_ThreadLocalVar" = _ThreadLocalVar("smoothcrawler_deadline", default=None)
+
+# *asyncio.get_running_loop* is new in Python 3.7, *asyncio.get_event_loop* also gets the running loop in a coroutine.
+_get_running_loop: Callable[[], asyncio.AbstractEventLoop] = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+@contextmanager
+def deadline_scope(deadline: Union[Deadline, float, None]) -> Iterator[Optional[Deadline]]:
+    """
+    Run the code in the block with the deadline. If it's already in a scope of an earlier deadline, the earlier one
+    is kept, so a deadline of the whole job caps the deadline of every URL.
+
+    :param deadline: A **Deadline** object, or the seconds from now. It doesn't change anything if it's None.
+    :return: The deadline of the block. It's None if there isn't any deadline.
+    """
+
+    if isinstance(deadline, (int, float)):
+        deadline = Deadline(deadline)
+    _outer = _Current_Deadline.get()
+    if deadline is None or (_outer is not None and _outer._expires_at <= deadline._expires_at):
+        yield _outer
+        return
+
+    _token = _Current_Deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _Current_Deadline.reset(_token)
+
+
+def check_deadline(step: str) -> None:
+    """
+    Raise **DeadlineExceededError** if the deadline of the running code has been exceeded.
+
+    :param step: The step it's going to do, it's shown in the error message.
+    :return: None
+    """
+
+    _deadline = _Current_Deadline.get()
+    if _deadline is not None:
+        _deadline.check(step)
+
+
+def _in_current_context(function: Callable) -> Callable:
+    """
+    Bind the function to the deadline of the running code, so it's kept when the function runs in the other thread.
+
+    :param function: The function which runs in the other thread.
+    :return: A function with the same arguments.
+    """
+
+    if copy_context is not None:
+        return partial(copy_context().run, function)
+
+    _deadline = _Current_Deadline.get()
+
+    def _run(*args, **kwargs) -> Any:
+        _token = _Current_Deadline.set(_deadline)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _Current_Deadline.reset(_token)
+
+    return _run
+
+
+def _socket_timeouts(timeouts: Optional[Timeouts]) -> Tuple[Optional[float], Optional[float]]:
+    _connect, _read = (timeouts.connect, timeouts.read) if timeouts is not None else (None, None)
+    _deadline = _Current_Deadline.get()
+    if _deadline is None:
+        return _connect, _read
+    return _deadline.cap(_connect), _deadline.cap(_read)
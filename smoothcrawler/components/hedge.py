@@ -0,0 +1,127 @@
+from typing import Any, Dict, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+import threading
+import math
+import os
+
+
+class HedgePolicy:
+
+    """
+    The hedging policy of *HTTP* sender. If a HTTP request of *GET* or *HEAD* hasn't finished after the latency
+    percentile of the recent requests, it sends a duplicate one and uses whichever response arrives first, so a few
+    slow responses don't dominate the time of crawling. The other one is cancelled (or its response is released
+    when it finishes, if it has been sent by a thread).
+
+    The thread-based *HTTP* sender sends the hedged requests with the threads of this policy, and *AsyncHTTP* sends
+    them with the tasks of the running event loop. Every process has its own threads and latencies.
+    """
+
+    def __init__(self,
+                 percentile: float = 0.95,
+                 initial_delay: float = 1.0,
+                 min_delay: float = 0.0,
+                 window: int = 100,
+                 min_samples: int = 20,
+                 max_workers: int = 32):
+        """
+        Configure the hedging policy.
+
+        :param percentile: It hedges the request which takes longer than the latency percentile, e.g., 0.95 is p95.
+        :param initial_delay: The seconds it waits before hedging until it has *min_samples* latencies.
+        :param min_delay: The shortest seconds it waits before hedging.
+        :param window: How many recent latencies it keeps.
+        :param min_samples: How many latencies it needs before it uses the latency percentile.
+        :param max_workers: How many threads the thread-based *HTTP* sender could use to send HTTP requests.
+        """
+
+        if not 0 < percentile < 1:
+            raise ValueError("The option *percentile* should be in range 0 to 1 (excluded).")
+        if initial_delay < 0 or min_delay < 0:
+            raise ValueError("The seconds it waits before hedging should be bigger than or equal to 0.")
+        if window <= 0 or not 0 < min_samples <= window:
+            raise ValueError("The options should satisfy 0 < min_samples <= window.")
+        if max_workers <= 0:
+            raise ValueError("The option *max_workers* should be bigger than 0.")
+        self._percentile = percentile
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._min_samples = min_samples
+        self._max_workers = max_workers
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._hedges = 0
+
+
+    @property
+    def hedges(self) -> int:
+        """
+        How many duplicate requests it has sent in this process.
+
+        :return: An int type value.
+        """
+
+        return self._hedges
+
+
+    def delay(self) -> float:
+        """
+        The seconds it waits for the request before hedging it.
+
+        :return: A float type value.
+        """
+
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return max(self._min_delay, self._initial_delay)
+            _latencies = sorted(self._latencies)
+        _latency = _latencies[min(len(_latencies) - 1, math.ceil(len(_latencies) * self._percentile) - 1)]
+        return max(self._min_delay, _latency)
+
+
+    def record(self, latency: float) -> None:
+        """
+        Record the latency of a request which has finished.
+
+        :param latency: The seconds of sending the request.
+        :return: None
+        """
+
+        with self._lock:
+            self._latencies.append(latency)
+
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """
+        Run the function with the threads of this policy.
+
+        :param function: The function which sends HTTP request.
+        :return: A *concurrent.futures.Future* object.
+        """
+
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="hedge")
+                    self._executor_pid = os.getpid()
+        return self._executor.submit(function, *args, **kwargs)
+
+
+    def _count_hedge(self) -> None:
+        with self._lock:
+            self._hedges += 1
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state.update(_lock=None, _executor=None, _executor_pid=None)
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -1,12 +1,41 @@
-from multirunnable.api import retry as _retry, async_retry as _async_retry
-from typing import Callable, Any, Union, TypeVar, Generic
+from multirunnable.api._retry import _RetryTimeoutError
+from typing import Callable, Any, Dict, Tuple, Union, Iterable, Iterator, AsyncIterator, Optional, Hashable, TypeVar, Generic
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+from itertools import islice
 from enum import Enum
 from abc import ABCMeta, abstractmethod
-import re
+import threading
+import asyncio
+import weakref
+import time
+import os
+
+from .ratelimit import BaseRateLimiter, BaseAsyncRateLimiter
+from .concurrency import AIMDController, AsyncAIMDController
+from .cache import ResponseCache, DiskResponseCache
+from .circuit import CircuitBreaker
+from .hedge import HedgePolicy
+from .deadline import Timeouts, Deadline, DeadlineExceededError, deadline_scope, _socket_timeouts, _in_current_context, _get_running_loop
+from .compression import ByteCounter, _with_accept_encoding, _response_bytes
+from .response import ResponseSnapshot, CachedResponse, AsyncCachedResponse, _response_status, _snapshot_response, _asnapshot_response
+
+try:
+    import urllib3 as _urllib3
+except ImportError:
+    _urllib3 = None
+
+try:
+    import aiohttp as _aiohttp
+except ImportError:
+    _aiohttp = None
 
 
 HTTPResponse = TypeVar("HTTPResponse")
 
+# A HTTP request of *request_many*: HTTP method, URL and the other options of *request* (e.g., *headers*).
+BatchRequest = Tuple[Union[str, "HTTPMethod"], str, Optional[Dict[str, Any]]]
+
 
 class HTTPMethod(Enum):
 
@@ -18,12 +47,35 @@ class HTTPMethod(Enum):
     HEAD = "HEAD"
 
 
+# The order is the order of matching a string HTTP method, e.g., 'GET_POST' is GET.
+_HTTP_Method_Names: Dict[HTTPMethod, str] = {
+    HTTPMethod.GET: "get",
+    HTTPMethod.POST: "post",
+    HTTPMethod.PUT: "put",
+    HTTPMethod.DELETE: "delete",
+    HTTPMethod.HEAD: "head",
+    HTTPMethod.OPTION: "option",
+}
+
+_Retry_Hook_Names: Tuple[str, ...] = ("before_request", "request_done", "request_fail", "request_final")
+
+
 class BaseHTTP(metaclass=ABCMeta):
 
+    _Method_Dispatch: Dict[HTTPMethod, Callable] = None
+    _Retry_Hooks: Tuple[Callable, ...] = None
+
     def __init__(self):
         pass
 
 
+    def __init_subclass__(cls, **kwargs):
+        # Resolve the implementations of HTTP methods and the retry hooks once per class, instead of once per request.
+        super().__init_subclass__(**kwargs)
+        cls._Method_Dispatch = {_method: getattr(cls, _name) for _method, _name in _HTTP_Method_Names.items()}
+        cls._Retry_Hooks = tuple(getattr(cls, _name, None) for _name in _Retry_Hook_Names)
+
+
     @abstractmethod
     def request(self, url: str, method: Union[str, HTTPMethod] = "GET", timeout: int = -1, *args, **kwargs) -> Generic[HTTPResponse]:
         """
@@ -137,63 +189,261 @@ class BaseHTTP(metaclass=ABCMeta):
 
 class HTTP(BaseHTTP):
 
+    _Rate_Limiter: BaseRateLimiter = None
+    _Concurrency_Controller: AIMDController = None
+    _Response_Cache: ResponseCache = None
+    _Disk_Cache: DiskResponseCache = None
+    _Circuit_Breaker: CircuitBreaker = None
+    _Hedge_Policy: HedgePolicy = None
+    _Timeouts: Timeouts = None
+    _Byte_Counter: ByteCounter = None
+    _Coalesce_Requests: bool = False
+    _Stream_Responses: bool = False
+    _In_Flight_Requests: "_SingleFlight" = None
+
     def __init__(self):
         super().__init__()
 
 
     def request(self, url: str, method: Union[str, HTTPMethod] = "GET", timeout: int = 1, *args, **kwargs) -> Generic[HTTPResponse]:
+        _check_retry_timeout(timeout)
+        with deadline_scope(_total_timeout(self._Timeouts)):
+            return self._request(url, method, timeout, *args, **kwargs)
+
+
+    def _request(self, url: str, method: Union[str, HTTPMethod], timeout: int, *args, **kwargs) -> Generic[HTTPResponse]:
+        _http_method = _resolve_http_method(method)
+        if self._Stream_Responses is True:
+            return self._request_with_retry(url, method, _http_method, timeout, *args, **kwargs)
+
+        _cache_key = _response_cache_key(self._Response_Cache, _http_method, url, kwargs)
+        if _cache_key is not None:
+            _snapshot = self._Response_Cache.get(_cache_key)
+            if _snapshot is not None:
+                return CachedResponse(_snapshot)
+
+        _flight_key = _single_flight_key(self._Coalesce_Requests, _http_method, url, args, kwargs)
+        if _flight_key is None:
+            return self._request_with_caches(url, method, _http_method, _cache_key, timeout, *args, **kwargs)
+        return self._single_flight.request(
+            _flight_key, url, lambda: self._request_with_caches(url, method, _http_method, _cache_key, timeout, *args, **kwargs))
+
+
+    def request_many(self,
+                     requests: Iterable[BatchRequest],
+                     timeout: int = 1,
+                     concurrency: int = 1) -> "BatchResponses":
+        """
+        Send a batch of HTTP requests and iterate their responses as they complete. All the requests share the
+        resources of this sender, e.g., the connection pool, the rate limiter and the concurrency controller, and
+        it only opens (and closes) the resources once for the batch.
+
+        The requests are taken from *requests* lazily, so it could be a generator. If any request raises an exception,
+        it's raised when its response should be returned, and the requests which haven't been done are cancelled.
 
-        _self = self
+        The resources are opened when it's called, and they're closed when all the responses have been iterated, any
+        request raises an exception, or the returned iterator is closed. Please use it as a context manager (or call
+        *close*) if it may stop iterating early, e.g., *break* in the *for* loop.
 
-        @_retry.function(timeout=timeout)
-        def __retry_request_process(_method: Union[str, HTTPMethod] = "GET", _timeout: int = 1, *_args, **_kwargs) -> Generic[HTTPResponse]:
-            _response = self.__request_process(url=url, method=_method, timeout=_timeout, *_args, **_kwargs)
+        :param requests: The HTTP requests. Every one is a tuple of HTTP method, URL and the other options of *request*.
+        :param timeout: How many it would retry to send HTTP request if it gets fail when sends request.
+        :param concurrency: How many requests it sends at the same time with threads. It sends them one by one (in
+                            the order of *requests*) if it's 1 (default).
+        :return: A **BatchResponses** object which iterates tuples of the request and its HTTP response.
+        """
+
+        _check_retry_timeout(timeout)
+        _check_concurrency(concurrency)
+        self.open()
+        return BatchResponses(self._iter_batch(requests, timeout, concurrency), self.close)
+
+
+    def _iter_batch(self, requests: Iterable[BatchRequest], timeout: int, concurrency: int) -> Iterator[Tuple[BatchRequest, Any]]:
+        if concurrency == 1:
+            for _request in requests:
+                yield _request, self._request_of_batch(_request, timeout)
+            return
+
+        _requests = iter(requests)
+        _pending = {}
+        _executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            for _request in islice(_requests, concurrency):
+                _pending[_executor.submit(_in_current_context(self._request_of_batch), _request, timeout)] = _request
+            while _pending:
+                _done, _ = wait(_pending, return_when=FIRST_COMPLETED)
+                for _future in _done:
+                    yield _pending.pop(_future), _future.result()
+                    # Send the next one after the response has been handled, so it could reuse the connection.
+                    for _next_request in islice(_requests, 1):
+                        _pending[_executor.submit(_in_current_context(self._request_of_batch), _next_request, timeout)] = _next_request
+        finally:
+            for _future in _pending:
+                _future.cancel()
+            _executor.shutdown(wait=False)
+
+
+    def _request_of_batch(self, request: BatchRequest, timeout: int) -> Generic[HTTPResponse]:
+        _method, _url, _kwargs = request
+        return self.request(url=_url, method=_method, timeout=timeout, **(_kwargs or {}))
+
+
+    def _request_with_caches(self,
+                             url: str,
+                             method: Union[str, HTTPMethod],
+                             http_method: Optional[HTTPMethod],
+                             cache_key: Any,
+                             timeout: int,
+                             *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Send HTTP request (revalidate the response on disk if it has been stored) and keep the response in the caches.
+
+        :param url: URL.
+        :param method: The option *method* of *request*.
+        :param http_method: The resolved HTTP method.
+        :param cache_key: The key of the in-memory cache. It's None if it shouldn't be cached in memory.
+        :param timeout: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A HTTP response object.
+        """
+
+        _stored = None
+        if self._Disk_Cache is not None and http_method is HTTPMethod.GET:
+            _stored = self._Disk_Cache.get(url)
+            if _stored is not None:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **DiskResponseCache.conditional_headers(_stored)}
+
+        _response = self._request_with_retry(url, method, http_method, timeout, *args, **kwargs)
+        _status = _response_status(_response)
+        _snapshot = _revalidate_response(self._Disk_Cache, _stored, _status)
+        if _snapshot is not None:
+            _release_response(_response)
+        elif _is_snapshot_needed(self._Response_Cache, cache_key, self._Disk_Cache, http_method, _status):
+            _snapshot = _snapshot_response(_response, url)
+        if _snapshot is None:
             return _response
+        _keep_snapshot(self._Response_Cache, cache_key, self._Disk_Cache, http_method, _snapshot)
+        return CachedResponse(_snapshot)
+
+
+    def _request_with_retry(self, url: str, method: Union[str, HTTPMethod], http_method: Optional[HTTPMethod], timeout: int, *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Send HTTP request with the retry hooks *before_request*, *request_done*, *request_fail* and *request_final*.
+
+        :param url: URL.
+        :param method: HTTP method of option *method* of *request*.
+        :param http_method: The resolved HTTP method. It's None if option *method* is invalid.
+        :param timeout: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A HTTP response object.
+        """
+
+        _send = self._Method_Dispatch.get(http_method)
+        _before_request, _request_done, _request_fail, _request_final = self._Retry_Hooks
+        _hedge = self._Hedge_Policy is not None and http_method in _Cacheable_Methods
+        _deadline = Deadline.current()
+
+        for _ in range(timeout):
+            if _deadline is not None and _deadline.expired():
+                return DeadlineExceededError(f"sending HTTP request to '{url}'")
+            _circuit_error = self._Circuit_Breaker.allow(url) if self._Circuit_Breaker is not None else None
+            if _circuit_error is not None:
+                return _circuit_error
+            _is_done = False
+            try:
+                _before_request(self)
+                if _send is None:
+                    _response = _invalid_http_method_error(method)
+                elif _hedge is True:
+                    _response = self._send_hedged_request(_send, url, *args, **kwargs)
+                else:
+                    _response = self._send_request(_send, url, *args, **kwargs)
+                if self._Byte_Counter is not None:
+                    _count_response_bytes(self._Byte_Counter, _response)
+            except Exception as e:
+                _request_fail(self, e)
+            else:
+                _is_done = True
+                _response = _request_done(self, _response)
+            finally:
+                _request_final(self)
+            if _is_done is True:
+                return _response
+        # The same object which the retry decorators of *multirunnable* return, so the callers could compare with it.
+        return _RetryTimeoutError
+
+
+    def _send_request(self, send: Callable, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Send one HTTP request (one retry of *request*) through the rate limiter and the concurrency controller.
+
+        :param send: The implementation of HTTP method, e.g., *HTTP.get*.
+        :param url: URL.
+        :return: A HTTP response object.
+        """
 
-        @__retry_request_process.initialization
-        def _before_request(*_args, **_kwargs) -> None:
-            self.__before(*_args, **_kwargs)
-
-        @__retry_request_process.done_handling
-        def _request_done(result):
-            __result = self.__done(result)
-            return __result
-
-        @__retry_request_process.final_handling
-        def _request_final() -> None:
-            self.__final()
-
-        @__retry_request_process.error_handling
-        def _request_error(error: Exception):
-            __error_handle = self.__error(error)
-            return __error_handle
-
-        response = __retry_request_process(method, timeout, *args, **kwargs)
-        if response is TypeError and str(response) == f"Invalid HTTP method it got: '{method}'.":
-            raise response
-        return response
-
-
-    def __request_process(self,
-                          url: str,
-                          method: Union[str, HTTPMethod] = "GET",
-                          timeout: int = 1,
-                          *args, **kwargs) -> Any:
-        if re.search(r"get", method, re.IGNORECASE) or method is HTTPMethod.GET:
-            response = self.get(url, *args, **kwargs)
-        elif re.search(r"post", method, re.IGNORECASE) or method is HTTPMethod.POST:
-            response = self.post(url, *args, **kwargs)
-        elif re.search(r"put", method, re.IGNORECASE) or method is HTTPMethod.PUT:
-            response = self.put(url, *args, **kwargs)
-        elif re.search(r"delete", method, re.IGNORECASE) or method is HTTPMethod.DELETE:
-            response = self.delete(url, *args, **kwargs)
-        elif re.search(r"head", method, re.IGNORECASE) or method is HTTPMethod.HEAD:
-            response = self.head(url, *args, **kwargs)
-        elif re.search(r"option", method, re.IGNORECASE) or method is HTTPMethod.OPTION:
-            response = self.option(url, *args, **kwargs)
-        else:
-            response = TypeError(f"Invalid HTTP method it got: '{method.upper()}'.")
-        return response
+        if self._Rate_Limiter is not None:
+            self._Rate_Limiter.acquire(url)
+        _controller = self._Concurrency_Controller
+        _breaker = self._Circuit_Breaker
+        if _controller is None and _breaker is None:
+            return send(self, url, *args, **kwargs)
+
+        _started = _controller.acquire() if _controller is not None else 0.0
+        try:
+            _response = send(self, url, *args, **kwargs)
+        except Exception as e:
+            if _controller is not None:
+                _controller.release(_started, overloaded=True)
+            if _breaker is not None:
+                _breaker.record(url, error=e)
+            raise
+        if _controller is not None:
+            _controller.release(_started, overloaded=_is_overloaded_response(_response))
+        if _breaker is not None:
+            _breaker.record(url, response=_response)
+        return _response
+
+
+    def _send_hedged_request(self, send: Callable, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Send one HTTP request with the threads of the hedging policy, and send a duplicate one if it hasn't finished
+        after the delay of the policy. It returns the first response, and the response of the other one is released
+        when it finishes. It raises the exception only if both of them fail.
+
+        :param send: The implementation of HTTP method, e.g., *HTTP.get*.
+        :param url: URL.
+        :return: A HTTP response object.
+        """
+
+        _policy = self._Hedge_Policy
+        _pending = {_policy.submit(_in_current_context(self._send_timed_request), send, url, *args, **kwargs)}
+        _done, _ = wait(_pending, timeout=_policy.delay())
+        if not _done:
+            _policy._count_hedge()
+            _pending.add(_policy.submit(_in_current_context(self._send_timed_request), send, url, *args, **kwargs))
+
+        _winner, _error = None, None
+        while _pending and _winner is None:
+            _done, _pending = wait(_pending, return_when=FIRST_COMPLETED)
+            for _future in _done:
+                if _future.exception() is not None:
+                    _error = _error or _future.exception()
+                elif _winner is None:
+                    _winner = _future
+                else:
+                    _release_response(_future.result())
+        for _future in _pending:
+            _future.cancel()
+            _future.add_done_callback(_discard_hedged_response)
+        if _winner is None:
+            raise _error
+        return _winner.result()
+
+
+    def _send_timed_request(self, send: Callable, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        _started = time.monotonic()
+        _response = self._send_request(send, url, *args, **kwargs)
+        self._Hedge_Policy.record(time.monotonic() - _started)
+        return _response
 
 
     def get(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
@@ -220,24 +470,256 @@ class HTTP(BaseHTTP):
         return None
 
 
+    def open(self) -> None:
+        """
+        Open the resources (e.g., a connection pool) which sending HTTP requests needs. The crawler roles call
+        it once in every worker before sending any HTTP request, not once per request.
+
+        :return: None
+        """
+
+        pass
+
+
+    def close(self) -> None:
+        """
+        Close the resources which are opened by *open*. The crawler roles call it once in every worker after
+        all the HTTP requests have been sent.
+
+        :return: None
+        """
+
+        pass
+
+
+    @property
+    def rate_limiter(self) -> Optional[BaseRateLimiter]:
+        """
+        The rate limiter which limits how many requests per second it sends to every host. It waits for the rate
+        limiter before every retry of *request*. It's None (no limit) in default.
+
+        :return: A **BaseRateLimiter** object or None.
+        """
+
+        return self._Rate_Limiter
+
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: Optional[BaseRateLimiter]) -> None:
+        if rate_limiter is not None and not isinstance(rate_limiter, BaseRateLimiter):
+            raise TypeError("The rate limiter of HTTP should be a **BaseRateLimiter** object.")
+        self._Rate_Limiter = rate_limiter
+
+
+    @property
+    def concurrency_controller(self) -> Optional[AIMDController]:
+        """
+        The concurrency controller which adjusts how many requests are being sent at the same time by the latency
+        and errors of requests. It's None (only limited by the number of executors) in default.
+
+        :return: A **AIMDController** object or None.
+        """
+
+        return self._Concurrency_Controller
+
+
+    @concurrency_controller.setter
+    def concurrency_controller(self, controller: Optional[AIMDController]) -> None:
+        if controller is not None and not isinstance(controller, AIMDController):
+            raise TypeError("The concurrency controller of HTTP should be a **AIMDController** object.")
+        self._Concurrency_Controller = controller
+
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """
+        The in-memory cache of HTTP responses. The responses of *GET* and *HEAD* are served from it without sending
+        HTTP request (and without the retry hooks) if they have been cached. It's None (no cache) in default.
+
+        The responses which are cached (or served from the cache) are **CachedResponse** objects whose body has been
+        read, it needs the HTTP response which has read its body, e.g., the one of *urllib3* or *requests*.
+
+        :return: A **ResponseCache** object or None.
+        """
+
+        return self._Response_Cache
+
+
+    @response_cache.setter
+    def response_cache(self, cache: Optional[ResponseCache]) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError("The response cache should be a **ResponseCache** object.")
+        self._Response_Cache = cache
+
+
+    @property
+    def disk_cache(self) -> Optional[DiskResponseCache]:
+        """
+        The persistent cache of HTTP responses on disk. The HTTP request of *GET* whose response has been stored is
+        sent with the validators of it (headers *If-None-Match* / *If-Modified-Since* in option *headers*, so the
+        implementations of HTTP methods should pass option *headers* to the HTTP library). If the server responds
+        304 (Not Modified), it returns the stored response as a 200 **CachedResponse**. It's None in default.
+
+        :return: A **DiskResponseCache** object or None.
+        """
+
+        return self._Disk_Cache
+
+
+    @disk_cache.setter
+    def disk_cache(self, cache: Optional[DiskResponseCache]) -> None:
+        if cache is not None and not isinstance(cache, DiskResponseCache):
+            raise TypeError("The disk cache should be a **DiskResponseCache** object.")
+        self._Disk_Cache = cache
+
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """
+        The per-host circuit breaker. If the circuit of the host of URL is open, *request* returns a
+        **CircuitOpenError** object immediately without sending HTTP request (and without the retry hooks), so the
+        crawler doesn't spend the retries and the connect timeout on every URL of a host which is down. The crawler
+        roles with a retry policy defer the URL until the circuit lets a probe through. It's None in default.
+
+        :return: A **CircuitBreaker** object or None.
+        """
+
+        return self._Circuit_Breaker
+
+
+    @circuit_breaker.setter
+    def circuit_breaker(self, breaker: Optional[CircuitBreaker]) -> None:
+        if breaker is not None and not isinstance(breaker, CircuitBreaker):
+            raise TypeError("The circuit breaker should be a **CircuitBreaker** object.")
+        self._Circuit_Breaker = breaker
+
+
+    @property
+    def hedge_policy(self) -> Optional[HedgePolicy]:
+        """
+        The hedging policy. If it's set, every HTTP request of *GET* or *HEAD* is sent by a thread of the policy, and a
+        duplicate one is sent if it hasn't finished after the latency percentile of the recent requests. So the
+        implementations of *get* and *head* should be thread-safe. It's None (no hedging) in default.
+
+        :return: A **HedgePolicy** object or None.
+        """
+
+        return self._Hedge_Policy
+
+
+    @hedge_policy.setter
+    def hedge_policy(self, policy: Optional[HedgePolicy]) -> None:
+        if policy is not None and not isinstance(policy, HedgePolicy):
+            raise TypeError("The hedging policy should be a **HedgePolicy** object.")
+        self._Hedge_Policy = policy
+
+
+    @property
+    def timeouts(self) -> Optional[Timeouts]:
+        """
+        The connect timeout, read timeout and total timeout of HTTP request. The total timeout is the deadline of one
+        call of *request*: it doesn't retry after the deadline and returns a **DeadlineExceededError** object. The
+        connect and read timeouts are capped by the deadline, **PooledHTTP** passes them to *urllib3*, and the other
+        implementations could get them by *socket_timeouts*. It's None (no timeout) in default.
+
+        :return: A **Timeouts** object or None.
+        """
+
+        return self._Timeouts
+
+
+    @timeouts.setter
+    def timeouts(self, timeouts: Optional[Timeouts]) -> None:
+        if timeouts is not None and not isinstance(timeouts, Timeouts):
+            raise TypeError("The timeouts should be a **Timeouts** object.")
+        self._Timeouts = timeouts
+
+
+    def socket_timeouts(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        The connect timeout and read timeout of the HTTP request which is being sent, they're capped by the deadline
+        of the running code. It could be used in the implementations of *get*, *post*, etc., e.g.,
+        *requests.get(url, timeout=self.socket_timeouts())*.
+
+        :return: A tuple of connect timeout and read timeout. None means no limit.
+        """
+
+        return _socket_timeouts(self._Timeouts)
+
+
     @property
-    def __before(self) -> Callable:
-        return self.before_request
+    def byte_counter(self) -> Optional[ByteCounter]:
+        """
+        The byte counter of the HTTP response bodies. It records the bytes on the wire and the decoded bytes of every
+        response whose body has been read when it's received, e.g., the response of *urllib3* (with
+        *preload_content*) or *requests*. The bodies which are streamed (property *stream*) aren't counted. It's
+        None in default.
+
+        :return: A **ByteCounter** object or None.
+        """
+
+        return self._Byte_Counter
+
+
+    @byte_counter.setter
+    def byte_counter(self, counter: Optional[ByteCounter]) -> None:
+        if counter is not None and not isinstance(counter, ByteCounter):
+            raise TypeError("The byte counter should be a **ByteCounter** object.")
+        self._Byte_Counter = counter
 
 
     @property
-    def __done(self) -> Callable:
-        return self.request_done
+    def coalesce_requests(self) -> bool:
+        """
+        Whether it coalesces the concurrent duplicate HTTP requests (single-flight). It's False in default. If it's
+        True, only the first one of the HTTP requests of *GET* or *HEAD* with the same URL and options which are being
+        sent at the same time (by the other threads) goes out. The first one gets the HTTP response object of the
+        library, but the others wait for it and get its response as **CachedResponse** objects, which don't have the
+        other APIs of the library (e.g., *getheader* of *urllib3*). So the parser should only use the common APIs of
+        **CachedResponse** (*status*, *headers*, *data*, *text*, *json* ...) if it's enabled. It needs the HTTP
+        response which has read its body, e.g., the one of *urllib3* or *requests*. If it doesn't know how to read the
+        body, the others send their own HTTP requests.
+
+        :return: A bool type value.
+        """
+
+        return self._Coalesce_Requests
+
+
+    @coalesce_requests.setter
+    def coalesce_requests(self, coalesce: bool) -> None:
+        if not isinstance(coalesce, bool):
+            raise TypeError("The option *coalesce_requests* should be a bool type value.")
+        self._Coalesce_Requests = coalesce
 
 
     @property
-    def __final(self) -> Callable:
-        return self.request_final
+    def stream(self) -> bool:
+        """
+        Whether it streams the body of HTTP response to the parser (e.g., **BaseStreamHTTPResponseParser**) instead
+        of reading the whole body when it gets the response. It's False in default. The responses which are streamed
+        are neither cached nor coalesced, because it needs to read the whole body to share them.
+
+        :return: A bool type value.
+        """
+
+        return self._Stream_Responses
+
+
+    @stream.setter
+    def stream(self, stream: bool) -> None:
+        if not isinstance(stream, bool):
+            raise TypeError("The option *stream* should be a bool type value.")
+        self._Stream_Responses = stream
 
 
     @property
-    def __error(self) -> Callable:
-        return self.request_fail
+    def _single_flight(self) -> "_SingleFlight":
+        if self._In_Flight_Requests is None:
+            with _Single_Flight_Lock:
+                if self._In_Flight_Requests is None:
+                    self._In_Flight_Requests = _SingleFlight()
+        return self._In_Flight_Requests
 
 
     def before_request(self, *args, **kwargs) -> None:
@@ -287,158 +769,1276 @@ class HTTP(BaseHTTP):
 
 
 
-class AsyncHTTP(BaseHTTP):
+class PooledHTTP(HTTP):
+
+    """
+    The HTTP sender which keeps the connections alive in connection pools of *urllib3*. So the requests to the
+    same host reuse the connections instead of doing TCP and TLS handshake again and again.
+
+    The pools are shared by all the workers (threads or green threads) in one process, and every process has
+    its own pools. The crawler roles call *open* and *close* once per worker, and the pools are cleared when the
+    last worker closes it. It also opens the pools automatically if it sends request before *open*.
+    """
+
+    def __init__(self, pool_size: int = 10, pool_sizes: Dict[str, int] = None, num_pools: int = 10, **pool_kwargs):
+        """
+        Configure the connection pools.
+
+        :param pool_size: How many connections it keeps alive for one host.
+        :param pool_sizes: The pool size for the specific hosts, e.g., {"www.example.com": 50}. The other hosts use *pool_size*.
+        :param num_pools: How many pools (hosts) it keeps.
+        :param pool_kwargs: The other options of *urllib3.PoolManager*, e.g., *headers*, *retries* or *timeout*.
+        """
 
-    def __init__(self):
         super().__init__()
+        if _urllib3 is None:
+            raise ImportError("PooledHTTP needs package *urllib3*. Please install it by 'pip install urllib3'.")
+        if pool_size <= 0 or any(_size <= 0 for _size in (pool_sizes or {}).values()):
+            raise ValueError("The pool size should be bigger than 0.")
 
+        self._pool_size = pool_size
+        self._pool_sizes = dict(pool_sizes or {})
+        self._num_pools = num_pools
+        self._pool_kwargs = pool_kwargs
+        self._pool_managers: Dict[str, Any] = {}
+        self._pool_pid: int = None
+        self._opened_workers = 0
+        self._lock = threading.Lock()
 
-    async def request(self,
-                      url: str,
-                      method: Union[str, HTTPMethod] = "GET",
-                      timeout: int = 1,
-                      *args, **kwargs) -> Generic[HTTPResponse]:
 
-        _self = self
-
-        @_async_retry.function(timeout=timeout)
-        async def __async_retry_request_process(_self, _method: Union[str, HTTPMethod] = "GET", _timeout: int = 1, *_args, **_kwargs) -> Generic[HTTPResponse]:
-            __response = await _self.__request_process(url=url, method=_method, timeout=_timeout, *_args, **_kwargs)
-            return __response
-
-        @__async_retry_request_process.initialization
-        async def _before_request(_self, *_args, **_kwargs):
-            await self.__before_request(*_args, **_kwargs)
-
-        @__async_retry_request_process.done_handling
-        async def _request_done(_self, result):
-            __result = await self.__request_done(result)
-            return __result
-
-        @__async_retry_request_process.final_handling
-        async def _request_final(_self):
-            await self.__request_final()
-
-        @__async_retry_request_process.error_handling
-        async def _request_error(_self, error):
-            __error_handle = await self.__request_error(error)
-            return __error_handle
-
-        response = await __async_retry_request_process(self, method, timeout, *args, **kwargs)
-        if response is TypeError and str(response) == f"Invalid HTTP method it got: '{method}'.":
-            raise response
-        return response
-
-
-    async def __request_process(self,
-                                url: str,
-                                method: Union[str, HTTPMethod] = "GET",
-                                timeout: int = 1,
-                                *args, **kwargs) -> Generic[HTTPResponse]:
-        if re.search(r"get", method, re.IGNORECASE) or method is HTTPMethod.GET:
-            response = await self.get(url, *args, **kwargs)
-        elif re.search(r"post", method, re.IGNORECASE) or method is HTTPMethod.POST:
-            response = await self.post(url, *args, **kwargs)
-        elif re.search(r"put", method, re.IGNORECASE) or method is HTTPMethod.PUT:
-            response = await self.put(url, *args, **kwargs)
-        elif re.search(r"delete", method, re.IGNORECASE) or method is HTTPMethod.DELETE:
-            response = await self.delete(url, *args, **kwargs)
-        elif re.search(r"head", method, re.IGNORECASE) or method is HTTPMethod.HEAD:
-            response = await self.head(url, *args, **kwargs)
-        elif re.search(r"option", method, re.IGNORECASE) or method is HTTPMethod.OPTION:
-            response = await self.option(url, *args, **kwargs)
-        else:
-            response = TypeError(f"Invalid HTTP method it got: '{method.upper()}'.")
-        return response
+    @property
+    def pool_size(self) -> int:
+        """
+        How many connections it keeps alive for one host.
 
+        :return: An int type value.
+        """
 
-    async def get(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
-        return None
+        return self._pool_size
 
 
-    async def post(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
-        return None
+    @property
+    def pool_sizes(self) -> Dict[str, int]:
+        """
+        The pool size for the specific hosts.
 
+        :return: A dict type value.
+        """
 
-    async def put(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
-        return None
+        return dict(self._pool_sizes)
 
 
-    async def delete(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
-        return None
+    def __getstate__(self) -> Dict[str, Any]:
+        # The pools and the lock cannot be pickled, the other process creates its own ones.
+        _state = self.__dict__.copy()
+        _state.update(_pool_managers={}, _pool_pid=None, _opened_workers=0, _lock=None)
+        return _state
 
 
-    async def head(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
-        return None
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
 
-    async def option(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
-        return None
+    def open(self) -> None:
+        with self._lock:
+            self._reset_if_forked()
+            self._opened_workers += 1
 
 
-    @property
-    def __before_request(self) -> Callable:
-        return self.before_request
+    def close(self) -> None:
+        with self._lock:
+            self._reset_if_forked()
+            self._opened_workers = max(0, self._opened_workers - 1)
+            if self._opened_workers == 0:
+                for _pool_manager in self._pool_managers.values():
+                    _pool_manager.clear()
+                self._pool_managers = {}
 
 
-    @property
-    def __request_done(self) -> Callable:
-        return self.request_done
+    def get(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return self.send("GET", url, *args, **kwargs)
 
 
-    @property
-    def __request_error(self) -> Callable:
-        return self.request_fail
+    def post(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return self.send("POST", url, *args, **kwargs)
 
 
-    @property
-    def __request_final(self) -> Callable:
-        return self.request_final
+    def put(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return self.send("PUT", url, *args, **kwargs)
 
 
-    async def before_request(self, *args, **kwargs) -> None:
+    def delete(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return self.send("DELETE", url, *args, **kwargs)
+
+
+    def head(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return self.send("HEAD", url, *args, **kwargs)
+
+
+    def option(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return self.send("OPTIONS", url, *args, **kwargs)
+
+
+    def send(self, method: str, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
         """
-        Asynchronous version of *HTTP.before_request*.
+        Send HTTP request with the connection pool of the host of URL.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param kwargs: The options of *urllib3.PoolManager.request*, e.g., *headers*, *fields* or *body*. Header
+                       *Accept-Encoding* is added if it isn't in *headers* (or the headers of the pools).
+        :return: A *urllib3.HTTPResponse* object. Its body hasn't been read if property *stream* is True.
+        """
+
+        # The headers of the request replace the headers of the pools in urllib3, so they're the base of it.
+        kwargs["headers"] = _with_accept_encoding(kwargs.get("headers") or self._pool_kwargs.get("headers"))
+        if self._Stream_Responses is True:
+            kwargs.setdefault("preload_content", False)
+        if "timeout" not in kwargs:
+            _connect, _read = self.socket_timeouts()
+            if _connect is not None or _read is not None:
+                kwargs["timeout"] = _urllib3.Timeout(connect=_connect, read=_read)
+        return self._get_pool_manager(url).request(method, url, *args, **kwargs)
+
+
+    def _get_pool_manager(self, url: str) -> Any:
+        """
+        Get the pool manager for the host of URL. The host which has its own pool size has its own pool manager.
+
+        :param url: URL.
+        :return: A *urllib3.PoolManager* object.
+        """
+
+        _host = _urllib3.util.parse_url(url).host
+        _key = _host if _host in self._pool_sizes else ""
+        _pool_manager = self._pool_managers.get(_key)
+        if _pool_manager is None or self._pool_pid != os.getpid():
+            with self._lock:
+                self._reset_if_forked()
+                _pool_manager = self._pool_managers.get(_key)
+                if _pool_manager is None:
+                    _pool_manager = _urllib3.PoolManager(
+                        num_pools=self._num_pools,
+                        maxsize=self._pool_sizes.get(_key, self._pool_size),
+                        **self._pool_kwargs)
+                    self._pool_managers[_key] = _pool_manager
+        return _pool_manager
+
+
+    def _reset_if_forked(self) -> None:
+        """
+        Discard the pools which are inherited from the parent process because the connections cannot be shared
+        between processes. It should be called with the lock.
 
         :return: None
         """
 
-        pass
+        _pid = os.getpid()
+        if self._pool_pid != _pid:
+            self._pool_managers = {}
+            self._opened_workers = 0
+            self._pool_pid = _pid
 
 
-    async def request_done(self, result):
+
+class AsyncHTTP(BaseHTTP):
+
+    """
+    The asynchronous HTTP sender. It manages one long-lived *aiohttp.ClientSession* (with its connector) for every
+    event loop, it could be got by property *session* in the implementations of *get*, *post*, etc. The crawler roles
+    call *open* and *close* once per worker, and the session is closed when the last worker of the loop closes it.
+    """
+
+    _Connection_Limit: int = 100
+    _Connection_Limit_Per_Host: int = 0
+    _Session_Options: Dict[str, Any] = None
+    _Sessions: weakref.WeakKeyDictionary = None
+    _Opened_Workers: weakref.WeakKeyDictionary = None
+    _Rate_Limiter: BaseAsyncRateLimiter = None
+    _Concurrency_Controller: AsyncAIMDController = None
+    _Response_Cache: ResponseCache = None
+    _Disk_Cache: DiskResponseCache = None
+    _Circuit_Breaker: CircuitBreaker = None
+    _Hedge_Policy: HedgePolicy = None
+    _Timeouts: Timeouts = None
+    _Byte_Counter: ByteCounter = None
+    _Coalesce_Requests: bool = False
+    _Stream_Responses: bool = False
+    _In_Flight_Requests: "_AsyncSingleFlight" = None
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, **session_kwargs):
         """
-        Asynchronous version of *HTTP.request_done*.
+        Configure the session.
 
-        :param result: The result of sending HTTP request. In generally, it's HTTP response object.
-        :return: The handled result.
+        :param limit: The total number of simultaneous connections of the session. It's no limit if it's 0.
+        :param limit_per_host: The number of simultaneous connections to one host. It's no limit if it's 0 (default).
+        :param session_kwargs: The other options of *aiohttp.ClientSession*, e.g., *headers*, *cookies* or *timeout*.
         """
 
-        return result
+        super().__init__()
+        if limit < 0 or limit_per_host < 0:
+            raise ValueError("The connection limits should be bigger than or equal to 0.")
+        self._Connection_Limit = limit
+        self._Connection_Limit_Per_Host = limit_per_host
+        self._Session_Options = session_kwargs
 
 
-    async def request_fail(self, error: Exception) -> None:
+    @property
+    def session(self) -> Any:
         """
-        Asynchronous version of *HTTP.request_fail*.
+        The session of the running event loop. It's created when it's got first time in the loop.
+
+        :return: An *aiohttp.ClientSession* object.
+        """
+
+        if _aiohttp is None:
+            raise ImportError("The session of AsyncHTTP needs package *aiohttp*. Please install it by 'pip install aiohttp'.")
+
+        _loop = _get_running_loop()
+        if self._Sessions is None:
+            self._Sessions = weakref.WeakKeyDictionary()
+        _session = self._Sessions.get(_loop)
+        if _session is None or _session.closed:
+            _connector = _aiohttp.TCPConnector(limit=self._Connection_Limit, limit_per_host=self._Connection_Limit_Per_Host)
+            _options = dict(self._Session_Options or {})
+            if self._Timeouts is not None and "timeout" not in _options:
+                _options["timeout"] = _aiohttp.ClientTimeout(sock_connect=self._Timeouts.connect, sock_read=self._Timeouts.read)
+            _session = _aiohttp.ClientSession(connector=_connector, **_options)
+            self._Sessions[_loop] = _session
+        return _session
+
+
+    async def open(self) -> None:
+        """
+        Asynchronous version of *HTTP.open*. It counts the workers of the running event loop.
 
-        :param error:
         :return: None
         """
 
-        raise error
+        if self._Opened_Workers is None:
+            self._Opened_Workers = weakref.WeakKeyDictionary()
+        _loop = _get_running_loop()
+        self._Opened_Workers[_loop] = self._Opened_Workers.get(_loop, 0) + 1
 
 
-    async def request_final(self) -> None:
+    async def close(self) -> None:
         """
-        Asynchronous version of *HTTP.request_final*.
+        Asynchronous version of *HTTP.close*. It closes the session of the running event loop if it's the last worker.
 
         :return: None
         """
 
-        pass
+        _loop = _get_running_loop()
+        _opened_workers = max(0, (self._Opened_Workers or {}).get(_loop, 1) - 1)
+        if self._Opened_Workers is not None:
+            self._Opened_Workers[_loop] = _opened_workers
+        if _opened_workers == 0 and self._Sessions is not None:
+            _session = self._Sessions.pop(_loop, None)
+            if _session is not None:
+                await _session.close()
 
 
-    def status_code(self):
-        pass
+    @property
+    def rate_limiter(self) -> Optional[BaseAsyncRateLimiter]:
+        """
+        Asynchronous version of *HTTP.rate_limiter*. The coroutines wait for the rate limiter without blocking
+        the event loop.
+
+        :return: A **BaseAsyncRateLimiter** object or None.
+        """
+
+        return self._Rate_Limiter
+
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: Optional[BaseAsyncRateLimiter]) -> None:
+        if rate_limiter is not None and not isinstance(rate_limiter, BaseAsyncRateLimiter):
+            raise TypeError("The rate limiter of AsyncHTTP should be a **BaseAsyncRateLimiter** object.")
+        self._Rate_Limiter = rate_limiter
+
+
+    @property
+    def concurrency_controller(self) -> Optional[AsyncAIMDController]:
+        """
+        Asynchronous version of *HTTP.concurrency_controller*.
+
+        :return: A **AsyncAIMDController** object or None.
+        """
+
+        return self._Concurrency_Controller
+
+
+    @concurrency_controller.setter
+    def concurrency_controller(self, controller: Optional[AsyncAIMDController]) -> None:
+        if controller is not None and not isinstance(controller, AsyncAIMDController):
+            raise TypeError("The concurrency controller of AsyncHTTP should be a **AsyncAIMDController** object.")
+        self._Concurrency_Controller = controller
+
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """
+        Asynchronous version of *HTTP.response_cache*. The responses which are cached are **AsyncCachedResponse**
+        objects, it reads the body of the response (e.g., the one of *aiohttp*) and releases it.
+
+        :return: A **ResponseCache** object or None.
+        """
+
+        return self._Response_Cache
+
+
+    @response_cache.setter
+    def response_cache(self, cache: Optional[ResponseCache]) -> None:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise TypeError("The response cache should be a **ResponseCache** object.")
+        self._Response_Cache = cache
+
+
+    @property
+    def disk_cache(self) -> Optional[DiskResponseCache]:
+        """
+        Asynchronous version of *HTTP.disk_cache*. The stored responses are **AsyncCachedResponse** objects.
+
+        :return: A **DiskResponseCache** object or None.
+        """
+
+        return self._Disk_Cache
+
+
+    @disk_cache.setter
+    def disk_cache(self, cache: Optional[DiskResponseCache]) -> None:
+        if cache is not None and not isinstance(cache, DiskResponseCache):
+            raise TypeError("The disk cache should be a **DiskResponseCache** object.")
+        self._Disk_Cache = cache
+
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """
+        Asynchronous version of *HTTP.circuit_breaker*. The cancelled requests aren't failures.
+
+        :return: A **CircuitBreaker** object or None.
+        """
+
+        return self._Circuit_Breaker
+
+
+    @circuit_breaker.setter
+    def circuit_breaker(self, breaker: Optional[CircuitBreaker]) -> None:
+        if breaker is not None and not isinstance(breaker, CircuitBreaker):
+            raise TypeError("The circuit breaker should be a **CircuitBreaker** object.")
+        self._Circuit_Breaker = breaker
+
+
+    @property
+    def hedge_policy(self) -> Optional[HedgePolicy]:
+        """
+        Asynchronous version of *HTTP.hedge_policy*. The duplicate request is sent by a task of the running event loop,
+        and the slower one is cancelled.
+
+        :return: A **HedgePolicy** object or None.
+        """
+
+        return self._Hedge_Policy
+
+
+    @hedge_policy.setter
+    def hedge_policy(self, policy: Optional[HedgePolicy]) -> None:
+        if policy is not None and not isinstance(policy, HedgePolicy):
+            raise TypeError("The hedging policy should be a **HedgePolicy** object.")
+        self._Hedge_Policy = policy
+
+
+    @property
+    def timeouts(self) -> Optional[Timeouts]:
+        """
+        Asynchronous version of *HTTP.timeouts*. The connect and read timeouts are the default timeouts of the
+        session, and the HTTP request which is still being sent at the deadline is cancelled.
+
+        :return: A **Timeouts** object or None.
+        """
+
+        return self._Timeouts
+
+
+    @timeouts.setter
+    def timeouts(self, timeouts: Optional[Timeouts]) -> None:
+        if timeouts is not None and not isinstance(timeouts, Timeouts):
+            raise TypeError("The timeouts should be a **Timeouts** object.")
+        self._Timeouts = timeouts
+
+
+    @property
+    def byte_counter(self) -> Optional[ByteCounter]:
+        """
+        Asynchronous version of *HTTP.byte_counter*. It reads the body of the response of *aiohttp* when it's
+        received (the parser gets the body which has been read), unless property *stream* is True.
+
+        :return: A **ByteCounter** object or None.
+        """
+
+        return self._Byte_Counter
+
+
+    @byte_counter.setter
+    def byte_counter(self, counter: Optional[ByteCounter]) -> None:
+        if counter is not None and not isinstance(counter, ByteCounter):
+            raise TypeError("The byte counter should be a **ByteCounter** object.")
+        self._Byte_Counter = counter
+
+
+    @property
+    def coalesce_requests(self) -> bool:
+        """
+        Asynchronous version of *HTTP.coalesce_requests*. It's False in default. The coroutines of the same event loop
+        wait for the first one, and they get **AsyncCachedResponse** objects.
+
+        :return: A bool type value.
+        """
+
+        return self._Coalesce_Requests
+
+
+    @coalesce_requests.setter
+    def coalesce_requests(self, coalesce: bool) -> None:
+        if not isinstance(coalesce, bool):
+            raise TypeError("The option *coalesce_requests* should be a bool type value.")
+        self._Coalesce_Requests = coalesce
+
+
+    @property
+    def stream(self) -> bool:
+        """
+        Asynchronous version of *HTTP.stream*. The implementations of HTTP methods shouldn't read the body of the
+        response of *aiohttp* if it's True.
+
+        :return: A bool type value.
+        """
+
+        return self._Stream_Responses
+
+
+    @stream.setter
+    def stream(self, stream: bool) -> None:
+        if not isinstance(stream, bool):
+            raise TypeError("The option *stream* should be a bool type value.")
+        self._Stream_Responses = stream
+
+
+    @property
+    def _single_flight(self) -> "_AsyncSingleFlight":
+        if self._In_Flight_Requests is None:
+            with _Single_Flight_Lock:
+                if self._In_Flight_Requests is None:
+                    self._In_Flight_Requests = _AsyncSingleFlight()
+        return self._In_Flight_Requests
+
+
+    async def request(self,
+                      url: str,
+                      method: Union[str, HTTPMethod] = "GET",
+                      timeout: int = 1,
+                      *args, **kwargs) -> Generic[HTTPResponse]:
+        _check_retry_timeout(timeout)
+        with deadline_scope(_total_timeout(self._Timeouts)):
+            return await self._request(url, method, timeout, *args, **kwargs)
+
+
+    async def _request(self, url: str, method: Union[str, HTTPMethod], timeout: int, *args, **kwargs) -> Generic[HTTPResponse]:
+        _http_method = _resolve_http_method(method)
+        if self._Stream_Responses is True:
+            return await self._request_with_retry(url, method, _http_method, timeout, *args, **kwargs)
+
+        _cache_key = _response_cache_key(self._Response_Cache, _http_method, url, kwargs)
+        if _cache_key is not None:
+            _snapshot = self._Response_Cache.get(_cache_key)
+            if _snapshot is not None:
+                return AsyncCachedResponse(_snapshot)
+
+        _flight_key = _single_flight_key(self._Coalesce_Requests, _http_method, url, args, kwargs)
+        if _flight_key is None:
+            return await self._request_with_caches(url, method, _http_method, _cache_key, timeout, *args, **kwargs)
+        return await self._single_flight.request(
+            _flight_key, url, lambda: self._request_with_caches(url, method, _http_method, _cache_key, timeout, *args, **kwargs))
+
+
+    def request_many(self,
+                     requests: Union[Iterable[BatchRequest], AsyncIterator[BatchRequest]],
+                     timeout: int = 1,
+                     concurrency: int = 1) -> "AsyncBatchResponses":
+        """
+        Asynchronous version of *HTTP.request_many*. The requests are sent by tasks of the running event loop, and
+        all of them share the session of the loop.
+
+        The session is opened when it starts iterating (or enters the *async with* block), and it's closed when all
+        the responses have been iterated, any request raises an exception, or the returned iterator is closed. Please
+        use it as an asynchronous context manager (or await *aclose*) if it may stop iterating early.
+
+        :param requests: The HTTP requests. It also could be an asynchronous iterator.
+        :param timeout: How many it would retry to send HTTP request if it gets fail when sends request.
+        :param concurrency: How many requests it sends at the same time.
+        :return: An **AsyncBatchResponses** object which iterates tuples of the request and its HTTP response.
+        """
+
+        _check_retry_timeout(timeout)
+        _check_concurrency(concurrency)
+        return AsyncBatchResponses(self._iter_batch(requests, timeout, concurrency), self.open, self.close)
+
+
+    async def _iter_batch(self,
+                          requests: Union[Iterable[BatchRequest], AsyncIterator[BatchRequest]],
+                          timeout: int,
+                          concurrency: int) -> AsyncIterator[Tuple[BatchRequest, Any]]:
+        _requests = requests.__aiter__() if hasattr(requests, "__aiter__") else _aiter_requests(requests)
+        _pending = {}
+
+        async def _send_next() -> None:
+            try:
+                _request = await _requests.__anext__()
+            except StopAsyncIteration:
+                return
+            _pending[asyncio.ensure_future(self._request_of_batch(_request, timeout))] = _request
+
+        try:
+            for _ in range(concurrency):
+                await _send_next()
+            while _pending:
+                _done, _ = await asyncio.wait(_pending, return_when=asyncio.FIRST_COMPLETED)
+                for _task in _done:
+                    yield _pending.pop(_task), _task.result()
+                    await _send_next()
+        finally:
+            for _task in _pending:
+                _task.cancel()
+
+
+    async def _request_of_batch(self, request: BatchRequest, timeout: int) -> Generic[HTTPResponse]:
+        _method, _url, _kwargs = request
+        return await self.request(url=_url, method=_method, timeout=timeout, **(_kwargs or {}))
+
+
+    async def _request_with_caches(self,
+                                   url: str,
+                                   method: Union[str, HTTPMethod],
+                                   http_method: Optional[HTTPMethod],
+                                   cache_key: Any,
+                                   timeout: int,
+                                   *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Asynchronous version of *HTTP._request_with_caches*.
+
+        :param url: URL.
+        :param method: The option *method* of *request*.
+        :param http_method: The resolved HTTP method.
+        :param cache_key: The key of the in-memory cache. It's None if it shouldn't be cached in memory.
+        :param timeout: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A HTTP response object.
+        """
+
+        _stored = None
+        if self._Disk_Cache is not None and http_method is HTTPMethod.GET:
+            _stored = self._Disk_Cache.get(url)
+            if _stored is not None:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **DiskResponseCache.conditional_headers(_stored)}
+
+        _response = await self._request_with_retry(url, method, http_method, timeout, *args, **kwargs)
+        _status = _response_status(_response)
+        _snapshot = _revalidate_response(self._Disk_Cache, _stored, _status)
+        if _snapshot is not None:
+            _release_response(_response)
+        elif _is_snapshot_needed(self._Response_Cache, cache_key, self._Disk_Cache, http_method, _status):
+            _snapshot = await _asnapshot_response(_response, url)
+        if _snapshot is None:
+            return _response
+        _keep_snapshot(self._Response_Cache, cache_key, self._Disk_Cache, http_method, _snapshot)
+        return AsyncCachedResponse(_snapshot)
+
+
+    async def _request_with_retry(self,
+                                  url: str,
+                                  method: Union[str, HTTPMethod],
+                                  http_method: Optional[HTTPMethod],
+                                  timeout: int,
+                                  *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Asynchronous version of *HTTP._request_with_retry*.
+
+        :param url: URL.
+        :param method: HTTP method of option *method* of *request*.
+        :param http_method: The resolved HTTP method. It's None if option *method* is invalid.
+        :param timeout: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A HTTP response object.
+        """
+
+        _send = self._Method_Dispatch.get(http_method)
+        _before_request, _request_done, _request_fail, _request_final = self._Retry_Hooks
+        _hedge = self._Hedge_Policy is not None and http_method in _Cacheable_Methods
+        _deadline = Deadline.current()
+
+        for _ in range(timeout):
+            if _deadline is not None and _deadline.expired():
+                return DeadlineExceededError(f"sending HTTP request to '{url}'")
+            _circuit_error = self._Circuit_Breaker.allow(url) if self._Circuit_Breaker is not None else None
+            if _circuit_error is not None:
+                return _circuit_error
+            _is_done = False
+            try:
+                await _before_request(self)
+                if _send is None:
+                    _response = _invalid_http_method_error(method)
+                elif _hedge is True:
+                    _response = await self._send_hedged_request(_send, url, *args, **kwargs)
+                else:
+                    _response = await self._send_request(_send, url, *args, **kwargs)
+                if self._Byte_Counter is not None:
+                    await _acount_response_bytes(self._Byte_Counter, _response, self._Stream_Responses)
+            except Exception as e:
+                await _request_fail(self, e)
+            else:
+                _is_done = True
+                _response = await _request_done(self, _response)
+            finally:
+                await _request_final(self)
+            if _is_done is True:
+                return _response
+        # The same object which the retry decorators of *multirunnable* return, so the callers could compare with it.
+        return _RetryTimeoutError
+
+
+    async def _send_request(self, send: Callable, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Asynchronous version of *HTTP._send_request*.
+
+        :param send: The implementation of HTTP method, e.g., *AsyncHTTP.get*.
+        :param url: URL.
+        :return: A HTTP response object.
+        """
+
+        if self._Rate_Limiter is not None:
+            await self._Rate_Limiter.acquire(url)
+        _controller = self._Concurrency_Controller
+        _breaker = self._Circuit_Breaker
+        if _controller is None and _breaker is None:
+            return await _await_within_deadline(send(self, url, *args, **kwargs), url)
+
+        _started = await _controller.acquire() if _controller is not None else 0.0
+        try:
+            _response = await _await_within_deadline(send(self, url, *args, **kwargs), url)
+        except asyncio.CancelledError:
+            # The cancelled request says nothing about the host.
+            if _controller is not None:
+                await _controller.release(_started)
+            if _breaker is not None:
+                _breaker.cancel(url)
+            raise
+        except Exception as e:
+            if _controller is not None:
+                await _controller.release(_started, overloaded=True)
+            if _breaker is not None:
+                _breaker.record(url, error=e)
+            raise
+        if _controller is not None:
+            await _controller.release(_started, overloaded=_is_overloaded_response(_response))
+        if _breaker is not None:
+            _breaker.record(url, response=_response)
+        return _response
+
+
+    async def _send_hedged_request(self, send: Callable, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        """
+        Asynchronous version of *HTTP._send_hedged_request*. The requests are sent by tasks of the running event loop,
+        and the other one is cancelled when it gets the first response.
+
+        :param send: The implementation of HTTP method, e.g., *AsyncHTTP.get*.
+        :param url: URL.
+        :return: A HTTP response object.
+        """
+
+        _policy = self._Hedge_Policy
+        _pending = {asyncio.ensure_future(self._send_timed_request(send, url, *args, **kwargs))}
+        try:
+            _done, _ = await asyncio.wait(_pending, timeout=_policy.delay())
+            if not _done:
+                _policy._count_hedge()
+                _pending.add(asyncio.ensure_future(self._send_timed_request(send, url, *args, **kwargs)))
+
+            _winner, _error = None, None
+            while _pending and _winner is None:
+                _done, _pending = await asyncio.wait(_pending, return_when=asyncio.FIRST_COMPLETED)
+                for _task in _done:
+                    if _task.exception() is not None:
+                        _error = _error or _task.exception()
+                    elif _winner is None:
+                        _winner = _task
+                    else:
+                        _release_response(_task.result())
+            if _winner is None:
+                raise _error
+            return _winner.result()
+        finally:
+            for _task in _pending:
+                _task.cancel()
+
+
+    async def _send_timed_request(self, send: Callable, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        _started = time.monotonic()
+        _response = await self._send_request(send, url, *args, **kwargs)
+        self._Hedge_Policy.record(time.monotonic() - _started)
+        return _response
+
+
+    async def get(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return None
+
+
+    async def post(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return None
+
+
+    async def put(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return None
+
+
+    async def delete(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return None
+
+
+    async def head(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return None
+
+
+    async def option(self, url: str, *args, **kwargs) -> Generic[HTTPResponse]:
+        return None
+
+
+    async def before_request(self, *args, **kwargs) -> None:
+        """
+        Asynchronous version of *HTTP.before_request*.
+
+        :return: None
+        """
+
+        pass
+
+
+    async def request_done(self, result):
+        """
+        Asynchronous version of *HTTP.request_done*.
+
+        :param result: The result of sending HTTP request. In generally, it's HTTP response object.
+        :return: The handled result.
+        """
+
+        return result
+
+
+    async def request_fail(self, error: Exception) -> None:
+        """
+        Asynchronous version of *HTTP.request_fail*.
+
+        :param error:
+        :return: None
+        """
+
+        raise error
+
+
+    async def request_final(self) -> None:
+        """
+        Asynchronous version of *HTTP.request_final*.
+
+        :return: None
+        """
+
+        pass
+
+
+    def status_code(self):
+        pass
+
+
+
+class BatchResponses:
+
+    """
+    The responses of *HTTP.request_many*. It iterates tuples of the request and its HTTP response, and it closes the
+    resources of the HTTP sender once it's exhausted, it raises an exception, or it's closed. It's also a context
+    manager which closes them when it exits, so the resources would be released even if it stops iterating early.
+    """
+
+    def __init__(self, responses: Iterator[Tuple[BatchRequest, Any]], close_sender: Callable[[], Any]):
+        """
+        :param responses: The generator of responses. It would be closed with the resources.
+        :param close_sender: The function which closes the resources of the HTTP sender.
+        """
+
+        self._responses = responses
+        self._close_sender = close_sender
+        self._closed = False
+
+
+    def __iter__(self) -> "BatchResponses":
+        return self
+
+
+    def __next__(self) -> Tuple[BatchRequest, Any]:
+        if self._closed:
+            raise StopIteration
+        try:
+            return next(self._responses)
+        except BaseException:
+            self.close()
+            raise
+
+
+    def __enter__(self) -> "BatchResponses":
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the resources have been closed or not.
+
+        :return: A bool type value.
+        """
+
+        return self._closed
+
+
+    def close(self) -> None:
+        """
+        Cancel the requests which haven't been done and close the resources of the HTTP sender. It does nothing if
+        they have been closed.
+
+        :return: None
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._responses.close()
+        finally:
+            self._close_sender()
+
+
+
+class AsyncBatchResponses:
+
+    """
+    The responses of *AsyncHTTP.request_many*. Asynchronous version of **BatchResponses**, it opens the session of
+    the HTTP sender when it starts iterating or enters the *async with* block.
+    """
+
+    def __init__(self,
+                 responses: AsyncIterator[Tuple[BatchRequest, Any]],
+                 open_sender: Callable[[], Any],
+                 close_sender: Callable[[], Any]):
+        """
+        :param responses: The asynchronous generator of responses. It would be closed with the resources.
+        :param open_sender: The coroutine function which opens the resources of the HTTP sender.
+        :param close_sender: The coroutine function which closes the resources of the HTTP sender.
+        """
+
+        self._responses = responses
+        self._open_sender = open_sender
+        self._close_sender = close_sender
+        self._opened = False
+        self._closed = False
+
+
+    def __aiter__(self) -> "AsyncBatchResponses":
+        return self
+
+
+    async def __anext__(self) -> Tuple[BatchRequest, Any]:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            await self._open_once()
+            return await self._responses.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+
+    async def __aenter__(self) -> "AsyncBatchResponses":
+        await self._open_once()
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the resources have been closed or not.
+
+        :return: A bool type value.
+        """
+
+        return self._closed
+
+
+    async def _open_once(self) -> None:
+        if not self._opened:
+            self._opened = True
+            await self._open_sender()
+
+
+    async def aclose(self) -> None:
+        """
+        Cancel the requests which haven't been done and close the resources of the HTTP sender. It does nothing if
+        they have been closed or haven't been opened.
+
+        :return: None
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._responses.aclose()
+        finally:
+            if self._opened:
+                await self._close_sender()
+
+
+
+class _Flight:
+
+    """
+    One HTTP request which is being sent, and the result which is shared with the requests waiting for it.
+    """
+
+    def __init__(self, done: Any):
+        self.done = done
+        self.waiters = 0
+        self.snapshot: Optional[ResponseSnapshot] = None
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+
+
+    def share(self, response: Any, snapshot: Optional[ResponseSnapshot]) -> None:
+        self.snapshot = snapshot
+        if snapshot is None and isinstance(response, BaseException):
+            # *request* returns the exception if it still fails after retrying.
+            self.result = response
+
+
+
+class _BaseSingleFlight:
+
+    """
+    The HTTP requests which are being sent. The concurrent requests with the same key wait for the first one
+    (single-flight) and share its response instead of sending the same HTTP request again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+
+    def _take_off(self, key: Hashable, done: Callable[[], Any]) -> Tuple[_Flight, bool]:
+        """
+        Join the HTTP request which is being sent, or start a new one.
+
+        :param key: The key of HTTP request.
+        :param done: The factory of the event which is set when the HTTP request is done.
+        :return: A tuple of the flight and whether it's the first one which should send the HTTP request.
+        """
+
+        with self._lock:
+            _flight = self._flights.get(key)
+            if _flight is not None:
+                _flight.waiters += 1
+                return _flight, False
+            _flight = _Flight(done())
+            self._flights[key] = _flight
+            return _flight, True
+
+
+    def _land(self, key: Hashable, flight: _Flight) -> int:
+        """
+        Finish the HTTP request, so the later requests with the same key send a new one.
+
+        :param key: The key of HTTP request.
+        :param flight: The flight of the HTTP request.
+        :return: How many requests are waiting for it.
+        """
+
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            return flight.waiters
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {}
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()
+
+
+
+class _SingleFlight(_BaseSingleFlight):
+
+    def request(self, key: Hashable, url: str, send: Callable[[], Any]) -> Generic[HTTPResponse]:
+        """
+        Send HTTP request if no one is sending the same one, or wait for it.
+
+        :param key: The key of HTTP request.
+        :param url: URL.
+        :param send: The function which sends HTTP request.
+        :return: A HTTP response object.
+        """
+
+        _flight, _is_first = self._take_off(key, threading.Event)
+        if _is_first is False:
+            _flight.done.wait()
+            if _flight.error is not None:
+                raise _flight.error
+            if _flight.snapshot is not None:
+                return CachedResponse(_flight.snapshot)
+            return _flight.result if _flight.result is not None else send()
+
+        try:
+            _response = send()
+            if self._land(key, _flight) == 0:
+                return _response
+            _flight.share(_response, _snapshot_response(_response, url))
+            return _response
+        except Exception as e:
+            _flight.error = e
+            raise
+        finally:
+            self._land(key, _flight)
+            _flight.done.set()
+
+
+
+class _AsyncSingleFlight(_BaseSingleFlight):
+
+    async def request(self, key: Hashable, url: str, send: Callable[[], Any]) -> Generic[HTTPResponse]:
+        """
+        Asynchronous version of *_SingleFlight.request*. Only the coroutines of the same event loop wait for each other.
+
+        :param key: The key of HTTP request.
+        :param url: URL.
+        :param send: The coroutine function which sends HTTP request.
+        :return: A HTTP response object.
+        """
+
+        key = (_get_running_loop(), key)
+        _flight, _is_first = self._take_off(key, asyncio.Event)
+        if _is_first is False:
+            await _flight.done.wait()
+            if _flight.error is not None:
+                raise _flight.error
+            if _flight.snapshot is not None:
+                return AsyncCachedResponse(_flight.snapshot)
+            return _flight.result if _flight.result is not None else await send()
+
+        try:
+            _response = await send()
+            if self._land(key, _flight) == 0:
+                return _response
+            _flight.share(_response, await _asnapshot_response(_response, url))
+            return _response
+        except Exception as e:
+            _flight.error = e
+            raise
+        finally:
+            self._land(key, _flight)
+            _flight.done.set()
+
+
+
+_Single_Flight_Lock = threading.Lock()
+
+
+def _check_retry_timeout(timeout: int) -> None:
+    if timeout <= 0:
+        raise ValueError("The value of option *timeout* should be bigger than 0. The smallest valid option value is 1.")
+
+
+def _total_timeout(timeouts: Optional[Timeouts]) -> Optional[float]:
+    return timeouts.total if timeouts is not None else None
+
+
+async def _await_within_deadline(awaitable: Any, url: str) -> Any:
+    """
+    Await the HTTP request, and cancel it if it's still being sent at the deadline of the running code.
+
+    :param awaitable: The coroutine which sends HTTP request.
+    :param url: URL.
+    :return: The result of the coroutine.
+    """
+
+    _deadline = Deadline.current()
+    if _deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, _deadline.remaining())
+    except asyncio.TimeoutError:
+        if not _deadline.expired():
+            # It's the timeout of the HTTP request itself, e.g., the read timeout of the session.
+            raise
+        raise DeadlineExceededError(f"receiving HTTP response from '{url}'") from None
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency <= 0:
+        raise ValueError("The value of option *concurrency* should be bigger than 0.")
+
+
+async def _aiter_requests(requests: Iterable[BatchRequest]) -> AsyncIterator[BatchRequest]:
+    for _request in requests:
+        yield _request
+
+
+@lru_cache(maxsize=128)
+def _match_http_method(method: str) -> Optional[HTTPMethod]:
+    _method = method.lower()
+    for _http_method, _name in _HTTP_Method_Names.items():
+        if _name in _method:
+            return _http_method
+    return None
+
+
+def _resolve_http_method(method: Union[str, HTTPMethod]) -> Optional[HTTPMethod]:
+    """
+    Resolve the HTTP method of option *method* of *request*. A string is matched case-insensitively, and the
+    result is cached so that it only be matched once for the same string.
+
+    :param method: The HTTP method. It could be a string or a member of **HTTPMethod**.
+    :return: A member of **HTTPMethod**, or None if it's invalid.
+    """
+
+    if isinstance(method, HTTPMethod):
+        return method
+    if isinstance(method, str):
+        return _match_http_method(method)
+    return None
+
+
+# The HTTP methods whose responses could be cached.
+_Cacheable_Methods = (HTTPMethod.GET, HTTPMethod.HEAD)
+
+
+def _response_cache_key(cache: Optional[ResponseCache], http_method: Optional[HTTPMethod], url: str, kwargs: Dict[str, Any]) -> Any:
+    if cache is None or http_method not in _Cacheable_Methods:
+        return None
+    return cache.key(http_method.value, url, kwargs.get("headers"))
+
+
+def _single_flight_key(coalesce: bool, http_method: Optional[HTTPMethod], url: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+    if coalesce is False or http_method not in _Cacheable_Methods:
+        return None
+    return http_method, url, repr(args), repr(sorted(kwargs.items(), key=lambda _item: _item[0]))
+
+
+def _revalidate_response(disk_cache: Optional[DiskResponseCache], stored: Optional[Any], status: Optional[int]) -> Optional[Any]:
+    if disk_cache is None or stored is None:
+        return None
+    return disk_cache.revalidate(stored, status)
+
+
+def _is_snapshot_needed(cache: Optional[ResponseCache],
+                        cache_key: Any,
+                        disk_cache: Optional[DiskResponseCache],
+                        http_method: Optional[HTTPMethod],
+                        status: Optional[int]) -> bool:
+    if cache_key is not None and cache.is_cacheable(status):
+        return True
+    return disk_cache is not None and http_method is HTTPMethod.GET and status == 200
+
+
+def _keep_snapshot(cache: Optional[ResponseCache],
+                   cache_key: Any,
+                   disk_cache: Optional[DiskResponseCache],
+                   http_method: Optional[HTTPMethod],
+                   snapshot: Any) -> None:
+    """
+    Keep the snapshot of response in the in-memory cache and the disk cache.
+
+    :param cache: The in-memory cache.
+    :param cache_key: The key of the in-memory cache. It's None if it shouldn't be cached in memory.
+    :param disk_cache: The disk cache.
+    :param http_method: The resolved HTTP method.
+    :param snapshot: The snapshot of response.
+    :return: None
+    """
+
+    if cache_key is not None and cache.is_cacheable(snapshot.status):
+        cache.set(cache_key, snapshot)
+    if disk_cache is not None and http_method is HTTPMethod.GET:
+        disk_cache.set(snapshot)
+
+
+def _release_response(response: Any) -> None:
+    """
+    Release the connection of the HTTP response which is discarded, so the connection pool doesn't run out of
+    connections. It supports the response objects of *urllib3*, *aiohttp* and *requests*.
+
+    :param response: A HTTP response object.
+    :return: None
+    """
+
+    for _release_name in ("release_conn", "release", "close"):
+        _release = getattr(response, _release_name, None)
+        if callable(_release):
+            _result = _release()
+            if asyncio.iscoroutine(_result):
+                # The old versions of aiohttp return a no-op coroutine.
+                _result.close()
+            return
+
+
+def _count_response_bytes(counter: ByteCounter, response: Any) -> None:
+    _sizes = _response_bytes(response)
+    if _sizes is not None:
+        counter.record(*_sizes)
+
+
+async def _acount_response_bytes(counter: ByteCounter, response: Any, stream: bool) -> None:
+    """
+    Asynchronous version of *_count_response_bytes*. It reads the body of the response of *aiohttp* first if it
+    isn't streamed.
+
+    :param counter: The byte counter.
+    :param response: A HTTP response object.
+    :param stream: Whether the body of the response is streamed.
+    :return: None
+    """
+
+    _read = getattr(response, "read", None)
+    if stream is False and getattr(response, "_body", b"") is None and callable(_read):
+        await _read()
+    _count_response_bytes(counter, response)
+
+
+def _discard_hedged_response(future: Any) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _release_response(future.result())
+
+
+def _invalid_http_method_error(method: Any) -> TypeError:
+    return TypeError(f"Invalid HTTP method it got: '{str(method).upper()}'.")
+
+
+# The HTTP status which means the server is overloaded: Too Many Requests and Service Unavailable.
+_Overloaded_Status = (429, 503)
 
 
+def _is_overloaded_response(response: Any) -> bool:
+    return _response_status(response) in _Overloaded_Status
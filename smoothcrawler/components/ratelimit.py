@@ -0,0 +1,256 @@
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+from hashlib import blake2b
+import threading
+import asyncio
+import struct
+import time
+
+from .shared import _SharedMemoryBlock
+
+
+# Every slot of **SharedTokenBucketRateLimiter** has the hash of host (0 is an empty slot), its tokens and its last
+# refilled time.
+_Slot_Format = "<qdd"
+_Slot_Size = struct.calcsize(_Slot_Format)
+
+
+class _TokenBucketOptions:
+
+    """
+    The options of token buckets. Every host has its own bucket which is refilled with *rate* tokens per second
+    and keeps at most *burst* tokens. Sending one HTTP request takes one token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, rates: Dict[str, float] = None):
+        """
+        Check the options.
+
+        :param rate: How many requests per second it could send to one host.
+        :param burst: How many requests it could send to one host at once without waiting.
+        :param rates: The hosts which have their own requests per second, e.g., {"www.twse.com.tw": 0.5}.
+        """
+
+        _rates = dict(rates or {})
+        if rate <= 0 or any(_rate <= 0 for _rate in _rates.values()):
+            raise ValueError("The requests per second should be bigger than 0.")
+        if burst <= 0:
+            raise ValueError("The option *burst* should be bigger than 0.")
+        self._rate = rate
+        self._burst = burst
+        self._rates = _rates
+
+
+    @property
+    def rate(self) -> float:
+        """
+        The default requests per second of one host.
+
+        :return: A float type value.
+        """
+
+        return self._rate
+
+
+    @property
+    def burst(self) -> int:
+        """
+        How many requests it could send to one host at once without waiting.
+
+        :return: An int type value.
+        """
+
+        return self._burst
+
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        """
+        The hosts which have their own requests per second.
+
+        :return: A dict type value.
+        """
+
+        return dict(self._rates)
+
+
+    def _take(self, host: str, tokens: float, updated: float, now: float) -> Tuple[float, float]:
+        """
+        Take one token from the bucket of the host. The token could be taken in advance (the tokens become negative),
+        so the caller only waits outside the lock and the waiting callers are served in order.
+
+        :param host: The host.
+        :param tokens: The tokens of the bucket. It's NaN if the bucket is new.
+        :param updated: The last time the bucket was refilled.
+        :param now: The current time of *time.monotonic*.
+        :return: A tuple of the tokens after taking one and the seconds it should wait.
+        """
+
+        _rate = self._rates.get(host, self._rate)
+        if tokens != tokens:
+            tokens = float(self._burst)
+        else:
+            tokens = min(float(self._burst), tokens + (now - updated) * _rate)
+        tokens -= 1
+        return tokens, (-tokens / _rate if tokens < 0 else 0.0)
+
+
+
+class BaseRateLimiter(_TokenBucketOptions, metaclass=ABCMeta):
+
+    """
+    The rate limiter of *HTTP* sender. It limits how many requests per second it sends to every host, it's different
+    from option *lock* / *sema_value* of crawler roles which only limits how many requests it sends at the same time.
+    """
+
+    @abstractmethod
+    def acquire(self, url: str) -> None:
+        """
+        Block until it could send the HTTP request to the host of URL.
+
+        :param url: URL.
+        :return: None
+        """
+
+        pass
+
+
+
+class BaseAsyncRateLimiter(_TokenBucketOptions, metaclass=ABCMeta):
+
+    """
+    Asynchronous version of **BaseRateLimiter** for *AsyncHTTP*.
+    """
+
+    @abstractmethod
+    async def acquire(self, url: str) -> None:
+        """
+        Asynchronous version of *BaseRateLimiter.acquire*. It doesn't block the event loop when it waits.
+
+        :param url: URL.
+        :return: None
+        """
+
+        pass
+
+
+
+class TokenBucketRateLimiter(BaseRateLimiter):
+
+    """
+    The thread-safe rate limiter for running mode *RunAsConcurrent* (or *SimpleCrawler*). The buckets are NOT shared
+    between processes, so please use **SharedTokenBucketRateLimiter** with the running mode *RunAsParallel*.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, rates: Dict[str, float] = None):
+        super().__init__(rate=rate, burst=burst, rates=rates)
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+
+    def acquire(self, url: str) -> None:
+        _host = urlsplit(url).hostname or ""
+        with self._lock:
+            _now = time.monotonic()
+            _bucket = self._buckets.setdefault(_host, [float("nan"), _now])
+            _bucket[0], _wait = self._take(_host, _bucket[0], _bucket[1], _now)
+            _bucket[1] = _now
+        if _wait > 0:
+            time.sleep(_wait)
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state["_lock"] = None
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+
+class SharedTokenBucketRateLimiter(BaseRateLimiter):
+
+    """
+    The process-shared rate limiter for running mode *RunAsParallel*. The buckets are in shared memory and guarded
+    by a process lock, so all the processes share the requests per second of a host. Like **BloomVisitedSet**, it
+    should be created before the processes start, and the processes of a pool need it by the initializer
+    *attach_shared_objects* (**PoolCrawler** does it). It keeps at most *max_hosts* buckets because the shared
+    memory cannot grow.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, rates: Dict[str, float] = None, max_hosts: int = 1024):
+        """
+        Allocate the buckets in shared memory.
+
+        :param rate: How many requests per second it could send to one host.
+        :param burst: How many requests it could send to one host at once without waiting.
+        :param rates: The hosts which have their own requests per second.
+        :param max_hosts: How many hosts it could keep.
+        """
+
+        super().__init__(rate=rate, burst=burst, rates=rates)
+        if max_hosts <= 0:
+            raise ValueError("The option *max_hosts* should be bigger than 0.")
+        self._max_hosts = max_hosts
+        self._block = _SharedMemoryBlock(max_hosts * _Slot_Size)
+
+
+    def acquire(self, url: str) -> None:
+        _host = urlsplit(url).hostname or ""
+        _host_hash = int.from_bytes(blake2b(_host.encode("utf-8"), digest_size=8).digest(), "little", signed=True) or 1
+        _buffer = self._block.buf
+        with self._block.lock:
+            _slot = self._find_slot(_host_hash)
+            _now = time.monotonic()
+            _slot_host_hash, _tokens, _updated = struct.unpack_from(_Slot_Format, _buffer, _slot * _Slot_Size)
+            if _slot_host_hash == 0:
+                _tokens = float("nan")
+            _tokens, _wait = self._take(_host, _tokens, _updated, _now)
+            struct.pack_into(_Slot_Format, _buffer, _slot * _Slot_Size, _host_hash, _tokens, _now)
+        if _wait > 0:
+            time.sleep(_wait)
+
+
+    def _find_slot(self, host_hash: int) -> int:
+        """
+        Find the slot of host by linear probing. It should be called with the lock.
+
+        :param host_hash: The hash of host.
+        :return: The index of slot.
+        """
+
+        _buffer = self._block.buf
+        _start = host_hash % self._max_hosts
+        for _offset in range(self._max_hosts):
+            _slot = (_start + _offset) % self._max_hosts
+            if struct.unpack_from("<q", _buffer, _slot * _Slot_Size)[0] in (0, host_hash):
+                return _slot
+        raise ValueError(f"It cannot keep more than {self._max_hosts} hosts, please set a bigger option *max_hosts*.")
+
+
+
+class AsyncTokenBucketRateLimiter(BaseAsyncRateLimiter):
+
+    """
+    The rate limiter for *AsyncHTTP* / *AsyncSimpleCrawler*. The coroutines which wait for tokens sleep in the event
+    loop, so the other coroutines keep running.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, rates: Dict[str, float] = None):
+        super().__init__(rate=rate, burst=burst, rates=rates)
+        self._buckets: Dict[str, List[float]] = {}
+
+
+    async def acquire(self, url: str) -> None:
+        # It doesn't need a lock because nothing is awaited between reading and updating the bucket.
+        _host = urlsplit(url).hostname or ""
+        _now = time.monotonic()
+        _bucket = self._buckets.setdefault(_host, [float("nan"), _now])
+        _bucket[0], _wait = self._take(_host, _bucket[0], _bucket[1], _now)
+        _bucket[1] = _now
+        if _wait > 0:
+            await asyncio.sleep(_wait)
@@ -0,0 +1,308 @@
+from typing import Any, Tuple, Iterator, AsyncIterator, Optional, NamedTuple
+import json as _json
+import io
+import re
+
+
+# The default size of the chunks of streaming response body.
+Default_Chunk_Size = 64 * 1024
+
+
+class ResponseSnapshot(NamedTuple):
+
+    """
+    The HTTP status, headers and body of a HTTP response which has been read completely. It could be kept in a cache
+    and be turned into a new response object whenever it's needed.
+    """
+
+    url: str
+    status: int
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+
+
+
+class ResponseHeaders(dict):
+
+    """
+    The case-insensitive HTTP headers of **CachedResponse** and **AsyncCachedResponse**.
+    """
+
+    def __init__(self, headers: Tuple[Tuple[str, str], ...] = ()):
+        super().__init__((_name.lower(), _value) for _name, _value in headers)
+
+
+    def __getitem__(self, name: str) -> str:
+        return super().__getitem__(name.lower())
+
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and super().__contains__(name.lower())
+
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return super().get(name.lower(), default)
+
+
+
+class _BaseCachedResponse:
+
+    def __init__(self, snapshot: ResponseSnapshot):
+        self._snapshot = snapshot
+        self.headers = ResponseHeaders(snapshot.headers)
+
+
+    @property
+    def url(self) -> str:
+        return self._snapshot.url
+
+
+    @property
+    def status(self) -> int:
+        return self._snapshot.status
+
+
+    @property
+    def status_code(self) -> int:
+        return self._snapshot.status
+
+
+    @property
+    def encoding(self) -> str:
+        _charset = re.search(r"charset=([\w-]+)", self.headers.get("Content-Type", ""))
+        return _charset.group(1) if _charset else "utf-8"
+
+
+    @property
+    def snapshot(self) -> ResponseSnapshot:
+        """
+        The snapshot of the HTTP response.
+
+        :return: A **ResponseSnapshot** object.
+        """
+
+        return self._snapshot
+
+
+
+class CachedResponse(_BaseCachedResponse):
+
+    """
+    The HTTP response which is built from a **ResponseSnapshot** (e.g., served from a cache). It has the common
+    attributes of the response objects of *urllib3* (*status*, *headers*, *data*, *read*) and *requests*
+    (*status_code*, *content*, *text*, *json*), so the parsers could handle it as the original one.
+    """
+
+    def __init__(self, snapshot: ResponseSnapshot):
+        super().__init__(snapshot)
+        self._stream = io.BytesIO(snapshot.body)
+
+
+    @property
+    def data(self) -> bytes:
+        return self._snapshot.body
+
+
+    @property
+    def content(self) -> bytes:
+        return self._snapshot.body
+
+
+    @property
+    def text(self) -> str:
+        return self._snapshot.body.decode(self.encoding, errors="replace")
+
+
+    def read(self, amt: int = None) -> bytes:
+        return self._stream.read(amt)
+
+
+    def stream(self, amt: int = Default_Chunk_Size) -> Iterator[bytes]:
+        while True:
+            _chunk = self._stream.read(amt)
+            if not _chunk:
+                return
+            yield _chunk
+
+
+    def json(self) -> Any:
+        return _json.loads(self._snapshot.body)
+
+
+    def release_conn(self) -> None:
+        pass
+
+
+
+class AsyncCachedResponse(_BaseCachedResponse):
+
+    """
+    Asynchronous version of **CachedResponse**. It has the common attributes of the response object of *aiohttp*
+    (*status*, *headers*, *read*, *text*, *json*).
+    """
+
+    async def read(self) -> bytes:
+        return self._snapshot.body
+
+
+    async def text(self, encoding: str = None) -> str:
+        return self._snapshot.body.decode(encoding or self.encoding, errors="replace")
+
+
+    async def json(self) -> Any:
+        return _json.loads(self._snapshot.body)
+
+
+    async def iter_chunked(self, n: int = Default_Chunk_Size) -> AsyncIterator[bytes]:
+        for _start in range(0, len(self._snapshot.body), n):
+            yield self._snapshot.body[_start:_start + n]
+
+
+    def release(self) -> None:
+        pass
+
+
+
+def _response_status(response: Any) -> Optional[int]:
+    """
+    Get the HTTP status of response. It supports the response objects of *urllib3*, *aiohttp* (*status*)
+    and *requests* (*status_code*).
+
+    :param response: A HTTP response object.
+    :return: The HTTP status, or None if it isn't a HTTP response object.
+    """
+
+    _status = getattr(response, "status", None)
+    if _status is None:
+        _status = getattr(response, "status_code", None)
+    return _status if isinstance(_status, int) else None
+
+
+def _response_headers(response: Any) -> Tuple[Tuple[str, str], ...]:
+    _headers = getattr(response, "headers", None) or {}
+    return tuple((str(_name), str(_value)) for _name, _value in _headers.items())
+
+
+def _snapshot_response(response: Any, url: str) -> Optional[ResponseSnapshot]:
+    """
+    Take the snapshot of the HTTP response whose body has been read, e.g., the response of *urllib3* (with
+    *preload_content*) or *requests*.
+
+    :param response: A HTTP response object.
+    :param url: The URL of HTTP request.
+    :return: A **ResponseSnapshot** object, or None if it doesn't know how to get the body of the response.
+    """
+
+    if isinstance(response, _BaseCachedResponse):
+        return response.snapshot
+    _status = _response_status(response)
+    if _status is None:
+        return None
+    _body = getattr(response, "data", None)
+    if not isinstance(_body, bytes):
+        _body = getattr(response, "content", None)
+    if not isinstance(_body, bytes):
+        return None
+    return ResponseSnapshot(url=url, status=_status, headers=_response_headers(response), body=_body)
+
+
+async def _asnapshot_response(response: Any, url: str) -> Optional[ResponseSnapshot]:
+    """
+    Asynchronous version of *_snapshot_response*. It reads the body of the response of *aiohttp* and releases it.
+
+    :param response: A HTTP response object.
+    :param url: The URL of HTTP request.
+    :return: A **ResponseSnapshot** object, or None if it doesn't know how to get the body of the response.
+    """
+
+    if isinstance(response, _BaseCachedResponse):
+        return response.snapshot
+    _status = _response_status(response)
+    _read = getattr(response, "read", None)
+    if _status is None or not callable(_read):
+        return None
+    _body = await _read()
+    _release = getattr(response, "release", None)
+    if callable(_release):
+        _result = _release()
+        if hasattr(_result, "__await__"):
+            await _result
+    return ResponseSnapshot(url=url, status=_status, headers=_response_headers(response), body=_body)
+
+
+def iter_chunks(response: Any, chunk_size: int = Default_Chunk_Size) -> Iterator[bytes]:
+    """
+    Iterate the body of the HTTP response chunk by chunk, so it only keeps one chunk in memory if the body hasn't
+    been read. It supports the response objects of *urllib3* (*stream*, with option *preload_content=False* to
+    stream the body from the connection), *requests* (*iter_content*, with option *stream=True*), the file-like
+    objects (*read*) and **CachedResponse**.
+
+    :param response: A HTTP response object.
+    :param chunk_size: The most bytes of one chunk.
+    :return: An iterator of bytes.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("The option *chunk_size* should be bigger than 0.")
+
+    # The body of urllib3 response which has been preloaded couldn't be streamed again.
+    _body = getattr(response, "_body", None)
+    if isinstance(_body, bytes):
+        for _start in range(0, len(_body), chunk_size):
+            yield _body[_start:_start + chunk_size]
+        return
+
+    _stream = getattr(response, "stream", None)
+    if callable(_stream):
+        try:
+            yield from _stream(chunk_size)
+        except GeneratorExit:
+            # The rest of the body is still on the connection, so it couldn't be reused.
+            _close = getattr(response, "close", None)
+            if callable(_close):
+                _close()
+            raise
+        _release_conn = getattr(response, "release_conn", None)
+        if callable(_release_conn):
+            _release_conn()
+        return
+    _iter_content = getattr(response, "iter_content", None)
+    if callable(_iter_content):
+        yield from _iter_content(chunk_size)
+        return
+    _read = getattr(response, "read", None)
+    if callable(_read):
+        while True:
+            _chunk = _read(chunk_size)
+            if not _chunk:
+                return
+            yield _chunk
+    raise TypeError("It doesn't know how to stream the body of the HTTP response.")
+
+
+async def aiter_chunks(response: Any, chunk_size: int = Default_Chunk_Size) -> AsyncIterator[bytes]:
+    """
+    Asynchronous version of *iter_chunks*. It supports the response objects of *aiohttp* (*content.iter_chunked*)
+    and **AsyncCachedResponse**.
+
+    :param response: A HTTP response object.
+    :param chunk_size: The most bytes of one chunk.
+    :return: An asynchronous iterator of bytes.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("The option *chunk_size* should be bigger than 0.")
+
+    # The body of aiohttp response which has been read couldn't be streamed again.
+    _body = getattr(response, "_body", None)
+    if isinstance(_body, bytes):
+        for _start in range(0, len(_body), chunk_size):
+            yield _body[_start:_start + chunk_size]
+        return
+
+    _content = getattr(response, "content", None)
+    _iter_chunked = getattr(_content, "iter_chunked", None) or getattr(response, "iter_chunked", None)
+    if not callable(_iter_chunked):
+        raise TypeError("It doesn't know how to stream the body of the HTTP response.")
+    async for _chunk in _iter_chunked(chunk_size):
+        yield _chunk
@@ -0,0 +1,195 @@
+from typing import Any, List, Tuple, Type, Iterable, Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import heapq
+import random
+import time
+
+from .response import _response_status
+
+
+class RetryPolicy:
+
+    """
+    The retry policy of crawler roles. It retries the HTTP request which gets the retryable HTTP status or
+    exception with exponential backoff and jitter, and it respects the header *Retry-After* of the HTTP response.
+
+    The crawler roles don't sleep for the backoff when they crawl a collection of URLs, the URL which should be
+    retried is put back on a timer queue and the other URLs keep being crawled while it waits.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 multiplier: float = 2.0,
+                 max_backoff: float = 60.0,
+                 jitter: bool = True,
+                 statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+                 respect_retry_after: bool = True):
+        """
+        Configure the retry policy.
+
+        :param max_retries: How many times it retries one URL at most. It doesn't retry if it's 0.
+        :param backoff: The seconds it waits before the first retry.
+        :param multiplier: The backoff is multiplied by it in every retry.
+        :param max_backoff: The longest seconds of backoff.
+        :param jitter: It waits random seconds between 0 and the backoff (full jitter) if it's True, so the
+                       retries of many URLs don't hit the server at the same time.
+        :param statuses: The HTTP status which should be retried.
+        :param exceptions: The exceptions of sending HTTP request which should be retried.
+        :param respect_retry_after: It waits the seconds of header *Retry-After* if the HTTP response has it.
+        """
+
+        if max_retries < 0:
+            raise ValueError("The option *max_retries* should be bigger than or equal to 0.")
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("The backoff should be bigger than or equal to 0.")
+        if multiplier < 1:
+            raise ValueError("The option *multiplier* should be bigger than or equal to 1.")
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._multiplier = multiplier
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._statuses = frozenset(statuses)
+        self._exceptions = tuple(exceptions)
+        self._respect_retry_after = respect_retry_after
+
+
+    @property
+    def max_retries(self) -> int:
+        """
+        How many times it retries one URL at most.
+
+        :return: An int type value.
+        """
+
+        return self._max_retries
+
+
+    def should_retry(self, attempt: int, response: Any = None, error: BaseException = None) -> bool:
+        """
+        Check whether it should retry the HTTP request.
+
+        :param attempt: How many times it has retried the URL.
+        :param response: The HTTP response it got.
+        :param error: The exception it got when it sent the HTTP request.
+        :return: It returns True if it should retry, or it returns False.
+        """
+
+        if attempt >= self._max_retries:
+            return False
+        if error is not None:
+            return isinstance(error, self._exceptions)
+        return _response_status(response) in self._statuses
+
+
+    def delay(self, attempt: int, response: Any = None, error: BaseException = None) -> float:
+        """
+        The seconds it should wait before retrying the HTTP request.
+
+        :param attempt: How many times it has retried the URL.
+        :param response: The HTTP response it got.
+        :param error: The exception it got, e.g., **CircuitOpenError** which has the seconds it should wait.
+        :return: A float type value.
+        """
+
+        if self._respect_retry_after is True:
+            _retry_after = _parse_retry_after(response)
+            if _retry_after is not None:
+                return _retry_after
+        # E.g., **CircuitOpenError** knows when the circuit lets a probe through.
+        _retry_after = getattr(error, "retry_after", None)
+        if isinstance(_retry_after, (int, float)):
+            return float(_retry_after)
+
+        _backoff = min(self._max_backoff, self._backoff * self._multiplier ** attempt)
+        if self._jitter is True:
+            return random.uniform(0, _backoff)
+        return _backoff
+
+
+
+class RetryTimerQueue:
+
+    """
+    The timer queue of URLs which wait for retrying. It's used by one worker, so it isn't thread-safe.
+    """
+
+    def __init__(self):
+        self._timers: List[Tuple[float, int, str, int]] = []
+        self._counter = 0
+
+
+    def push(self, url: str, attempt: int, delay: float) -> None:
+        """
+        Put the URL back on the queue.
+
+        :param url: URL.
+        :param attempt: How many times it has retried the URL.
+        :param delay: The seconds it should wait before retrying.
+        :return: None
+        """
+
+        # The counter keeps the order of the URLs which are due at the same time.
+        self._counter += 1
+        heapq.heappush(self._timers, (time.monotonic() + delay, self._counter, url, attempt))
+
+
+    def pop_due(self) -> List[Tuple[str, int]]:
+        """
+        Take the URLs which are due.
+
+        :return: A list of tuples of URL and how many times it has retried the URL.
+        """
+
+        _now = time.monotonic()
+        _due = []
+        while self._timers and self._timers[0][0] <= _now:
+            _, _, _url, _attempt = heapq.heappop(self._timers)
+            _due.append((_url, _attempt))
+        return _due
+
+
+    def next_delay(self) -> float:
+        """
+        The seconds until the first URL is due.
+
+        :return: A float type value. It's 0 if the queue is empty.
+        """
+
+        if not self._timers:
+            return 0.0
+        return max(0.0, self._timers[0][0] - time.monotonic())
+
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+
+
+def _parse_retry_after(response: Any) -> Optional[float]:
+    """
+    Parse the header *Retry-After* which is either seconds or a HTTP date.
+
+    :param response: A HTTP response object.
+    :return: The seconds it should wait, or None if it doesn't have a valid header *Retry-After*.
+    """
+
+    _headers = getattr(response, "headers", None)
+    if _headers is None:
+        return None
+    _retry_after = _headers.get("Retry-After")
+    if not _retry_after:
+        return None
+    _retry_after = str(_retry_after).strip()
+    if _retry_after.isdigit():
+        return float(_retry_after)
+    try:
+        _date = parsedate_to_datetime(_retry_after)
+    except (TypeError, ValueError):
+        return None
+    if _date.tzinfo is None:
+        _date = _date.replace(tzinfo=timezone.utc)
+    return max(0.0, (_date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,106 @@
+from multiprocessing.context import get_spawning_popen
+from ctypes import c_ubyte
+from typing import Any, Dict, List
+import multiprocessing
+import weakref
+import uuid
+
+
+# The blocks of the current process by their keys, so the pickled copies attach the same memory and lock.
+_Shared_Blocks: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+# The objects which are handed to the current process by *attach_shared_objects*.
+_Attached_Objects: List[Any] = []
+
+
+class _SharedMemoryBlock:
+
+    """
+    A block of shared memory with a process lock which could be pickled. The memory is a *multiprocessing.RawArray*
+    and the lock is a *multiprocessing.Lock*, they're handed to the child processes when the processes start (by
+    inheritance of the forked processes, or by the arguments of the processes and the initializer of the pool, e.g.,
+    *attach_shared_objects*). After that, the pickled copies (e.g., the tasks of **PoolCrawler** with *RunAsParallel*)
+    only carry the key of the block, and they attach the memory and the lock which the process already has.
+    """
+
+    def __init__(self, size: int):
+        """
+        Allocate the block of shared memory and the lock.
+
+        :param size: The size of block in bytes.
+        """
+
+        self._key = uuid.uuid4().hex
+        self._size = size
+        self._array = multiprocessing.RawArray(c_ubyte, size)
+        self._lock = multiprocessing.Lock()
+        _Shared_Blocks[self._key] = self
+
+
+    @property
+    def buf(self) -> memoryview:
+        """
+        The bytes of the block.
+
+        :return: A *memoryview* object.
+        """
+
+        return memoryview(self._array).cast("B")
+
+
+    @property
+    def lock(self) -> Any:
+        """
+        The lock which is shared between processes.
+
+        :return: A *multiprocessing.Lock* object.
+        """
+
+        return self._lock
+
+
+    @property
+    def size(self) -> int:
+        """
+        The size of block in bytes.
+
+        :return: An int type value.
+        """
+
+        return self._size
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = {"key": self._key, "size": self._size}
+        if get_spawning_popen() is not None:
+            # The memory and the lock could only be pickled when the child process is being started.
+            _state.update(array=self._array, lock=self._lock)
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._key = state["key"]
+        self._size = state["size"]
+        if "array" in state:
+            self._array, self._lock = state["array"], state["lock"]
+            _Shared_Blocks.setdefault(self._key, self)
+            return
+        _block = _Shared_Blocks.get(self._key)
+        if _block is None:
+            raise RuntimeError("The shared memory block isn't handed to this process. Please create it before the "
+                               "processes start, and hand it to the processes of pool by *attach_shared_objects*.")
+        self._array, self._lock = _block._array, _block._lock
+
+
+
+def attach_shared_objects(*objects: Any) -> None:
+    """
+    The initializer of the processes of *multiprocessing.Pool*. The objects which have shared memory (e.g.,
+    **BloomVisitedSet** and **SharedTokenBucketRateLimiter**) are handed to the processes with it, so their pickled
+    copies in the tasks of the pool share the same memory. **PoolCrawler** with *RunAsParallel* does it with its
+    visited set and rate limiter.
+
+    :param objects: The objects which have shared memory.
+    :return: None
+    """
+
+    _Attached_Objects.extend(objects)
@@ -0,0 +1,191 @@
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Set, Iterator
+from hashlib import blake2b
+import threading
+import struct
+import math
+
+from .shared import _SharedMemoryBlock
+
+
+_Count_Size = struct.calcsize("<q")
+
+
+class BaseVisitedSet(metaclass=ABCMeta):
+
+    """
+    The set of URLs which have been visited. The crawler roles check it before sending HTTP request, so
+    the duplicated URLs (e.g., from the overlapping ranges of *URL* objects or the repeated pushes of a
+    queue) would be skipped.
+    """
+
+    @abstractmethod
+    def add(self, url: str) -> bool:
+        """
+        Check whether the URL has been visited and mark it as visited. It should be atomic.
+
+        :param url: The URL which would be visited.
+        :return: It returns True if the URL hasn't been visited before, or it returns False.
+        """
+
+        pass
+
+
+    @abstractmethod
+    def __contains__(self, url: str) -> bool:
+        pass
+
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+
+class ExactVisitedSet(BaseVisitedSet):
+
+    """
+    The exact visited set which keeps every URL in a Python *set*. It's thread-safe, but it's NOT shared
+    between processes (every process has its own copy), so please use **BloomVisitedSet** with the running
+    mode *RunAsParallel*.
+    """
+
+    def __init__(self):
+        self._urls: Set[str] = set()
+        self._lock = threading.Lock()
+
+
+    def add(self, url: str) -> bool:
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            return True
+
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+
+    def __getstate__(self) -> Dict[str, Any]:
+        _state = self.__dict__.copy()
+        _state["_lock"] = None
+        return _state
+
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+
+class BloomVisitedSet(BaseVisitedSet):
+
+    """
+    The memory-bounded visited set which is a Bloom filter. The memory size only depends on the options
+    *capacity* and *error_rate*, no matter how long the URLs are. A URL which hasn't been visited may be
+    regarded as visited with the probability *error_rate* (false positive), but a visited URL is always
+    regarded as visited.
+
+    The bits are in shared memory and guarded by a process lock, so every process of the running mode *RunAsParallel*
+    sees the same set. It should be created before the processes start, and the processes of a pool need it by the
+    initializer *attach_shared_objects* (**PoolCrawler** does it), then its pickled copies attach the same memory.
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001):
+        """
+        Allocate the bits of Bloom filter.
+
+        :param capacity: How many URLs it expects to keep. The false positive rate would be higher than
+                         *error_rate* if it keeps more URLs than it.
+        :param error_rate: The expected false positive rate. It should be in range 0 to 1 (excluded).
+        """
+
+        if capacity <= 0:
+            raise ValueError("The option *capacity* should be bigger than 0.")
+        if not 0 < error_rate < 1:
+            raise ValueError("The option *error_rate* should be in range 0 to 1 (excluded).")
+
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._bits_number = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._hashes_number = max(1, round(self._bits_number / capacity * math.log(2)))
+        # The count of URLs is in front of the bits.
+        self._block = _SharedMemoryBlock(_Count_Size + (self._bits_number + 7) // 8)
+
+
+    @property
+    def capacity(self) -> int:
+        """
+        How many URLs it expects to keep.
+
+        :return: An int type value.
+        """
+
+        return self._capacity
+
+
+    @property
+    def error_rate(self) -> float:
+        """
+        The expected false positive rate.
+
+        :return: A float type value.
+        """
+
+        return self._error_rate
+
+
+    @property
+    def size(self) -> int:
+        """
+        The memory size of the bits in bytes.
+
+        :return: An int type value.
+        """
+
+        return self._block.size - _Count_Size
+
+
+    def add(self, url: str) -> bool:
+        _positions = self._positions(url)
+        _buffer = self._block.buf
+        with self._block.lock:
+            _is_new = False
+            for _position in _positions:
+                _byte, _mask = _Count_Size + (_position >> 3), 1 << (_position & 7)
+                if not _buffer[_byte] & _mask:
+                    _buffer[_byte] |= _mask
+                    _is_new = True
+            if _is_new:
+                struct.pack_into("<q", _buffer, 0, struct.unpack_from("<q", _buffer, 0)[0] + 1)
+            return _is_new
+
+
+    def __contains__(self, url: str) -> bool:
+        _buffer = self._block.buf
+        return all(_buffer[_Count_Size + (_position >> 3)] & (1 << (_position & 7)) for _position in self._positions(url))
+
+
+    def __len__(self) -> int:
+        # It's approximate because the URL which is a false positive isn't counted.
+        return struct.unpack_from("<q", self._block.buf, 0)[0]
+
+
+    def _positions(self, url: str) -> Iterator[int]:
+        """
+        The positions of bits of the URL. They're calculated by double hashing with one 128-bit hash value.
+
+        :param url: The URL.
+        :return: A generator of positions.
+        """
+
+        _digest = blake2b(url.encode("utf-8"), digest_size=16).digest()
+        _hash_1 = int.from_bytes(_digest[:8], "little")
+        _hash_2 = int.from_bytes(_digest[8:], "little") | 1
+        _bits_number = self._bits_number
+        return ((_hash_1 + _index * _hash_2) % _bits_number for _index in range(self._hashes_number))
@@ -1,19 +1,33 @@
 from multipledispatch import dispatch
 from multirunnable.factory import LockFactory, BoundedSemaphoreFactory
 from multirunnable import RunningMode, SimpleExecutor, SimplePool
-from typing import List, Iterable, Any, TypeVar, Union, Optional, Generic, Callable
+from typing import List, Tuple, Iterable, Iterator, AsyncIterable, AsyncIterator, Sequence, Any, TypeVar, Union, Optional, Generic, Callable
+from collections.abc import Iterable as _IterableType, AsyncIterable as _AsyncIterableType, Sequence as _SequenceType
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from functools import wraps
 from queue import Queue
+import multiprocessing
+import threading
+import asyncio
+import time
+import os
 from abc import ABCMeta
 import logging
 
 from .components.persistence import PersistenceFacade as _PersistenceFacade
-from .components.httpio import BaseHTTP as _BaseHttpIo
+from .components.httpio import BaseHTTP as _BaseHttpIo, _release_response
+from .components.visited import BaseVisitedSet as _BaseVisitedSet
+from .components.shared import attach_shared_objects
+from .components.retry import RetryPolicy as _RetryPolicy, RetryTimerQueue as _RetryTimerQueue
+from .components.deadline import Deadline as _Deadline, DeadlineExceededError as _DeadlineExceededError, deadline_scope, check_deadline, _get_running_loop
+from .components.response import ResponseSnapshot, CachedResponse, AsyncCachedResponse, _snapshot_response, _asnapshot_response
 from .components.data import (
     BaseHTTPResponseParser as _BaseHTTPResponseParser,
     BaseDataHandler as _BaseDataHandler,
     BaseAsyncDataHandler as _BaseAsyncDataHandler
 )
 from .factory import BaseFactory, CrawlerFactory, AsyncCrawlerFactory
+from .urls import URLFrontier, _iter_chunks
 
 
 RunAsParallel = RunningMode.Parallel
@@ -23,12 +37,225 @@ RunAsCoroutine = RunningMode.GreenThread
 T = TypeVar("T")
 
 
+def _with_http_io(function: Callable) -> Callable:
+    """
+    Open the resources of HTTP sender (e.g., the connection pool) before running the function and close them
+    after it finishes. The HTTP sender counts the open calls, so nested calls (e.g., running chunk by chunk)
+    keep the resources alive until the outermost one finishes.
+
+    :param function: The function of crawler role which sends HTTP requests.
+    :return: The wrapped function.
+    """
+
+    @wraps(function)
+    def _wrapper(self, *args, **kwargs):
+        self._open_http_io()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            self._close_http_io()
+
+    return _wrapper
+
+
+def _with_async_http_io(function: Callable) -> Callable:
+    """
+    The asynchronous version of *_with_http_io*.
+
+    :param function: The coroutine function of crawler role which sends HTTP requests.
+    :return: The wrapped coroutine function.
+    """
+
+    @wraps(function)
+    async def _wrapper(self, *args, **kwargs):
+        await self._open_async_http_io()
+        try:
+            return await function(self, *args, **kwargs)
+        finally:
+            await self._close_async_http_io()
+
+    return _wrapper
+
+
+def _check_deadline_of_response(step: str, response: Any) -> None:
+    """
+    Raise **DeadlineExceededError** if the deadline of the running code has been exceeded, and release the
+    connection of the HTTP response which won't be parsed.
+
+    :param step: The step it's going to do.
+    :param response: The HTTP response.
+    :return: None
+    """
+
+    try:
+        check_deadline(step)
+    except _DeadlineExceededError:
+        _release_response(response)
+        raise
+
+
+def _check_retry_deadline(deadline: Optional[_Deadline], delay: float, url: str) -> None:
+    # It doesn't wait for the backoff which ends after the deadline.
+    if deadline is not None and delay >= deadline.remaining():
+        raise _DeadlineExceededError(f"retrying URL '{url}' after {delay:.2f} seconds")
+
+
+def _skip_expired_url(job_deadline: Optional[_Deadline], url: str, error: _DeadlineExceededError) -> None:
+    """
+    Skip the URL which exceeds its deadline. It raises the error if the deadline of the whole job has been exceeded.
+
+    :param job_deadline: The deadline of the whole job.
+    :param url: URL.
+    :param error: The error it got.
+    :return: None
+    """
+
+    if job_deadline is not None and job_deadline.expired():
+        raise error
+    logging.warning(f"Skip URL '{url}': {error}")
+
+
+def _parse_snapshot(parser: _BaseHTTPResponseParser, data_handler: _BaseDataHandler, snapshot: ResponseSnapshot) -> Any:
+    """
+    Parse the snapshot of HTTP response and do the data process. It runs in the parse executor.
+
+    :param parser: The *Parser* component.
+    :param data_handler: The *Handler* component.
+    :param snapshot: The snapshot of HTTP response.
+    :return: The result of data process.
+    """
+
+    parsed_response = parser.parse_content(response=CachedResponse(snapshot))
+    return data_handler.process(result=parsed_response)
+
+
+# The event loops of the workers of the parse executor, so every worker runs the asynchronous parser in its own one.
+_Parse_Event_Loops = threading.local()
+
+
+def _parse_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop of the current worker of the parse executor. It's created at the first time and reused for the
+    later HTTP responses.
+
+    :return: An *asyncio.AbstractEventLoop* object.
+    """
+
+    _loop = getattr(_Parse_Event_Loops, "loop", None)
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _Parse_Event_Loops.loop = _loop
+    return _loop
+
+
+def _aparse_snapshot(parser: Any, data_handler: _BaseAsyncDataHandler, snapshot: ResponseSnapshot) -> Any:
+    """
+    The asynchronous version of *_parse_snapshot*. It runs the asynchronous parser and data handler in the event loop
+    of the worker of the parse executor.
+
+    :param parser: The asynchronous *Parser* component.
+    :param data_handler: The asynchronous *Handler* component.
+    :param snapshot: The snapshot of HTTP response.
+    :return: The result of data process.
+    """
+
+    async def _parse() -> Any:
+        parsed_response = await parser.parse_content(response=AsyncCachedResponse(snapshot))
+        return await data_handler.process(result=parsed_response)
+
+    return _parse_event_loop().run_until_complete(_parse())
+
+
+
+class _OffloadedParsing:
+
+    """
+    The HTTP responses which are parsed and handled by the parse executor. It collects the results as they complete,
+    and it waits for a result if there're too many HTTP responses waiting for the executor, so the bodies in memory
+    are limited.
+    """
+
+    def __init__(self, executor: Executor, backlog: int, parser: Any, data_handler: Any, handled_data: List[Any], record: Callable[[str], None]):
+        self._executor = executor
+        self._parser = parser
+        self._data_handler = data_handler
+        self._handled_data = handled_data
+        self._record = record
+        self._pending = set()
+        # The URLs of the pending tasks.
+        self._urls = {}
+        self._max_pending = backlog
+
+
+    def submit(self, function: Callable, snapshot: ResponseSnapshot) -> None:
+        _future = self._executor.submit(function, self._parser, self._data_handler, snapshot)
+        self._pending.add(_future)
+        self._urls[_future] = snapshot.url
+        self.collect(block=len(self._pending) >= self._max_pending)
+
+
+    def collect(self, block: bool = False) -> None:
+        """
+        Collect the results which have completed.
+
+        :param block: Wait until one of them completes if it's True.
+        :return: None
+        """
+
+        if block is True:
+            _done, self._pending = wait(self._pending, return_when=FIRST_COMPLETED)
+        else:
+            _done = {_future for _future in self._pending if _future.done()}
+            self._pending -= _done
+        self._handle_results(_done)
+
+
+    def join(self) -> None:
+        while self._pending:
+            self.collect(block=True)
+
+
+    async def asubmit(self, function: Callable, snapshot: ResponseSnapshot) -> None:
+        _future = asyncio.wrap_future(self._executor.submit(function, self._parser, self._data_handler, snapshot))
+        self._pending.add(_future)
+        self._urls[_future] = snapshot.url
+        await self.acollect(block=len(self._pending) >= self._max_pending)
+
+
+    async def acollect(self, block: bool = False) -> None:
+        if block is True:
+            _done, self._pending = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+        else:
+            _done = {_future for _future in self._pending if _future.done()}
+            self._pending -= _done
+        self._handle_results(_done)
+
+
+    async def ajoin(self) -> None:
+        while self._pending:
+            await self.acollect(block=True)
+
+
+    def _handle_results(self, done: Iterable[Any]) -> None:
+        for _future in done:
+            self._handled_data.append(_future.result())
+            self._record(self._urls.pop(_future))
+
+
+
 class BaseCrawler(metaclass=ABCMeta):
 
     _HTTP_IO: _BaseHttpIo = None
     _HTTP_Response_Parser: _BaseHTTPResponseParser = None
     _Data_Handler: _BaseDataHandler = None
     _Persistence: _PersistenceFacade = None
+    _Visited_Set: _BaseVisitedSet = None
+    _Retry_Policy: _RetryPolicy = None
+    _Deadline: float = None
+    _Parse_Executor: Executor = None
+    _Parse_Backlog: int = None
+    # The URLs which have been crawled successfully while crawling a batch of **URLFrontier**.
+    _Crawled_URLs: List[str] = None
 
     def __init__(self, factory: BaseFactory = None):
         """
@@ -54,6 +281,121 @@ class BaseCrawler(metaclass=ABCMeta):
         return CrawlerFactory()
 
 
+    @property
+    def visited(self) -> Optional[_BaseVisitedSet]:
+        """
+        Get the visited set. The crawler checks it before sending HTTP request and skips the URLs which
+        have been visited. It doesn't check anything if it's None (default).
+
+        :return: A **BaseVisitedSet** type object.
+        """
+
+        return self._Visited_Set
+
+
+    @visited.setter
+    def visited(self, visited_set: Optional[_BaseVisitedSet]) -> None:
+        if visited_set is not None and not isinstance(visited_set, _BaseVisitedSet):
+            raise TypeError("The visited set should be a **BaseVisitedSet** type object.")
+        self._Visited_Set = visited_set
+
+
+    @property
+    def retry_policy(self) -> Optional[_RetryPolicy]:
+        """
+        Get the retry policy. The crawler retries the HTTP request with the backoff of it if it gets the retryable
+        HTTP status or exception. It only retries the times of option *retry* immediately if it's None (default).
+
+        :return: A **RetryPolicy** type object.
+        """
+
+        return self._Retry_Policy
+
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy: Optional[_RetryPolicy]) -> None:
+        if retry_policy is not None and not isinstance(retry_policy, _RetryPolicy):
+            raise TypeError("The retry policy should be a **RetryPolicy** type object.")
+        self._Retry_Policy = retry_policy
+
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """
+        Get the seconds budget of crawling one URL. It's carried through sending HTTP request (with all the retries
+        and the backoff of the retry policy), parsing the HTTP response and the data process, so a URL whose server
+        hangs gives up its worker at the deadline. The URL is skipped when it's crawled with the other URLs, or
+        **DeadlineExceededError** is raised. It doesn't have any deadline if it's None (default).
+
+        A deadline of the whole job could be given by *deadline_scope*, e.g., *with deadline_scope(300): crawler.run(...)*.
+        It caps the deadline of every URL, and **DeadlineExceededError** is raised when it's exceeded.
+
+        :return: A float type value or None.
+        """
+
+        return self._Deadline
+
+
+    @deadline.setter
+    def deadline(self, seconds: Optional[float]) -> None:
+        if seconds is not None and not isinstance(seconds, (int, float)):
+            raise TypeError("The deadline should be the seconds of int or float type value.")
+        if seconds is not None and seconds <= 0:
+            raise ValueError("The deadline should be bigger than 0.")
+        self._Deadline = seconds
+
+
+    @property
+    def parse_executor(self) -> Optional[Executor]:
+        """
+        Get the executor which parses the HTTP responses and does the data process, e.g., a **ProcessPoolExecutor**.
+        When the crawler crawls a collection of URLs (e.g., with running mode *RunAsConcurrent* or *RunAsCoroutine*),
+        it keeps sending HTTP requests in its threads or event loop and sends the bodies of HTTP responses to the
+        executor, so the CPU-bound parsing doesn't run with the GIL of the I/O. The results are collected in the
+        order they complete.
+
+        The parser and the data handler of the factory are pickled to the executor with the snapshot of HTTP
+        response (a **CachedResponse** or **AsyncCachedResponse** object), so *parse_http_response* and
+        *data_process* of the crawler aren't called there. The HTTP response which it doesn't know how to read is
+        parsed in place. It's None (parse in place) in default.
+
+        :return: A *concurrent.futures.Executor* object or None.
+        """
+
+        return self._Parse_Executor
+
+
+    @parse_executor.setter
+    def parse_executor(self, executor: Optional[Executor]) -> None:
+        if executor is not None and not isinstance(executor, Executor):
+            raise TypeError("The parse executor should be a *concurrent.futures.Executor* object.")
+        self._Parse_Executor = executor
+
+
+    @property
+    def parse_backlog(self) -> int:
+        """
+        Get the most HTTP responses which wait for the parse executor. The crawler waits for one of them to be parsed
+        before it sends more bodies of HTTP responses to the executor, so the bodies in memory are limited. It's
+        2 times of the CPU count in default.
+
+        :return: An int type value.
+        """
+
+        if self._Parse_Backlog is None:
+            return 2 * (os.cpu_count() or 1)
+        return self._Parse_Backlog
+
+
+    @parse_backlog.setter
+    def parse_backlog(self, backlog: Optional[int]) -> None:
+        if backlog is not None and not isinstance(backlog, int):
+            raise TypeError("The parse backlog should be an int type value.")
+        if backlog is not None and backlog <= 0:
+            raise ValueError("The parse backlog should be bigger than 0.")
+        self._Parse_Backlog = backlog
+
+
     def register_factory(self,
                          http_req_sender: _BaseHttpIo = None,
                          http_resp_parser: _BaseHTTPResponseParser = None,
@@ -86,9 +428,23 @@ class BaseCrawler(metaclass=ABCMeta):
         :return: The result which it has parsed from HTTP response. The data type is Any.
         """
 
-        response = self.send_http_request(method=method, url=url, retry=retry, *args, **kwargs)
-        parsed_response = self.parse_http_response(response=response)
-        return parsed_response
+        with deadline_scope(self._Deadline) as _deadline:
+            if self._Retry_Policy is None:
+                response = self.send_http_request(method=method, url=url, retry=retry, *args, **kwargs)
+                _check_deadline_of_response("parsing the HTTP response", response)
+                parsed_response = self.parse_http_response(response=response)
+                self._record_crawled(url, response)
+                return parsed_response
+
+            # Nothing else to crawl here, so it waits for the backoff in place.
+            _attempt = 0
+            while True:
+                _delay, parsed_response = self._try_crawl(method, url, _attempt, retry, *args, **kwargs)
+                if _delay is None:
+                    return parsed_response
+                _check_retry_deadline(_deadline, _delay, url)
+                time.sleep(_delay)
+                _attempt += 1
 
 
     def send_http_request(self, method: str, url: str, retry: int = 1, *args, **kwargs) -> Generic[T]:
@@ -143,44 +499,279 @@ class BaseCrawler(metaclass=ABCMeta):
         self._factory.persistence_factory.save(data=data)
 
 
+    def _try_crawl(self, method: str, url: str, attempt: int, retry: int = 1, *args, **kwargs) -> Tuple[Optional[float], Any]:
+        """
+        Crawl the URL once with the retry policy.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param attempt: How many times it has retried the URL.
+        :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A tuple of the seconds it should wait before retrying and None if it should retry the URL, or
+                 a tuple of None and the result which it has parsed from HTTP response.
+        """
+
+        _delay, response = self._try_send(method, url, attempt, retry, *args, **kwargs)
+        if _delay is not None:
+            return _delay, None
+        _check_deadline_of_response("parsing the HTTP response", response)
+        parsed_response = self.parse_http_response(response=response)
+        self._record_crawled(url, response)
+        return None, parsed_response
+
+
+    def _try_send(self, method: str, url: str, attempt: int, retry: int = 1, *args, **kwargs) -> Tuple[Optional[float], Any]:
+        """
+        Send the HTTP request of the URL once with the retry policy.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param attempt: How many times it has retried the URL.
+        :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A tuple of the seconds it should wait before retrying and None if it should retry the URL, or
+                 a tuple of None and the HTTP response.
+        """
+
+        try:
+            response = self.send_http_request(method=method, url=url, retry=retry, *args, **kwargs)
+        except Exception as e:
+            if self._Retry_Policy.should_retry(attempt, error=e) is False:
+                raise
+            return self._Retry_Policy.delay(attempt, error=e), None
+
+        if isinstance(response, Exception):
+            if self._Retry_Policy.should_retry(attempt, error=response) is True:
+                return self._Retry_Policy.delay(attempt, error=response), None
+        elif self._Retry_Policy.should_retry(attempt, response=response) is True:
+            _release_response(response)
+            return self._Retry_Policy.delay(attempt, response=response), None
+        return None, response
+
+
+    def _crawl_urls(self, method: str, urls: Iterable[str], retry: int = 1) -> List[Any]:
+        """
+        Crawl and handle the URLs one by one, the URLs which have been visited are skipped. With the retry policy,
+        the URL which should be retried is put back on a timer queue and the other URLs keep being crawled while it
+        waits, so the results of the retried URLs may be behind the others. The URL which exceeds its deadline is
+        skipped, and it stops if the deadline of the whole job is exceeded. With the parse executor, the results
+        are in the order they complete.
+
+        :param method: HTTP method.
+        :param urls: A collection or an iterator of URLs.
+        :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A list of result of data process.
+        """
+
+        _handled_data = []
+        _offloaded_parsing = self._offload_parsing(_handled_data)
+        _job_deadline = _Deadline.current()
+        if self._Retry_Policy is None and self._is_batchable():
+            _requests = ((method, _target_url, None) for _target_url in urls if not self._is_visited(_target_url))
+            with self._factory.http_factory.request_many(_requests, timeout=retry) as _responses:
+                for _request, response in _responses:
+                    self._handle_response(_request[1], response, _handled_data, _offloaded_parsing)
+        elif self._Retry_Policy is None:
+            for _target_url in urls:
+                if self._is_visited(_target_url):
+                    continue
+                try:
+                    with deadline_scope(self._Deadline):
+                        if _offloaded_parsing is None:
+                            parsed_response = self.crawl(method=method, url=_target_url, retry=retry)
+                            check_deadline("the data process")
+                            _handled_data.append(self.data_process(parsed_response=parsed_response))
+                        else:
+                            response = self.send_http_request(method=method, url=_target_url, retry=retry)
+                            self._handle_response(_target_url, response, _handled_data, _offloaded_parsing)
+                except _DeadlineExceededError as e:
+                    _skip_expired_url(_job_deadline, _target_url, e)
+        else:
+            _retry_timers = _RetryTimerQueue()
+            # The deadlines of the URLs which are waiting for retrying.
+            _url_deadlines = {}
+
+            def _crawl_url(_url: str, _attempt: int) -> None:
+                _url_deadline = _url_deadlines.pop(_url, None) if _attempt > 0 else _Deadline.after(self._Deadline)
+                try:
+                    with deadline_scope(_url_deadline) as _deadline:
+                        _delay, _response = self._try_send(method, _url, _attempt, retry)
+                        if _delay is None:
+                            self._handle_response(_url, _response, _handled_data, _offloaded_parsing)
+                        else:
+                            _check_retry_deadline(_deadline, _delay, _url)
+                            _retry_timers.push(_url, _attempt + 1, _delay)
+                            _url_deadlines[_url] = _url_deadline
+                except _DeadlineExceededError as e:
+                    _skip_expired_url(_job_deadline, _url, e)
+
+            for _target_url in urls:
+                if self._is_visited(_target_url):
+                    continue
+                for _due_url, _due_attempt in _retry_timers.pop_due():
+                    _crawl_url(_due_url, _due_attempt)
+                _crawl_url(_target_url, 0)
+            while len(_retry_timers) > 0:
+                time.sleep(_retry_timers.next_delay())
+                for _due_url, _due_attempt in _retry_timers.pop_due():
+                    _crawl_url(_due_url, _due_attempt)
+
+        if _offloaded_parsing is not None:
+            _offloaded_parsing.join()
+        return _handled_data
+
+
+    def _handle_response(self, url: str, response: Any, handled_data: List[Any], offloaded_parsing: Optional["_OffloadedParsing"]) -> None:
+        """
+        Parse the HTTP response and do the data process. They're done by the parse executor if it has, or they're
+        done in place, and the result is put into *handled_data*.
+
+        :param url: URL.
+        :param response: The HTTP response.
+        :param handled_data: A list of result of data process.
+        :param offloaded_parsing: The parsing which is offloaded to the parse executor. It's None without the executor.
+        :return: None
+        """
+
+        _check_deadline_of_response("parsing the HTTP response", response)
+        _snapshot = _snapshot_response(response, url) if offloaded_parsing is not None else None
+        if _snapshot is not None:
+            _release_response(response)
+            offloaded_parsing.submit(_parse_snapshot, _snapshot)
+            return
+
+        parsed_response = self.parse_http_response(response=response)
+        check_deadline("the data process")
+        handled_data.append(self.data_process(parsed_response=parsed_response))
+        self._record_crawled(url, response)
+
+
+    def _offload_parsing(self, handled_data: List[Any]) -> Optional["_OffloadedParsing"]:
+        if self._Parse_Executor is None:
+            return None
+        return _OffloadedParsing(
+            self._Parse_Executor, self.parse_backlog, self._factory.parser_factory, self._factory.data_handling_factory, handled_data, self._record_crawled)
+
+
+    def _record_crawled(self, url: str, response: Any = None) -> None:
+        """
+        Record the URL which has been crawled successfully if it's crawling a batch of **URLFrontier**. The URL
+        whose HTTP response is an exception (e.g., **TimeoutError** or **CircuitOpenError**) isn't recorded.
+
+        :param url: URL.
+        :param response: The HTTP response.
+        :return: None
+        """
+
+        if self._Crawled_URLs is not None and not isinstance(response, Exception):
+            self._Crawled_URLs.append(url)
+
+
+    def _is_batchable(self) -> bool:
+        """
+        Check whether it could send the HTTP requests of a collection of URLs with *request_many* of the HTTP sender.
+        It skips *crawl* and *send_http_request*, so it couldn't be used if they're overridden or every URL has its
+        own deadline.
+
+        :return: It returns True if it could use *request_many*, or it returns False.
+        """
+
+        if self._Deadline is not None or not callable(getattr(self._factory.http_factory, "request_many", None)):
+            return False
+        return all(getattr(type(self), _name).__module__ == __name__ for _name in ("crawl", "send_http_request"))
+
+
+    def _open_http_io(self) -> None:
+        """
+        Call *open* of the HTTP sender if it has. The HTTP sender which isn't a **HTTP** object may not have it.
+
+        :return: None
+        """
+
+        _open = getattr(self._factory.http_factory, "open", None)
+        if callable(_open):
+            _open()
+
+
+    def _close_http_io(self) -> None:
+        """
+        Call *close* of the HTTP sender if it has.
+
+        :return: None
+        """
+
+        _close = getattr(self._factory.http_factory, "close", None)
+        if callable(_close):
+            _close()
+
+
+    def _is_visited(self, url: str) -> bool:
+        """
+        Check whether the URL has been visited and mark it as visited. It always returns False if the
+        visited set is None.
+
+        :param url: URL.
+        :return: It returns True if the URL has been visited, or it returns False.
+        """
+
+        if self._Visited_Set is None:
+            return False
+        return not self._Visited_Set.add(url)
+
+
+    def _filter_visited(self, urls: Iterable[str]) -> List[str]:
+        """
+        Remove the URLs which have been visited and mark the others as visited.
+
+        :param urls: A collection of URLs.
+        :return: A list of URLs which haven't been visited.
+        """
+
+        if self._Visited_Set is None:
+            return urls
+        return [_url for _url in urls if not self._is_visited(_url)]
+
+
 
 class SimpleCrawler(BaseCrawler):
 
     @dispatch(str, str)
+    @_with_http_io
     def run(self, method: str, url: str) -> Optional[Any]:
         """
         It would crawl the data and do some data process for the parsed HTTP response object.
 
         :param method: HTTP method.
         :param url: URL. It only one URL here.
-        :return: The result of data process.
+        :return: The result of data process. It's None if the URL has been visited.
         """
 
-        parsed_response = self.crawl(method=method, url=url)
-        data = self.data_process(parsed_response=parsed_response)
+        if self._is_visited(url):
+            return None
+        with deadline_scope(self._Deadline):
+            parsed_response = self.crawl(method=method, url=url)
+            check_deadline("the data process")
+            data = self.data_process(parsed_response=parsed_response)
         return data
 
 
-    @dispatch(str, list)
-    def run(self, method: str, url: List[str]) -> Optional[List]:
+    @dispatch(str, _IterableType)
+    @_with_http_io
+    def run(self, method: str, url: Iterable[str]) -> Optional[List]:
         """
         This's the overload function of previous one. The only different is: this is handling
-        with a collection of URLs and previous one handles only one.
+        with a collection of URLs and previous one handles only one. The collection could be
+        a lazy iterator (for example, the generator from *URL.iter_urls*), it would be consumed
+        one by one.
 
         :param method: HTTP method.
-        :param url: URLs. It could receive a collection of URLs.
+        :param url: URLs. It could receive a collection or an iterator of URLs.
         :return: The result of data process.
         """
 
-        result = []
-        for _target_url in url:
-            parsed_response = self.crawl(method=method, url=_target_url)
-            data = self.data_process(parsed_response=parsed_response)
-            result.append(data)
-        return result
+        return self._crawl_urls(method=method, urls=url)
 
 
-    def run_and_save(self, method: str, url: Union[str, list]) -> None:
+    def run_and_save(self, method: str, url: Union[str, Iterable[str]]) -> None:
         """
         In addiction to crawl and handle the data from web, it persist the data.
 
@@ -198,6 +789,10 @@ class MultiRunnableCrawler(BaseCrawler):
 
     _Persistence_Factory: _PersistenceFacade = None
 
+    # How many URLs one executor gets in one chunk of an iterator in default. The chunks are large, so the executors
+    # are activated rarely and the result of an iterator is the same as the result of a list in most cases.
+    _Chunk_Size_Per_Executor: int = 1000
+
     @property
     def persistence_factory(self) -> _PersistenceFacade:
         """
@@ -214,24 +809,21 @@ class MultiRunnableCrawler(BaseCrawler):
         self._Persistence_Factory = factory
 
 
-    def process_with_list(self, method: str, url: List[str], retry: int = 1, *args, **kwargs) -> List[Any]:
+    @_with_http_io
+    def process_with_list(self, method: str, url: Sequence[str], retry: int = 1, *args, **kwargs) -> List[Any]:
         """
         Handling the crawler process with List of URLs.
 
         :param method: HTTP method.
-        :param url: A collection of URLs.
+        :param url: A collection of URLs. It also could be a slice of **URLSequence**.
         :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
         :return: A list of result of data process.
         """
 
-        _handled_data = []
-        for _target_url in url:
-            parsed_response = self.crawl(method=method, url=_target_url)
-            _handled_data_row = self.data_process(parsed_response=parsed_response)
-            _handled_data.append(_handled_data_row)
-        return _handled_data
+        return self._crawl_urls(method=method, urls=url, retry=retry)
 
 
+    @_with_http_io
     def process_with_queue(self, method: str, url: Queue, retry: int = 1, *args, **kwargs) -> List[Any]:
         """
         Handling the crawler process with Queue which saving URLs.
@@ -242,13 +834,20 @@ class MultiRunnableCrawler(BaseCrawler):
         :return: A list of result of data process.
         """
 
-        _handled_data = []
-        while url.empty() is False:
-            _target_url = url.get()
-            parsed_response = self.crawl(method=method, url=_target_url)
-            _handled_data_row = self.data_process(parsed_response=parsed_response)
-            _handled_data.append(_handled_data_row)
-        return _handled_data
+        return self._crawl_urls(method=method, urls=MultiRunnableCrawler._iter_queue(url), retry=retry)
+
+
+    @staticmethod
+    def _iter_queue(queue: Queue) -> Iterator[str]:
+        """
+        Get the URLs from the queue until it's empty.
+
+        :param queue: Queue of URLs.
+        :return: An iterator of URLs.
+        """
+
+        while queue.empty() is False:
+            yield queue.get()
 
 
     @staticmethod
@@ -271,9 +870,12 @@ class MultiRunnableCrawler(BaseCrawler):
 
 
     @staticmethod
-    def _divide_urls(urls: List[str], executor_number: int) -> List[List[str]]:
+    def _divide_urls(urls: Sequence[str], executor_number: int) -> List[Sequence[str]]:
         """
-        Divide the data list which saving URLs to be a list saving multiple lists.
+        Divide the data list which saving URLs to be a list saving multiple lists. Every executor gets
+        one contiguous (start, stop) slice and the sizes of slices differ by at most one. If option *urls*
+        is a **URLSequence**, the slices are also **URLSequence** objects which only keep the range of
+        positions, so it's cheap to pass them to executors.
 
         :param urls: A collection of URLs.
         :param executor_number: How many executors you activate to run.
@@ -281,11 +883,123 @@ class MultiRunnableCrawler(BaseCrawler):
         """
 
         urls_len = len(urls)
-        urls_interval = int(urls_len / executor_number)
-        urls_list_collection = [urls[i:i + urls_interval] for i in range(0, executor_number, urls_interval)]
+        urls_interval, urls_remainder = divmod(urls_len, executor_number)
+        urls_list_collection = []
+        _start = 0
+        for _index in range(executor_number):
+            _stop = _start + urls_interval + (1 if _index < urls_remainder else 0)
+            urls_list_collection.append(urls[_start:_stop])
+            _start = _stop
         return urls_list_collection
 
 
+    def _iter_frontier_batches(self, frontier: URLFrontier, batch_size: int, mode: RunningMode = None) -> Iterator[List[str]]:
+        """
+        Take the pending URLs of **URLFrontier** batch by batch. It records the URLs which are crawled successfully
+        while the batch is crawling, and it releases the other URLs of the batch (e.g., their HTTP requests get
+        **TimeoutError** or they exceed the deadline) before taking the next batch. So only the crawled URLs are
+        done, and the others would be crawled again after resuming.
+
+        :param frontier: An **URLFrontier** object.
+        :param batch_size: How many URLs one batch has.
+        :param mode: The running mode. The URLs are recorded by a *multiprocessing.Manager* with *RunAsParallel*.
+        :return: A generator of batches which is a list of URLs.
+        """
+
+        _manager = multiprocessing.Manager() if mode is RunAsParallel else None
+        _batches = frontier.iter_batches(batch_size)
+        try:
+            for _urls in _batches:
+                self._Crawled_URLs = _manager.list() if _manager is not None else []
+                try:
+                    yield _urls
+                    _crawled_urls = set(self._Crawled_URLs)
+                finally:
+                    self._Crawled_URLs = None
+                frontier.release(_url for _url in _urls if _url not in _crawled_urls)
+        finally:
+            _batches.close()
+            if _manager is not None:
+                _manager.shutdown()
+
+
+    @staticmethod
+    def _chunk_size(chunk_size: Optional[int], executor_number: int) -> int:
+        """
+        The size of chunk which the crawler takes from an iterator of URLs or an **URLFrontier** once.
+
+        :param chunk_size: The size of chunk from option *chunk_size*. It could be None.
+        :param executor_number: How many executors (or the pool size) the crawler has.
+        :return: Option *chunk_size* if it's set, or *_Chunk_Size_Per_Executor* URLs per executor.
+        """
+
+        return chunk_size or executor_number * MultiRunnableCrawler._Chunk_Size_Per_Executor
+
+
+    @staticmethod
+    def _iter_async_url_chunks(urls: AsyncIterable[str], chunk_size: int) -> Iterator[List[str]]:
+        """
+        The asynchronous version of *_iter_chunks* of *smoothcrawler.urls*. It consumes an asynchronous iterator of
+        URLs chunk by chunk in one dedicated event loop, so the iterator which is bound to an event loop (e.g., a cursor
+        of asynchronous DB driver) still works even if the executors run each chunk in their own event loops.
+
+        :param urls: An asynchronous iterator of URLs, e.g., the asynchronous generator from *URL.aiter_urls*.
+        :param chunk_size: How many URLs one chunk has.
+        :return: A generator of chunks which is a list of URLs.
+        """
+
+        if chunk_size <= 0:
+            raise ValueError("The size of chunk should be bigger than 0.")
+
+        _urls_iter = urls.__aiter__()
+
+        async def _next_chunk() -> List[str]:
+            _chunk = []
+            try:
+                while len(_chunk) < chunk_size:
+                    _chunk.append(await _urls_iter.__anext__())
+            except StopAsyncIteration:
+                pass
+            return _chunk
+
+        _loop = asyncio.new_event_loop()
+        try:
+            while True:
+                _chunk = _loop.run_until_complete(_next_chunk())
+                if not _chunk:
+                    break
+                yield _chunk
+        finally:
+            if hasattr(_urls_iter, "aclose"):
+                _loop.run_until_complete(_urls_iter.aclose())
+            _loop.close()
+
+
+    @staticmethod
+    def _is_async_urls(url: Any) -> bool:
+        """
+        Check whether the URLs is an asynchronous iterable object or not.
+
+        :param url: The URLs argument which the crawler roles receive.
+        :return: It returns True if it is, or it returns False.
+        """
+
+        return isinstance(url, _AsyncIterableType)
+
+
+    @staticmethod
+    def _is_lazy_urls(url: Any) -> bool:
+        """
+        Check whether the URLs is a lazy iterable object (it isn't a sequence like *list*, **URLSequence**
+        or a *Queue*) or not.
+
+        :param url: The URLs argument which the crawler roles receive.
+        :return: It returns True if it is, or it returns False.
+        """
+
+        return isinstance(url, _IterableType) and not isinstance(url, _SequenceType)
+
+
 
 class AsyncSimpleCrawler(MultiRunnableCrawler):
 
@@ -305,10 +1019,218 @@ class AsyncSimpleCrawler(MultiRunnableCrawler):
         return AsyncCrawlerFactory()
 
 
+    @_with_async_http_io
     async def crawl(self, url: str, method: str, retry: int = 1, *args, **kwargs) -> Any:
-        response = await self.send_http_request(method=method, url=url, retry=retry, *args, **kwargs)
+        with deadline_scope(self._Deadline) as _deadline:
+            if self._Retry_Policy is None:
+                response = await self.send_http_request(method=method, url=url, retry=retry, *args, **kwargs)
+                _check_deadline_of_response("parsing the HTTP response", response)
+                parsed_response = await self.parse_http_response(response=response)
+                self._record_crawled(url, response)
+                return parsed_response
+
+            _attempt = 0
+            while True:
+                _delay, parsed_response = await self._try_crawl(method, url, _attempt, retry, *args, **kwargs)
+                if _delay is None:
+                    return parsed_response
+                _check_retry_deadline(_deadline, _delay, url)
+                await asyncio.sleep(_delay)
+                _attempt += 1
+
+
+    async def _try_crawl(self, method: str, url: str, attempt: int, retry: int = 1, *args, **kwargs) -> Tuple[Optional[float], Any]:
+        """
+        The asynchronous version of *BaseCrawler._try_crawl*.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param attempt: How many times it has retried the URL.
+        :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A tuple of the seconds it should wait before retrying and None if it should retry the URL, or
+                 a tuple of None and the result which it has parsed from HTTP response.
+        """
+
+        _delay, response = await self._try_send(method, url, attempt, retry, *args, **kwargs)
+        if _delay is not None:
+            return _delay, None
+        _check_deadline_of_response("parsing the HTTP response", response)
         parsed_response = await self.parse_http_response(response=response)
-        return parsed_response
+        self._record_crawled(url, response)
+        return None, parsed_response
+
+
+    async def _try_send(self, method: str, url: str, attempt: int, retry: int = 1, *args, **kwargs) -> Tuple[Optional[float], Any]:
+        """
+        The asynchronous version of *BaseCrawler._try_send*.
+
+        :param method: HTTP method.
+        :param url: URL.
+        :param attempt: How many times it has retried the URL.
+        :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A tuple of the seconds it should wait before retrying and None if it should retry the URL, or
+                 a tuple of None and the HTTP response.
+        """
+
+        try:
+            response = await self.send_http_request(method=method, url=url, retry=retry, *args, **kwargs)
+        except Exception as e:
+            if self._Retry_Policy.should_retry(attempt, error=e) is False:
+                raise
+            return self._Retry_Policy.delay(attempt, error=e), None
+
+        if isinstance(response, Exception):
+            if self._Retry_Policy.should_retry(attempt, error=response) is True:
+                return self._Retry_Policy.delay(attempt, error=response), None
+        elif self._Retry_Policy.should_retry(attempt, response=response) is True:
+            _release_response(response)
+            return self._Retry_Policy.delay(attempt, response=response), None
+        return None, response
+
+
+    async def _crawl_urls(self, method: str, urls: AsyncIterator[str], retry: int = 1) -> List[Any]:
+        """
+        The asynchronous version of *BaseCrawler._crawl_urls*. The coroutine doesn't sleep for the backoff while it
+        still has the other URLs to crawl.
+
+        :param method: HTTP method.
+        :param urls: An asynchronous iterator of URLs.
+        :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :return: A list of result of data process.
+        """
+
+        _handled_data = []
+        _offloaded_parsing = self._offload_parsing(_handled_data)
+        _job_deadline = _Deadline.current()
+        if self._Retry_Policy is None and self._is_batchable():
+            _requests = ((method, _target_url, None) async for _target_url in urls if not self._is_visited(_target_url))
+            async with self._factory.http_factory.request_many(_requests, timeout=retry) as _responses:
+                async for _request, response in _responses:
+                    await self._handle_response(_request[1], response, _handled_data, _offloaded_parsing)
+        elif self._Retry_Policy is None:
+            async for _target_url in urls:
+                if self._is_visited(_target_url):
+                    continue
+                try:
+                    with deadline_scope(self._Deadline):
+                        if _offloaded_parsing is None:
+                            parsed_response = await self.crawl(method=method, url=_target_url, retry=retry)
+                            check_deadline("the data process")
+                            _handled_data.append(await self.data_process(parsed_response=parsed_response))
+                        else:
+                            response = await self.send_http_request(method=method, url=_target_url, retry=retry)
+                            await self._handle_response(_target_url, response, _handled_data, _offloaded_parsing)
+                except _DeadlineExceededError as e:
+                    _skip_expired_url(_job_deadline, _target_url, e)
+        else:
+            _retry_timers = _RetryTimerQueue()
+            _url_deadlines = {}
+
+            async def _crawl_url(_url: str, _attempt: int) -> None:
+                _url_deadline = _url_deadlines.pop(_url, None) if _attempt > 0 else _Deadline.after(self._Deadline)
+                try:
+                    with deadline_scope(_url_deadline) as _deadline:
+                        _delay, _response = await self._try_send(method, _url, _attempt, retry)
+                        if _delay is None:
+                            await self._handle_response(_url, _response, _handled_data, _offloaded_parsing)
+                        else:
+                            _check_retry_deadline(_deadline, _delay, _url)
+                            _retry_timers.push(_url, _attempt + 1, _delay)
+                            _url_deadlines[_url] = _url_deadline
+                except _DeadlineExceededError as e:
+                    _skip_expired_url(_job_deadline, _url, e)
+
+            async for _target_url in urls:
+                if self._is_visited(_target_url):
+                    continue
+                for _due_url, _due_attempt in _retry_timers.pop_due():
+                    await _crawl_url(_due_url, _due_attempt)
+                await _crawl_url(_target_url, 0)
+            while len(_retry_timers) > 0:
+                await asyncio.sleep(_retry_timers.next_delay())
+                for _due_url, _due_attempt in _retry_timers.pop_due():
+                    await _crawl_url(_due_url, _due_attempt)
+
+        if _offloaded_parsing is not None:
+            await _offloaded_parsing.ajoin()
+        return _handled_data
+
+
+    async def _handle_response(self, url: str, response: Any, handled_data: List[Any], offloaded_parsing: Optional["_OffloadedParsing"]) -> None:
+        """
+        The asynchronous version of *BaseCrawler._handle_response*. It reads the body of the response of *aiohttp*
+        before sending it to the parse executor.
+
+        :param url: URL.
+        :param response: The HTTP response.
+        :param handled_data: A list of result of data process.
+        :param offloaded_parsing: The parsing which is offloaded to the parse executor. It's None without the executor.
+        :return: None
+        """
+
+        _check_deadline_of_response("parsing the HTTP response", response)
+        _snapshot = await _asnapshot_response(response, url) if offloaded_parsing is not None else None
+        if _snapshot is not None:
+            await offloaded_parsing.asubmit(_aparse_snapshot, _snapshot)
+            return
+
+        parsed_response = await self.parse_http_response(response=response)
+        check_deadline("the data process")
+        handled_data.append(await self.data_process(parsed_response=parsed_response))
+        self._record_crawled(url, response)
+
+
+    async def _open_async_http_io(self) -> None:
+        """
+        The asynchronous version of *BaseCrawler._open_http_io*. It opens the session of **AsyncHTTP** in the running
+        event loop, so all the requests of the worker share one session.
+
+        :return: None
+        """
+
+        _open = getattr(self._factory.http_factory, "open", None)
+        if callable(_open):
+            await _open()
+
+
+    async def _close_async_http_io(self) -> None:
+        """
+        The asynchronous version of *BaseCrawler._close_http_io*.
+
+        :return: None
+        """
+
+        _close = getattr(self._factory.http_factory, "close", None)
+        if callable(_close):
+            await _close()
+
+
+    def _hold_async_http_io(self, function: Callable, workers: int) -> Callable:
+        """
+        Hold the resources of HTTP sender for all the workers of one call of *map* or *run*, which run in one event
+        loop of the executor. The first worker opens them and the last one closes them, so all the workers share them
+        even if every worker finishes before the next one starts.
+
+        :param function: The coroutine function which every worker runs.
+        :param workers: How many workers run the function.
+        :return: The wrapped coroutine function.
+        """
+
+        _counts = {"started": 0, "finished": 0}
+
+        @wraps(function)
+        async def _worker(*args, **kwargs):
+            _counts["started"] += 1
+            try:
+                if _counts["started"] == 1:
+                    await self._open_async_http_io()
+                return await function(*args, **kwargs)
+            finally:
+                _counts["finished"] += 1
+                if _counts["finished"] == workers:
+                    await self._close_async_http_io()
+
+        return _worker
 
 
     async def send_http_request(self, method: str, url: str, retry: int = 1, *args, **kwargs) -> Generic[T]:
@@ -359,6 +1281,7 @@ class AsyncSimpleCrawler(MultiRunnableCrawler):
         await self._factory.persistence_factory.save(data=data)
 
 
+    @_with_async_http_io
     async def process_with_list(self, method: str, url: List[str], retry: int = 1, *args, **kwargs) -> Any:
         """
         The asynchronous version of *MultiRunnableCrawler.process_with_list*.
@@ -369,14 +1292,10 @@ class AsyncSimpleCrawler(MultiRunnableCrawler):
         :return: A list of result of data process.
         """
 
-        _handled_data = []
-        for _target_url in url:
-            parsed_response = await self.crawl(method=method, url=_target_url, retry=retry)
-            _handled_data_row = await self.data_process(parsed_response=parsed_response)
-            _handled_data.append(_handled_data_row)
-        return _handled_data
+        return await self._crawl_urls(method=method, urls=AsyncSimpleCrawler._aiter_list(url), retry=retry)
 
 
+    @_with_async_http_io
     async def process_with_queue(self, method: str, url: Queue, retry: int = 1, *args, **kwargs) -> Any:
         """
         The asynchronous version of *MultiRunnableCrawler.process_with_queue*.
@@ -387,16 +1306,22 @@ class AsyncSimpleCrawler(MultiRunnableCrawler):
         :return: A list of result of data process.
         """
 
-        _handled_data = []
-        while url.empty() is False:
-            _target_url = await url.get()
-            parsed_response = await self.crawl(method=method, url=_target_url, retry=retry)
-            _handled_data_row = await self.data_process(parsed_response=parsed_response)
-            _handled_data.append(_handled_data_row)
-        return _handled_data
+        return await self._crawl_urls(method=method, urls=AsyncSimpleCrawler._aiter_queue(url), retry=retry)
+
+
+    @staticmethod
+    async def _aiter_list(urls: List[str]) -> AsyncIterator[str]:
+        for _url in urls:
+            yield _url
+
 
+    @staticmethod
+    async def _aiter_queue(queue: Queue) -> AsyncIterator[str]:
+        while queue.empty() is False:
+            yield await queue.get()
 
-    def map(self, method: str, url: List[str], retry: int = 1, lock: bool = True, sema_value: int = 1) -> Optional:
+
+    def map(self, method: str, url: Sequence[str], retry: int = 1, lock: bool = True, sema_value: int = 1) -> Optional:
         """
         The asynchronous version of *ExecutorCrawler.map*.
 
@@ -409,10 +1334,10 @@ class AsyncSimpleCrawler(MultiRunnableCrawler):
         """
 
         feature = MultiRunnableCrawler._get_lock_feature(lock=lock, sema_value=sema_value)
-        args_iterator = [{"method": method, "url": _url, "retry": retry} for _url in url]
+        args_iterator = [{"method": method, "url": _url, "retry": retry} for _url in self._filter_visited(url)]
 
         self.__executor.map(
-            function=self.crawl,
+            function=self._hold_async_http_io(self.crawl, workers=len(args_iterator)),
             args_iter=args_iterator,
             queue_tasks=None,
             features=feature)
@@ -420,34 +1345,56 @@ class AsyncSimpleCrawler(MultiRunnableCrawler):
         return result
 
 
-    def run(self, method: str, url: Union[List[str], Queue], retry: int = 1, lock: bool = True, sema_value: int = 1) -> Optional:
+    def run(self,
+            method: str, url: Union[Sequence[str], Iterable[str], AsyncIterable[str], URLFrontier, Queue], retry: int = 1,
+            lock: bool = True, sema_value: int = 1, chunk_size: int = None) -> Optional:
         """
-        The asynchronous version of *ExecutorCrawler.run*.
+        The asynchronous version of *ExecutorCrawler.run*. The option *url* also could be an asynchronous
+        iterator (e.g., the asynchronous generator from *URL.aiter_urls*), it's taken chunk by chunk as an iterator.
 
         :param method: HTTP method.
         :param url: A collection of URLs.
         :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
         :param lock: It would initial a Lock if it's True, or it would initial Semaphore.
         :param sema_value: The value of Semaphore. This argument only work for option *lock* is False.
+        :param chunk_size: How many URLs it takes from option *url* once if it's an iterator or an **URLFrontier**. Default is 1000 URLs per executor.
         :return: The result of data process from parsed HTPP response object.
         """
 
+        if isinstance(url, URLFrontier):
+            result = []
+            for _urls in self._iter_frontier_batches(url, MultiRunnableCrawler._chunk_size(chunk_size, self.__executor_number)):
+                result.extend(self.run(method=method, url=_urls, retry=retry, lock=lock, sema_value=sema_value))
+            return result
+
+        if MultiRunnableCrawler._is_async_urls(url):
+            result = []
+            for _urls in MultiRunnableCrawler._iter_async_url_chunks(url, MultiRunnableCrawler._chunk_size(chunk_size, self.__executor_number)):
+                result.extend(self.run(method=method, url=_urls, retry=retry, lock=lock, sema_value=sema_value))
+            return result
+
+        if MultiRunnableCrawler._is_lazy_urls(url):
+            result = []
+            for _urls in _iter_chunks(url, MultiRunnableCrawler._chunk_size(chunk_size, self.__executor_number)):
+                result.extend(self.run(method=method, url=_urls, retry=retry, lock=lock, sema_value=sema_value))
+            return result
+
         feature = MultiRunnableCrawler._get_lock_feature(lock=lock, sema_value=sema_value)
 
-        if type(url) is list:
+        if isinstance(url, _SequenceType):
             _url_len = len(url)
             if _url_len <= self.__executor_number:
                 return self.map(method=method, url=url, retry=retry, lock=lock, sema_value=sema_value)
             else:
                 urls_list_collection = MultiRunnableCrawler._divide_urls(urls=url, executor_number=self.__executor_number)
-                self.__executor.run(
-                    function=self.process_with_list,
-                    args={"method": method, "url": urls_list_collection, "retry": retry},
+                self.__executor.map(
+                    function=self._hold_async_http_io(self.process_with_list, workers=len(urls_list_collection)),
+                    args_iter=[{"method": method, "url": _urls, "retry": retry} for _urls in urls_list_collection],
                     queue_tasks=None,
                     features=feature)
         else:
             self.__executor.run(
-                function=self.process_with_queue,
+                function=self._hold_async_http_io(self.process_with_queue, workers=self.__executor_number),
                 args={"method": method, "url": url, "retry": retry},
                 queue_tasks=None,
                 features=feature)
@@ -462,18 +1409,22 @@ class ExecutorCrawler(MultiRunnableCrawler):
     def __init__(self, mode: RunningMode, executors: int, factory: CrawlerFactory):
         super(ExecutorCrawler, self).__init__(factory=factory)
         self.__executor_number = executors
+        self.__mode = mode
         self.__executor = SimpleExecutor(mode=mode, executors=executors)
 
 
-    def run(self, method: str, url: Union[List[str], Queue], retry: int = 1, lock: bool = True, sema_value: int = 1) -> Optional:
+    @_with_http_io
+    def run(self,
+            method: str, url: Union[Sequence[str], Iterable[str], URLFrontier, Queue], retry: int = 1,
+            lock: bool = True, sema_value: int = 1, chunk_size: int = None) -> Optional:
         """
         Run the crawl process as multiple executor directly. It may run a little bit differently by the option *url*.
         Please consider below scenarios:
 
-        * Option *url* is a *list* type value:
+        * Option *url* is a *list* type value (or a sequence like **URLSequence**):
 
             * If the size of value is bigger than the executor number:
-            separate the collection of URLs and activate the number of executors.
+            separate the collection of URLs to slices and activate the number of executors with one slice each.
 
             * If the size of value is smaller than the executor number:
             activate the executors as function *map*.
@@ -481,17 +1432,40 @@ class ExecutorCrawler(MultiRunnableCrawler):
         * Option *url* is a **Queue** type value:
         Run the executors with the Queue object.
 
+        * Option *url* is an iterator (e.g., the generator from *URL.iter_urls*):
+        Take the URLs chunk by chunk (the size is option *chunk_size*) and run each chunk as a *list* type value.
+        The chunks are large in default (1000 URLs per executor), so the result is the same as the result of
+        the *list* type value of the URLs unless the iterator has more URLs than one chunk.
+
+        * Option *url* is an **URLFrontier** object:
+        Take the pending URLs batch by batch (the size is option *chunk_size*), run each batch as a *list* type value
+        and mark the URLs which have been crawled successfully as done after the batch finishes. The other URLs are
+        released, so they would be crawled again after resuming (or after it crashes).
+
         :param method: HTTP method.
         :param url: A collection of URLs.
         :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
         :param lock: It would initial a Lock if it's True, or it would initial Semaphore.
         :param sema_value: The value of Semaphore. This argument only work for option *lock* is False.
+        :param chunk_size: How many URLs it takes from option *url* once if it's an iterator or an **URLFrontier**. Default is 1000 URLs per executor.
         :return: The result of data process from parsed HTPP response object.
         """
 
+        if isinstance(url, URLFrontier):
+            result = []
+            for _urls in self._iter_frontier_batches(url, MultiRunnableCrawler._chunk_size(chunk_size, self.__executor_number), self.__mode):
+                result.extend(self.run(method=method, url=_urls, retry=retry, lock=lock, sema_value=sema_value))
+            return result
+
+        if MultiRunnableCrawler._is_lazy_urls(url):
+            result = []
+            for _urls in _iter_chunks(url, MultiRunnableCrawler._chunk_size(chunk_size, self.__executor_number)):
+                result.extend(self.run(method=method, url=_urls, retry=retry, lock=lock, sema_value=sema_value))
+            return result
+
         feature = MultiRunnableCrawler._get_lock_feature(lock=lock, sema_value=sema_value)
 
-        if type(url) is list:
+        if isinstance(url, _SequenceType):
             urls_len = len(url)
             if urls_len <= self.__executor_number:
                 logging.warning("It will have some idle executors deosn't be activated because target URLs amount more than executor number.")
@@ -500,11 +1474,12 @@ class ExecutorCrawler(MultiRunnableCrawler):
                 _result = self.map(method=method, url=url, retry=retry, lock=lock, sema_value=sema_value)
                 return _result
             else:
+                # Every executor gets its own slice of URLs.
                 urls_list_collection = MultiRunnableCrawler._divide_urls(urls=url, executor_number=self.__executor_number)
 
-                self.__executor.run(
+                self.__executor.map(
                     function=self.process_with_list,
-                    args={"method": method, "url": urls_list_collection, "retry": retry},
+                    args_iter=[{"method": method, "url": _urls, "retry": retry} for _urls in urls_list_collection],
                     queue_tasks=None,
                     features=feature)
         else:
@@ -518,7 +1493,8 @@ class ExecutorCrawler(MultiRunnableCrawler):
         return result
 
 
-    def map(self, method: str, url: List[str], retry: int = 1, lock: bool = True, sema_value: int = 1) -> Optional:
+    @_with_http_io
+    def map(self, method: str, url: Sequence[str], retry: int = 1, lock: bool = True, sema_value: int = 1) -> Optional:
         """
         The crawler version of builtin function *map*. It would activate multiple executors as many as the size of
         collection of URLs to run.
@@ -532,7 +1508,7 @@ class ExecutorCrawler(MultiRunnableCrawler):
         """
 
         feature = MultiRunnableCrawler._get_lock_feature(lock=lock, sema_value=sema_value)
-        args_iterator = [{"method": method, "url": _url, "retry": retry} for _url in url]
+        args_iterator = [{"method": method, "url": _url, "retry": retry} for _url in self._filter_visited(url)]
 
         self.__executor.map(
             function=self.crawl,
@@ -548,6 +1524,8 @@ class PoolCrawler(MultiRunnableCrawler):
 
     def __init__(self, mode: RunningMode, pool_size: int, factory: CrawlerFactory):
         super(PoolCrawler, self).__init__(factory=factory)
+        self.__pool_size = pool_size
+        self.__mode = mode
         self.__pool = SimplePool(mode=mode, pool_size=pool_size)
 
 
@@ -562,7 +1540,11 @@ class PoolCrawler(MultiRunnableCrawler):
 
     def init(self, lock: bool = True, sema_value: int = 1) -> None:
         """
-        Initialize something which be needed before instantiate Pool object.
+        Initialize something which be needed before instantiate Pool object. It also opens the resources
+        of HTTP sender (e.g., the connection pool), and they would be closed by *close*.
+
+        With running mode *RunAsParallel*, the visited set and the rate limiter of HTTP sender are handed to the
+        processes of the pool here, so they should be set before it.
 
         :param lock:
         :param sema_value:
@@ -570,7 +1552,14 @@ class PoolCrawler(MultiRunnableCrawler):
         """
 
         feature = MultiRunnableCrawler._get_lock_feature(lock=lock, sema_value=sema_value)
-        self.__pool.initial(queue_tasks=None, features=feature)
+        if self.__mode is RunAsParallel:
+            # The objects which have shared memory could only be handed to the processes when they start.
+            _shared_objects = (self._Visited_Set, getattr(self._factory.http_factory, "rate_limiter", None))
+            self.__pool.initial(queue_tasks=None, features=feature,
+                                pool_initializer=attach_shared_objects, pool_initargs=_shared_objects)
+        else:
+            self.__pool.initial(queue_tasks=None, features=feature)
+        self._open_http_io()
 
 
     def apply(self, method: str, urls: List[str], retry: int = 1) -> Optional:
@@ -583,6 +1572,7 @@ class PoolCrawler(MultiRunnableCrawler):
         :return:
         """
 
+        urls = self._filter_visited(urls)
         _urls_len = len(urls)
         _kwargs_iter = [{"method": method, "url": _url, "retry": retry} for _url in urls]
         self.__pool.apply_with_iter(
@@ -607,6 +1597,7 @@ class PoolCrawler(MultiRunnableCrawler):
         :return:
         """
 
+        urls = self._filter_visited(urls)
         _urls_len = len(urls)
 
         _kwargs_iter = [{"method": method, "url": _url, "retry": retry} for _url in urls]
@@ -634,17 +1625,31 @@ class PoolCrawler(MultiRunnableCrawler):
         return result
 
 
-    def map(self, method: str, urls: List[str], retry: int = 1) -> Optional:
+    def map(self, method: str, urls: Union[List[str], Iterable[str], URLFrontier], retry: int = 1, chunk_size: int = None) -> Optional:
         """
-        The *Pool* version of *ExecutorCrawler.map*.
+        The *Pool* version of *ExecutorCrawler.map*. If option *urls* is an iterator (e.g., the generator
+        from *URL.iter_urls*) or an **URLFrontier** object, it would be mapped chunk by chunk.
 
         :param method: HTTP method.
         :param urls: A collection of URLs.
         :param retry: How many it would retry to send HTTP request if it gets fail when sends request.
+        :param chunk_size: How many URLs it takes from option *urls* once if it's an iterator or an **URLFrontier**. Default is 1000 URLs per process of the pool.
         :return:
         """
 
-        _arguments = [(method, _url, retry) for _url in urls]
+        if isinstance(urls, URLFrontier):
+            result = []
+            for _urls in self._iter_frontier_batches(urls, MultiRunnableCrawler._chunk_size(chunk_size, self.__pool_size), self.__mode):
+                result.extend(self.map(method=method, urls=_urls, retry=retry))
+            return result
+
+        if MultiRunnableCrawler._is_lazy_urls(urls):
+            result = []
+            for _urls in _iter_chunks(urls, MultiRunnableCrawler._chunk_size(chunk_size, self.__pool_size)):
+                result.extend(self.map(method=method, urls=_urls, retry=retry))
+            return result
+
+        _arguments = [(method, _url, retry) for _url in self._filter_visited(urls)]
         self.__pool.map_by_args(function=self.crawl, args_iter=_arguments)
         result = self.__pool.get_result()
         return result
@@ -665,7 +1670,7 @@ class PoolCrawler(MultiRunnableCrawler):
         :return:
         """
 
-        _arguments = [(method, _url, retry) for _url in urls]
+        _arguments = [(method, _url, retry) for _url in self._filter_visited(urls)]
         self.__pool.async_map_by_args(
             function=self.crawl,
             args_iter=_arguments,
@@ -687,10 +1692,11 @@ class PoolCrawler(MultiRunnableCrawler):
 
     def close(self) -> None:
         """
-        Close the resource of the Pool.
+        Close the resource of the Pool and the resources of HTTP sender.
 
         :return: None
         """
 
         self.__pool.close()
+        self._close_http_io()
 
@@ -1,10 +1,19 @@
-from multipledispatch import dispatch
-from typing import List, Tuple, Iterable, Union, Optional
+from typing import List, Tuple, Dict, Iterable, Iterator, AsyncIterable, AsyncIterator, Sequence, Union, Optional
+from collections.abc import AsyncIterable as _AsyncIterableType, Collection as _CollectionType, Sequence as _SequenceType
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from abc import ABCMeta, abstractmethod
 import logging
+import sqlite3
+import io
 import re
 
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
 
 OPTION_VAR_INDEX: str = "index"
 """The option setting character of index."""
@@ -18,6 +27,8 @@ OPTION_VAR_DATETIME: str = "datetime"
 OPTION_VAR_ITERATOR: str = "iterator"
 """The option setting character of iterator."""
 
+_Datetime_Output_Formats: Dict[str, str] = {"DATE": "%Y%m%d", "DATETIME": "%Y%m%d%H%M%S"}
+
 
 def get_option() -> Tuple:
     """
@@ -107,21 +118,15 @@ class URL(BaseURL):
     __Base_Url: str = None
     __URLs: List[str] = []
 
-    def __init__(self, base: str, start: Optional[Union[int, str]] = None, end: Optional[Union[int, str]] = None, formatter: str = "yyyymmdd", iter: Optional[Iterable] = None):
+    def __init__(self, base: str, start: Optional[Union[int, str]] = None, end: Optional[Union[int, str]] = None, formatter: str = "yyyymmdd", iter: Optional[Union[Iterable, AsyncIterable]] = None):
         if base == "" or base is None:
             raise ValueError("Foundational URL cannot be empty.")
-        self.__Base_Url: str = base
-
-        # Check the character of variable.
-        self.option_is_index = re.search(r"\{" + re.escape(OPTION_VAR_INDEX) + "\}", base)
-        self.option_is_date = re.search(r"\{" + re.escape(OPTION_VAR_DATE) + "\}", base)
-        self.option_is_datetime = re.search(r"\{" + re.escape(OPTION_VAR_DATETIME) + "\}", base)
-        self.option_is_iterator = re.search(r"\{" + re.escape(OPTION_VAR_ITERATOR) + "\}", base)
+        self.base_url = base
 
         self.start: Optional[Union[int, str]] = start
         self.end: Optional[Union[int, str]] = end
         self.formatter: str = formatter
-        self.iterator: Iterable = iter
+        self.iterator: Union[Iterable, AsyncIterable] = iter
 
         self._start_date = None
         self._end_date = None
@@ -143,6 +148,14 @@ class URL(BaseURL):
     @base_url.setter
     def base_url(self, url: str) -> None:
         self.__Base_Url = url
+        # Compile the URL once, every URL would be rendered by the compiled template.
+        self._template = _URLTemplate.compile(url)
+
+        # Check the character of variable.
+        self.option_is_index = re.search(r"\{" + re.escape(OPTION_VAR_INDEX) + r"\}", url)
+        self.option_is_date = re.search(r"\{" + re.escape(OPTION_VAR_DATE) + r"\}", url)
+        self.option_is_datetime = re.search(r"\{" + re.escape(OPTION_VAR_DATETIME) + r"\}", url)
+        self.option_is_iterator = re.search(r"\{" + re.escape(OPTION_VAR_ITERATOR) + r"\}", url)
 
 
     def is_index_rule(self) -> bool:
@@ -264,88 +277,231 @@ class URL(BaseURL):
 
 
     def generate(self) -> List[str]:
-        if self.option_is_index:
-            # Check whether the needed option id ready or not.
-            if self.start is None and self.end is None:
-                raise ValueError("Options *start* and *end* cannot be empty value with INDEX rule.")
-
-            if type(self.start) is not int or type(self.end) is not int:
-                logging.warning("The types of start index and end index aren't 'int'. It will try to convert to 'int' type.")
-                try:
-                    self.start = int(self.start)
-                    self.end = int(self.end)
-                except ValueError as e:
-                    raise ValueError("Parameter *start* and *end* should be integers or integer type characters.")
-
-            self._index_handling(index=self.start)
-
-        elif self.option_is_date:
-            if self.start is None and self.end is None:
-                raise ValueError("Options *start* and *end* cannot be empty value with DATE rule.")
-
-            if type(self.start) is not str or type(self.end) is not str:
-                raise ValueError("The value format is incorrect of options *start* and *end*.")
-
-            chksum = URL._is_py_datetime_format(formatter=self.formatter)
-            if chksum is True:
-                formatter = self.formatter
-            else:
-                formatter = URL._convert_formatter(formatter=self.formatter)
-            self._start_date = datetime.strptime(self.start, formatter)
-            self._end_date = datetime.strptime(self.end, formatter)
-            self._diff_days = (self._end_date.date() - self._start_date.date()).days
+        self.urls = list(self.iter_urls())
+        return self.urls
 
-            self._date_handling(_date=self._start_date, days=self.period_days)
 
-        elif self.option_is_datetime:
-            if self.start is None and self.end is None:
-                raise ValueError("Options *start* and *end* cannot be empty value with DATETIME rule.")
+    def iter_urls(self) -> Iterator[str]:
+        """
+        The lazy version of *generate*. It checks the options first and returns a generator which yields
+        the URLs one by one. So it doesn't keep all the URLs in memory and it doesn't have any limitation
+        of recursion depth no matter how big the range is.
 
-            if type(self.start) is not str or type(self.end) is not str:
-                raise ValueError("The value format is incorrect of options *start* and *end*.")
+        If the URL has multiple options (e.g., 'https://www.test.com?date={date}&code={iterator}'), it
+        generates the cartesian product of all the options lazily. The former option in URL is the outer one.
+
+        The option *iter* could be any iterable object. A collection (e.g., *list*, *tuple*, *set* or *dict*)
+        is used as it is. The other iterable objects like a generator, a file object or a DB cursor are
+        consumed lazily only once, so they're always the outermost one of the cartesian product.
+
+        :return: A generator of URLs.
+        """
+
+        rules = self._build_rules()
+        return self._template.expand(rules)
+
+
+    def aiter_urls(self) -> AsyncIterator[str]:
+        """
+        The asynchronous version of *iter_urls*. The option *iter* could be an asynchronous iterable object
+        (e.g., an asynchronous generator which reads the values from a DB), and it's consumed lazily.
+        **AsyncSimpleCrawler** could receive it directly as the option *url*.
+
+        :return: An asynchronous generator of URLs.
+        """
+
+        rules = self._build_rules()
+        return self._template.aexpand(rules)
+
+
+    def sequence(self) -> "URLSequence":
+        """
+        The random access version of *generate*. It returns a **URLSequence** object which could get the
+        size by *len* and get any URL by index or slice. Every URL is calculated by the options *start*,
+        *end* and the period settings when it's accessed, so it never generates all the URLs.
+
+        :return: A **URLSequence** object.
+        """
+
+        rules = self._build_rules()
+        if any(isinstance(_rule, _StreamRule) for _rule in rules):
+            raise TypeError("It cannot access the URLs randomly if the option *iter* isn't a collection. "
+                            "Please use *iter_urls* or *iter_url_chunks*.")
+        return URLSequence(template=self._template, rules=rules)
+
+
+    def shard(self, shard_index: int, shard_count: int, strided: bool = False) -> "URLSequence":
+        """
+        Get the *shard_index*-th partition of the URLs when it divides all the URLs to *shard_count* partitions.
+        It's deterministic, so different machines could run the same *URL* object with different *shard_index*
+        and each one only handles its own partition. It only calculates the range of positions of the partition,
+        it doesn't generate or skip the URLs of the other partitions.
+
+        :param shard_index: The index of partition. It should be in range 0 to *shard_count* - 1.
+        :param shard_count: How many partitions it divides.
+        :param strided: The layout of partitions. The partition is a contiguous slice if it's False (default),
+                        or it takes the URL every *shard_count* URLs from position *shard_index* if it's True.
+        :return: A **URLSequence** object of the partition.
+        """
+
+        return self.sequence().shard(shard_index=shard_index, shard_count=shard_count, strided=strided)
+
+
+    def iter_url_chunks(self, chunk_size: int = 10000) -> Iterator[List[str]]:
+        """
+        The batch version of *iter_urls*. It generates the URLs chunk by chunk. For the options date
+        and datetime, the values of one chunk are calculated and formatted together by array arithmetic
+        of *numpy.datetime64* if *numpy* is installed, or it would fall back to pure Python.
+
+        :param chunk_size: How many URLs one chunk has.
+        :return: A generator of chunks which is a list of URLs.
+        """
+
+        rules = self._build_rules()
+        if any(isinstance(_rule, _StreamRule) for _rule in rules):
+            return _iter_chunks(self._template.expand(rules), chunk_size=chunk_size)
+        return URLSequence(template=self._template, rules=rules).iter_chunks(chunk_size=chunk_size)
+
+
+    def _build_rules(self) -> List[Union["_IndexRule", "_DatetimeRule", "_ValuesRule", "_StreamRule"]]:
+        """
+        Check the options and build the rule of every option in the URL. The order of rules is the same as
+        the order of options in the compiled template.
+
+        :return: A list of rules.
+        """
+
+        options = self._template.options
+        if not options:
+            URL._raise_invalid_option()
+
+        # The options of range all use options *start* and *end*, so only one of them is generated (index first, then
+        # date and datetime) and the others are kept in the URL as they are.
+        range_option = next((_option for _option in (OPTION_VAR_INDEX, OPTION_VAR_DATE, OPTION_VAR_DATETIME) if _option in options), None)
+        return [
+            self._build_rule(option=_option) if _option in (range_option, OPTION_VAR_ITERATOR) else _ValuesRule(values=("{" + _option + "}",))
+            for _option in options
+        ]
 
-            chksum = URL._is_py_datetime_format(formatter=self.formatter)
-            if chksum is True:
-                formatter = self.formatter
-            else:
-                formatter = URL._convert_formatter(formatter=self.formatter)
-            self._start_date = datetime.strptime(self.start, formatter)
-            self._end_date = datetime.strptime(self.end, formatter)
-            self._diff_days = (self._end_date - self._start_date).days
 
-            self._datetime_handling(
-                _datetime=self._start_date,
-                days=self.period_days,
-                hours=self.period_hours,
-                minutes=self.period_minutes,
-                seconds=self.period_seconds)
+    def _build_rule(self, option: str) -> Union["_IndexRule", "_DatetimeRule", "_ValuesRule", "_StreamRule"]:
+        """
+        Check the options of the target option setting and build its rule.
 
-        elif self.option_is_iterator:
-            if self.iterator is None:
-                raise ValueError("Options *iterator* cannot be empty value with ITERATOR rule.")
+        :param option: One of OPTION_VAR_INDEX, OPTION_VAR_DATE, OPTION_VAR_DATETIME and OPTION_VAR_ITERATOR.
+        :return: The rule of the option.
+        """
 
-            self._iterator_handling(self.iterator)
+        if option == OPTION_VAR_INDEX:
+            self._check_index_options()
+            return _IndexRule(start=self.start, end=self.end)
+
+        elif option == OPTION_VAR_DATE:
+            self._check_date_options(rule="DATE")
+            return _DatetimeRule(
+                start=self._start_date,
+                end=self._end_date,
+                period=timedelta(days=self.period_days),
+                formatter=URL._resolve_formatter(formatter=self.formatter, rule="DATE")[1])
+
+        elif option == OPTION_VAR_DATETIME:
+            self._check_date_options(rule="DATETIME")
+            return _DatetimeRule(
+                start=self._start_date,
+                end=self._end_date,
+                period=timedelta(days=self.period_days, hours=self.period_hours, minutes=self.period_minutes, seconds=self.period_seconds),
+                formatter=URL._resolve_formatter(formatter=self.formatter, rule="DATETIME")[1])
 
         else:
-            raise ValueError("Cannot verify the option variable. Please using '{%s}', '{%s}', '{%s}' or '{%s}'.",
-                             OPTION_VAR_INDEX, OPTION_VAR_DATE, OPTION_VAR_DATETIME, OPTION_VAR_ITERATOR)
+            self._check_iterator_options()
+            if isinstance(self.iterator, dict):
+                return _ValuesRule(values=tuple(f"{key}={val}" for key, val in self.iterator.items()))
+            elif isinstance(self.iterator, _SequenceType):
+                return _ValuesRule(values=self.iterator)
+            elif isinstance(self.iterator, _CollectionType):
+                return _ValuesRule(values=tuple(self.iterator))
+            else:
+                return _StreamRule(values=self.iterator)
 
-        return self.urls
+
+    def _check_index_options(self) -> None:
+        """
+        Check the options of INDEX rule. It would try to convert options *start* and *end* to 'int' type.
+
+        :return: None
+        """
+
+        # Check whether the needed option id ready or not.
+        if self.start is None and self.end is None:
+            raise ValueError("Options *start* and *end* cannot be empty value with INDEX rule.")
+
+        if type(self.start) is not int or type(self.end) is not int:
+            logging.warning("The types of start index and end index aren't 'int'. It will try to convert to 'int' type.")
+            try:
+                self.start = int(self.start)
+                self.end = int(self.end)
+            except ValueError as e:
+                raise ValueError("Parameter *start* and *end* should be integers or integer type characters.")
+
+
+    def _check_date_options(self, rule: str) -> None:
+        """
+        Check the options of DATE or DATETIME rule and parse options *start* and *end* to be datetime objects.
+
+        :param rule: The rule name for the error message. It's 'DATE' or 'DATETIME'.
+        :return: None
+        """
+
+        if self.start is None and self.end is None:
+            raise ValueError(f"Options *start* and *end* cannot be empty value with {rule} rule.")
+
+        if type(self.start) is not str or type(self.end) is not str:
+            raise ValueError("The value format is incorrect of options *start* and *end*.")
+
+        formatter, _ = URL._resolve_formatter(formatter=self.formatter, rule=rule)
+        self._start_date = datetime.strptime(self.start, formatter)
+        self._end_date = datetime.strptime(self.end, formatter)
+        if rule == "DATE":
+            self._diff_days = (self._end_date.date() - self._start_date.date()).days
+        else:
+            self._diff_days = (self._end_date - self._start_date).days
 
 
-    def _index_handling(self, index: int) -> None:
+    def _check_iterator_options(self) -> None:
         """
-        The main process to generate URL with index.
+        Check the options of ITERATOR rule.
 
-        :param index: The index value. It should be a started number.
         :return: None
         """
 
-        if index <= self.end:
-            option = URL._add_flag(option=OPTION_VAR_INDEX)
-            target_url = self.base_url.replace(option, str(index))
-            self.urls.append(target_url)
-            self._index_handling(index=index + 1)
+        if self.iterator is None:
+            raise ValueError("Options *iterator* cannot be empty value with ITERATOR rule.")
+
+
+    @staticmethod
+    def _raise_invalid_option() -> None:
+        raise ValueError("Cannot verify the option variable. Please using '{%s}', '{%s}', '{%s}' or '{%s}'.",
+                         OPTION_VAR_INDEX, OPTION_VAR_DATE, OPTION_VAR_DATETIME, OPTION_VAR_ITERATOR)
+
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _resolve_formatter(formatter: str, rule: str) -> Tuple[str, str]:
+        """
+        Resolve the option *formatter* to the format which parses options *start* and *end* (*strptime*) and
+        the format of values in URLs (*strftime*). It's cached by the option *formatter* and the rule, so it
+        only checks and converts the same formatter once no matter how many *URL* objects use it.
+
+        :param formatter: The character format of datetime formatter, e.g., 'yyyymmdd' or '%Y/%m/%d'.
+        :param rule: The rule name. It's 'DATE' or 'DATETIME'.
+        :return: A tuple of the parsing format and the output format.
+        """
+
+        if URL._is_py_datetime_format(formatter=formatter) is True:
+            parsing_format = formatter
+        else:
+            parsing_format = URL._convert_formatter(formatter=formatter)
+        return parsing_format, _Datetime_Output_Formats[rule]
 
 
     @staticmethod
@@ -462,100 +618,795 @@ class URL(BaseURL):
         return final_formatter
 
 
-    def _date_handling(self, _date: datetime, days: int) -> None:
+    @staticmethod
+    def _add_flag(option: str) -> str:
         """
-        The main process to generate URL with date.
+        Get the character with the option and the specific format it defines.
 
-        :param _date: A datetime object.
-        :param days: How many days to iterate next value.
-        :return: None
+        :param option: The option setting.
+        :return: A string value.
         """
 
-        if _date <= self._end_date:
-            date_option_val = _date.strftime("%Y%m%d").replace("-", "")
+        return "{" + option + "}"
+
+
+
+class _URLTemplate:
+
+    """
+    The compiled URL. It splits the URL to literal segments and option segments once, and then every URL
+    is rendered by one *str.format* call with the option values instead of scanning and replacing the URL
+    string again and again.
+    """
+
+    __slots__ = ("base_url", "options", "_formatter")
 
-            option = URL._add_flag(option=OPTION_VAR_DATE)
-            target_url = self.base_url.replace(option, date_option_val)
-            self.urls.append(target_url)
+    _Option_Regex = re.compile(r"\{(" + "|".join(re.escape(_option) for _option in get_option()) + r")\}")
 
-            new_date = _date + timedelta(days=days)
-            self._date_handling(_date=new_date, days=days)
+    def __init__(self, base_url: str):
+        self.base_url = base_url
 
+        options: List[str] = []
+        segments: List[str] = []
+        _last_end = 0
+        for _match in self._Option_Regex.finditer(base_url):
+            _literal = base_url[_last_end:_match.start()]
+            segments.append(_literal.replace("{", "{{").replace("}", "}}"))
+            _option = _match.group(1)
+            if _option not in options:
+                options.append(_option)
+            segments.append("{" + str(options.index(_option)) + "}")
+            _last_end = _match.end()
+        segments.append(base_url[_last_end:].replace("{", "{{").replace("}", "}}"))
 
-    def _datetime_handling(self, _datetime: datetime, days: int = None, hours: int=None, minutes: int=None, seconds: int=None) -> None:
+        self.options: Tuple[str, ...] = tuple(options)
+        self._formatter: str = "".join(segments)
+
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile(base_url: str) -> "_URLTemplate":
         """
-        The main process to generate URL with datetime.
+        Compile the URL. It's cached by the URL, so the *URL* objects with the same URL share one template.
 
-        :param _datetime:
-        :param days: How many days to iterate next value.
-        :param hours: How many hours to iterate next value.
-        :param minutes: How many minutes to iterate next value.
-        :param seconds: How many seconds to iterate next value.
-        :return: None
+        :param base_url: The URL with options.
+        :return: A **_URLTemplate** object.
         """
 
-        if _datetime <= self._end_date:
-            date_option_val = _datetime.isoformat().replace("-", "")
-            date_option_val = date_option_val.replace(":", "")
-            date_option_val = date_option_val.replace("T", "")
+        return _URLTemplate(base_url)
 
-            option = URL._add_flag(option=OPTION_VAR_DATETIME)
-            target_url = self.base_url.replace(option, date_option_val)
-            self.urls.append(target_url)
 
-            new_datetime = _datetime + timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
-            self._datetime_handling(_datetime=new_datetime, days=days, hours=hours, minutes=minutes, seconds=seconds)
+    def render(self, *values: str) -> str:
+        """
+        Render one URL with the values of options. The order of values is the same as *options*.
+
+        :param values: The values of options.
+        :return: An URL.
+        """
+
+        return self._formatter.format(*values)
 
 
-    @dispatch((list, tuple, set))
-    def _iterator_handling(self, iter: Union[list, tuple, set]) -> None:
+    def render_many(self, values: Iterable[str]) -> List[str]:
         """
-        The main process to generate URL with iterator. This overload function run process
-        if the option *iter* is *list*, *tuple* or *set* type.
+        Render URLs with the values of the only one option in bulk.
 
-        :param iter: A iterator. It could be a *list*, *tuple* or *set* type.
-        :return: None
+        :param values: The values of the option.
+        :return: A list of URLs.
         """
 
-        for ele in iter:
-            option = URL._add_flag(option=OPTION_VAR_ITERATOR)
-            target_url = self.base_url.replace(option, str(ele))
-            self.urls.append(target_url)
+        return list(map(self._formatter.format, values))
 
 
-    @dispatch(dict)
-    def _iterator_handling(self, iter: dict) -> None:
+    def expand(self, rules: List[Union["_IndexRule", "_DatetimeRule", "_ValuesRule", "_StreamRule"]]) -> Iterator[str]:
         """
-        Description:
-            The main process to generate URL with iterator. This overload function run process
-        if the option *iter* is *dict* type.
-            It could all data content which be saved in received parameter
-            combine the key and value as HTTP GET method format options.
+        Generate the cartesian product of the rules lazily. The first rule is the outer one, except
+        the rule of a lazy iterable object which could only be iterated once, it's always the outermost one.
 
-        Example:
-            Received parameter value:
-                {"index_1": 1, "index_2": 2}
-            Result:
-                index_1=1, index_2=2
+        :param rules: The rules of options. The order is the same as *options*.
+        :return: A generator of URLs.
+        """
 
-        :param iter: A iterator. It could be a *dict type.
-        :return: None
+        _format = self._formatter.format
+        if len(rules) == 1:
+            for _value in rules[0]:
+                yield _format(_value)
+            return
+
+        _values = [None] * len(rules)
+        for _ in _URLTemplate._assign(rules, _URLTemplate._loop_order(rules), _values, 0):
+            yield _format(*_values)
+
+
+    async def aexpand(self, rules: List[Union["_IndexRule", "_DatetimeRule", "_ValuesRule", "_StreamRule"]]) -> AsyncIterator[str]:
+        """
+        The asynchronous version of *expand*. The rule of an asynchronous iterable object is the outermost one.
+
+        :param rules: The rules of options. The order is the same as *options*.
+        :return: An asynchronous generator of URLs.
         """
-        for key, val in iter.items():
-            option = URL._add_flag(option=OPTION_VAR_ITERATOR)
-            target_url = self.base_url.replace(option, f"{key}={val}")
-            self.urls.append(target_url)
+
+        _order = _URLTemplate._loop_order(rules)
+        _outer_slot = _order[0]
+        if not isinstance(rules[_outer_slot], _StreamRule):
+            for _url in self.expand(rules):
+                yield _url
+            return
+
+        _format = self._formatter.format
+        _values = [None] * len(rules)
+        async for _value in rules[_outer_slot]:
+            _values[_outer_slot] = _value
+            for _ in _URLTemplate._assign(rules, _order, _values, 1):
+                yield _format(*_values)
 
 
     @staticmethod
-    def _add_flag(option: str) -> str:
+    def _loop_order(rules: List[Union["_IndexRule", "_DatetimeRule", "_ValuesRule", "_StreamRule"]]) -> List[int]:
         """
-        Get the character with the option and the specific format it defines.
+        The order of loops of the cartesian product. It's the order of rules but the rule of lazy iterable
+        object is moved to be the first one.
 
-        :param option: The option setting.
-        :return: A string value.
+        :param rules: The rules of options.
+        :return: A list of indexes of rules.
         """
 
-        return "{" + option + "}"
+        return sorted(range(len(rules)), key=lambda _slot: not isinstance(rules[_slot], _StreamRule))
+
+
+    @staticmethod
+    def _assign(rules: List[Union["_IndexRule", "_DatetimeRule", "_ValuesRule", "_StreamRule"]],
+                order: List[int], values: List[Optional[str]], depth: int) -> Iterator[None]:
+        """
+        Assign every combination of the values of rules from loop *depth* to the list *values* in place.
+        It yields once after every combination is assigned.
+
+        :param rules: The rules of options.
+        :param order: The order of loops.
+        :param values: The values of options which would be assigned.
+        :param depth: The current loop.
+        :return: A generator.
+        """
+
+        if depth == len(order):
+            yield
+            return
+
+        _slot = order[depth]
+        for _value in rules[_slot]:
+            values[_slot] = _value
+            yield from _URLTemplate._assign(rules, order, values, depth + 1)
+
+
+
+class _IndexRule:
+
+    """
+    The arithmetic rule of INDEX option. The value of position *i* is *start + i*.
+    """
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+
+    def __len__(self) -> int:
+        return max(0, self.end - self.start + 1)
+
+
+    def __getitem__(self, position: int) -> str:
+        return str(self.start + position)
+
+
+    def __iter__(self) -> Iterator[str]:
+        return map(str, range(self.start, self.end + 1))
+
+
+    def batch(self, start: int, stop: int) -> List[str]:
+        """
+        Get the values of positions from *start* to *stop* (excluded) together.
+
+        :param start: The start position.
+        :param stop: The stop position (excluded).
+        :return: A list of values.
+        """
+
+        return list(map(str, range(self.start + start, self.start + stop)))
+
+
+
+class _DatetimeRule:
+
+    """
+    The arithmetic rule of DATE and DATETIME options. The value of position *i* is *start + period * i*.
+    """
+
+    __slots__ = ("start", "end", "period", "formatter")
+
+    _Batch_Size: int = 4096
+    # The array arithmetic has a fixed overhead, so it's slower than pure Python for a few values.
+    _Numpy_Min_Size: int = 32
+
+    def __init__(self, start: datetime, end: datetime, period: timedelta, formatter: str):
+        if period <= timedelta(0):
+            raise ValueError("The period should be bigger than 0.")
+        self.start = start
+        self.end = end
+        self.period = period
+        self.formatter = formatter
+
+
+    def __len__(self) -> int:
+        if self.end < self.start:
+            return 0
+        return (self.end - self.start) // self.period + 1
+
+
+    def __getitem__(self, position: int) -> str:
+        return (self.start + self.period * position).strftime(self.formatter)
+
+
+    def __iter__(self) -> Iterator[str]:
+        _size = len(self)
+        for _start in range(0, _size, self._Batch_Size):
+            yield from self.batch(_start, min(_start + self._Batch_Size, _size))
+
+
+    def batch(self, start: int, stop: int) -> List[str]:
+        """
+        Get the values of positions from *start* to *stop* (excluded) together. It calculates and formats
+        all the values by array arithmetic of *numpy.datetime64* if it could, or it falls back to pure Python.
+
+        :param start: The start position.
+        :param stop: The stop position (excluded).
+        :return: A list of values.
+        """
+
+        if stop <= start:
+            return []
+
+        if _numpy is not None and stop - start >= self._Numpy_Min_Size and self.period % timedelta(seconds=1) == timedelta(0):
+            _values = _format_datetime_batch(
+                start=self.start + self.period * start,
+                period_seconds=self.period // timedelta(seconds=1),
+                size=stop - start,
+                formatter=self.formatter)
+            if _values is not None:
+                return _values
+
+        _values = []
+        _datetime = self.start + self.period * start
+        for _ in range(stop - start):
+            _values.append(_datetime.strftime(self.formatter))
+            _datetime += self.period
+        return _values
+
+
+
+class _ValuesRule:
+
+    """
+    The rule of ITERATOR option. The value of position *i* is the *i*-th element of the iterator.
+    """
+
+    __slots__ = ("values", )
+
+    def __init__(self, values: tuple):
+        self.values = values
+
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+    def __getitem__(self, position: int) -> str:
+        return str(self.values[position])
 
 
+    def __iter__(self) -> Iterator[str]:
+        return map(str, self.values)
+
+
+    def batch(self, start: int, stop: int) -> List[str]:
+        """
+        Get the values of positions from *start* to *stop* (excluded) together.
+
+        :param start: The start position.
+        :param stop: The stop position (excluded).
+        :return: A list of values.
+        """
+
+        return list(map(str, self.values[start:stop]))
+
+
+
+class _StreamRule:
+
+    """
+    The lazy rule of ITERATOR option with an iterable object which isn't a collection, e.g., a generator,
+    a file object or a DB cursor. The values are only taken when the URLs are generated, so it doesn't keep
+    them in memory. If it's a file object, the line endings of the lines are removed, so they could be used
+    directly. It could also be an asynchronous iterable object.
+    """
+
+    __slots__ = ("values", "lines")
+
+    def __init__(self, values: Union[Iterable, AsyncIterable]):
+        self.values = values
+        self.lines = isinstance(values, io.IOBase)
+
+
+    @property
+    def is_async(self) -> bool:
+        """
+        Whether the iterable object is an asynchronous iterable object or not.
+
+        :return: It returns True if it is, or it returns False.
+        """
+
+        return isinstance(self.values, _AsyncIterableType)
+
+
+    def __iter__(self) -> Iterator[str]:
+        if self.is_async:
+            raise TypeError("The option *iter* is an asynchronous iterable object. Please use *aiter_urls*.")
+        return map(self._to_value, self.values)
+
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        if self.is_async:
+            async for _value in self.values:
+                yield self._to_value(_value)
+        else:
+            for _value in self.values:
+                yield self._to_value(_value)
+
+
+    def _to_value(self, value) -> str:
+        return str(value).rstrip("\r\n") if self.lines is True else str(value)
+
+
+
+class URLSequence(Sequence):
+
+    """
+    A read-only sequence view of the URLs which *URL* object would generate. It supports *len*, index
+    and slice, and all of them are calculated arithmetically. So it's cheap to pass a slice of it to
+    other executors (even processes), it only has the rules and the range of positions.
+
+    If the URL has multiple options, the position is mapped to the cartesian product of the rules
+    (the first rule is the outer one).
+    """
+
+    def __init__(self, template: _URLTemplate, rules: List[Union[_IndexRule, _DatetimeRule, _ValuesRule]], positions: range = None):
+        self._template = template
+        self._rules = tuple(rules)
+        if positions is None:
+            _size = 1
+            for _rule in self._rules:
+                _size *= len(_rule)
+            positions = range(_size)
+        self._positions = positions
+
+
+    @property
+    def positions(self) -> range:
+        """
+        The positions in the whole URLs which current sequence view covers.
+
+        :return: A *range* object.
+        """
+
+        return self._positions
+
+
+    def shard(self, shard_index: int, shard_count: int, strided: bool = False) -> "URLSequence":
+        """
+        Get the *shard_index*-th partition of current sequence. Please refer to *URL.shard*.
+
+        :param shard_index: The index of partition. It should be in range 0 to *shard_count* - 1.
+        :param shard_count: How many partitions it divides.
+        :param strided: The layout of partitions. It's contiguous if it's False, or it's strided.
+        :return: A **URLSequence** object of the partition.
+        """
+
+        if shard_count <= 0:
+            raise ValueError("The option *shard_count* should be bigger than 0.")
+        if shard_index < 0 or shard_index >= shard_count:
+            raise ValueError(f"The option *shard_index* should be in range 0 to {shard_count - 1}.")
+
+        if strided is True:
+            return self[shard_index::shard_count]
+
+        _interval, _remainder = divmod(len(self), shard_count)
+        _start = shard_index * _interval + min(shard_index, _remainder)
+        _stop = _start + _interval + (1 if shard_index < _remainder else 0)
+        return self[_start:_stop]
+
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "URLSequence"]:
+        if isinstance(index, slice):
+            return URLSequence(template=self._template, rules=self._rules, positions=self._positions[index])
+        return self._render(self._positions[index])
+
+
+    def __iter__(self) -> Iterator[str]:
+        if len(self._rules) == 1:
+            _rule = self._rules[0]
+            _format = self._template.render
+            for _position in self._positions:
+                yield _format(_rule[_position])
+        else:
+            for _position in self._positions:
+                yield self._render(_position)
+
+
+    def iter_chunks(self, chunk_size: int = 10000) -> Iterator[List[str]]:
+        """
+        Generate the URLs of current sequence chunk by chunk. If it has only one option and the positions
+        are continuous, the values of one chunk are calculated together by the rule.
+
+        :param chunk_size: How many URLs one chunk has.
+        :return: A generator of chunks which is a list of URLs.
+        """
+
+        if chunk_size <= 0:
+            raise ValueError("The size of chunk should be bigger than 0.")
+
+        _positions = self._positions
+        if len(self._rules) == 1 and _positions.step == 1:
+            _rule = self._rules[0]
+            for _start in range(_positions.start, _positions.stop, chunk_size):
+                _stop = min(_start + chunk_size, _positions.stop)
+                yield self._template.render_many(_rule.batch(_start, _stop))
+        else:
+            yield from _iter_chunks(self, chunk_size=chunk_size)
+
+
+    def _render(self, position: int) -> str:
+        """
+        Render the URL of the position. The position is decomposed as mixed radix number by the sizes of rules.
+
+        :param position: The position in the whole URLs.
+        :return: An URL.
+        """
+
+        values = []
+        for _rule in reversed(self._rules):
+            position, _rule_position = divmod(position, len(_rule))
+            values.append(_rule[_rule_position])
+        return self._template.render(*reversed(values))
+
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(base_url={self._template.base_url!r}, positions={self._positions!r})"
+
+
+
+class URLFrontier:
+
+    """
+    A disk-backed frontier of URLs. It records every URL with its state (pending, in-flight or done) in
+    a SQLite file, so it could keep tens of millions URLs without loading them in memory, and a crawl
+    could be resumed from the last checkpoint after it crashes.
+
+    The crawler roles could receive it as the option *url*. They take the pending URLs batch by batch,
+    and mark the URLs which have been crawled successfully as done after the batch finishes. The other URLs
+    of the batch (e.g., their requests time out) are released, so they would be crawled again after resuming.
+    The URLs which are still in-flight when it's opened (a batch which was crawling when it crashed) would be
+    pending again.
+    """
+
+    Pending: int = 0
+    In_Flight: int = 1
+    Done: int = 2
+
+    def __init__(self, path: str, batch_size: int = 10000):
+        """
+        Open (or create) the frontier file.
+
+        :param path: The path of SQLite file.
+        :param batch_size: How many URLs it inserts in one transaction when it adds URLs.
+        """
+
+        if batch_size <= 0:
+            raise ValueError("The option *batch_size* should be bigger than 0.")
+
+        self._path = path
+        self._batch_size = batch_size
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS urls (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL UNIQUE, state INTEGER NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state, id)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS cursors (name TEXT PRIMARY KEY, position INTEGER NOT NULL)")
+        self.recover()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    def __len__(self) -> int:
+        return self.count(state=URLFrontier.Pending)
+
+
+    @property
+    def path(self) -> str:
+        """
+        The path of SQLite file.
+
+        :return: A string type value.
+        """
+
+        return self._path
+
+
+    def extend(self, urls: Iterable[str], cursor: str = None) -> int:
+        """
+        Add URLs to the frontier as pending. The URLs which already are in the frontier would be ignored.
+
+        If option *cursor* is given, it records how many URLs it has taken from *urls* with the name after every
+        batch. So it could resume from the checkpoint by calling it again with the same source of URLs and the
+        same cursor name. It only skips the taken URLs by slice if *urls* is a sequence (e.g., **URLSequence**),
+        so it doesn't generate them again.
+
+        :param urls: A collection or an iterator of URLs, e.g., *URL.sequence* or *URL.iter_urls*.
+        :param cursor: The name of resume cursor.
+        :return: How many URLs it has taken from *urls* (including the ones which already are in the frontier).
+        """
+
+        _position = self.cursor(cursor) if cursor is not None else 0
+        if _position:
+            if isinstance(urls, _SequenceType):
+                urls = urls[_position:]
+            else:
+                urls = islice(urls, _position, None)
+
+        _taken = 0
+        for _urls in _iter_chunks(urls, chunk_size=self._batch_size):
+            _taken += len(_urls)
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO urls (url, state) VALUES (?, ?)",
+                    ((_url, URLFrontier.Pending) for _url in _urls))
+                if cursor is not None:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO cursors (name, position) VALUES (?, ?)", (cursor, _position + _taken))
+        return _taken
+
+
+    def cursor(self, name: str) -> int:
+        """
+        Get the position of resume cursor.
+
+        :param name: The name of resume cursor.
+        :return: How many URLs have been taken with the cursor. It's 0 if the cursor doesn't exist.
+        """
+
+        _row = self._connection.execute("SELECT position FROM cursors WHERE name = ?", (name, )).fetchone()
+        return _row[0] if _row else 0
+
+
+    def take(self, size: int) -> List[str]:
+        """
+        Take at most *size* pending URLs in the order they were added, and mark them as in-flight.
+
+        :param size: How many URLs it takes.
+        :return: A list of URLs. It's empty if there isn't any pending URL.
+        """
+
+        return [_row[1] for _row in self._take(size)]
+
+
+    def complete(self, urls: Iterable[str]) -> None:
+        """
+        Mark the URLs as done.
+
+        :param urls: The URLs which have been crawled.
+        :return: None
+        """
+
+        self._set_state(urls=urls, state=URLFrontier.Done)
+
+
+    def release(self, urls: Iterable[str]) -> None:
+        """
+        Mark the URLs as pending again, e.g., the URLs of a batch which gets fail.
+
+        :param urls: The URLs which would be taken again.
+        :return: None
+        """
+
+        self._set_state(urls=urls, state=URLFrontier.Pending)
+
+
+    def recover(self) -> int:
+        """
+        Mark all the in-flight URLs as pending again. It's called when the frontier is opened.
+
+        :return: How many URLs it recovers.
+        """
+
+        with self._connection:
+            _cursor = self._connection.execute(
+                "UPDATE urls SET state = ? WHERE state = ?", (URLFrontier.Pending, URLFrontier.In_Flight))
+        return _cursor.rowcount
+
+
+    def count(self, state: int = None) -> int:
+        """
+        Count the URLs in the frontier.
+
+        :param state: Only count the URLs with the state if it's given.
+        :return: The amount of URLs.
+        """
+
+        if state is None:
+            return self._connection.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+        return self._connection.execute("SELECT COUNT(*) FROM urls WHERE state = ?", (state, )).fetchone()[0]
+
+
+    def iter_batches(self, batch_size: int) -> Iterator[List[str]]:
+        """
+        Take the pending URLs batch by batch until there isn't any pending URL. The URLs of a batch which are
+        still in-flight would be marked as done when the next batch is taken (or the generator is exhausted), so
+        the batch which is crawling when it crashes would be crawled again after resuming. The URLs which fail
+        could be released by *release* before taking the next batch, they're pending again but they aren't taken
+        by this generator again, so they're crawled after resuming. If the generator is closed early (e.g., an
+        exception is raised while crawling the batch), the batch would be pending again.
+
+        :param batch_size: How many URLs one batch has.
+        :return: A generator of batches which is a list of URLs.
+        """
+
+        _rows = self._take(batch_size)
+        while _rows:
+            try:
+                yield [_row[1] for _row in _rows]
+            except GeneratorExit:
+                self._set_state_by_ids(ids=(_row[0] for _row in _rows), state=URLFrontier.Pending)
+                raise
+            self._set_state_by_ids(ids=(_row[0] for _row in _rows), state=URLFrontier.Done, from_state=URLFrontier.In_Flight)
+            _rows = self._take(batch_size, after_id=_rows[-1][0])
+
+
+    def close(self) -> None:
+        """
+        Close the SQLite file.
+
+        :return: None
+        """
+
+        self._connection.close()
+
+
+    def _take(self, size: int, after_id: int = 0) -> List[Tuple[int, str]]:
+        if size <= 0:
+            raise ValueError("The option *size* should be bigger than 0.")
+
+        with self._connection:
+            _rows = self._connection.execute(
+                "SELECT id, url FROM urls WHERE state = ? AND id > ? ORDER BY id LIMIT ?",
+                (URLFrontier.Pending, after_id, size)).fetchall()
+            if _rows:
+                # The rows are the first pending ones, so all the pending rows in the range of ids are them.
+                self._connection.execute(
+                    "UPDATE urls SET state = ? WHERE state = ? AND id BETWEEN ? AND ?",
+                    (URLFrontier.In_Flight, URLFrontier.Pending, _rows[0][0], _rows[-1][0]))
+        return _rows
+
+
+    def _set_state(self, urls: Iterable[str], state: int) -> None:
+        with self._connection:
+            self._connection.executemany("UPDATE urls SET state = ? WHERE url = ?", ((state, _url) for _url in urls))
+
+
+    def _set_state_by_ids(self, ids: Iterable[int], state: int, from_state: int = None) -> None:
+        with self._connection:
+            if from_state is None:
+                self._connection.executemany("UPDATE urls SET state = ? WHERE id = ?", ((state, _id) for _id in ids))
+            else:
+                self._connection.executemany(
+                    "UPDATE urls SET state = ? WHERE id = ? AND state = ?", ((state, _id, from_state) for _id in ids))
+
+
+
+def _iter_chunks(urls: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    """
+    Take the URLs from an iterable object chunk by chunk.
+
+    :param urls: An iterable object of URLs.
+    :param chunk_size: How many URLs one chunk has.
+    :return: A generator of chunks which is a list of URLs.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("The size of chunk should be bigger than 0.")
+
+    _urls_iter = iter(urls)
+    while True:
+        _chunk = list(islice(_urls_iter, chunk_size))
+        if not _chunk:
+            break
+        yield _chunk
+
+
+_Datetime_Directives = {
+    "Y": (4, lambda fields: fields[0]),
+    "m": (2, lambda fields: fields[1]),
+    "d": (2, lambda fields: fields[2]),
+    "H": (2, lambda fields: fields[3]),
+    "M": (2, lambda fields: fields[4]),
+    "S": (2, lambda fields: fields[5]),
+}
+
+
+def _format_datetime_batch(start: datetime, period_seconds: int, size: int, formatter: str) -> Optional[List[str]]:
+    """
+    Calculate and format *size* datetime values from *start* with period *period_seconds* by array arithmetic
+    of *numpy.datetime64*. Every character of the values is calculated as a column of code points, and then
+    the whole array is viewed as strings. So it doesn't format the values one by one.
+
+    :param start: The first datetime value.
+    :param period_seconds: The period in seconds.
+    :param size: How many values it calculates.
+    :param formatter: The output format. It only supports directives %Y, %m, %d, %H, %M and %S.
+    :return: A list of formatted values. It returns None if the format or the year isn't supported.
+    """
+
+    # Parse the formatter to be a list of tagged tokens: ("directive", "Y") or ("literal", "-").
+    _tokens: List[Tuple[str, str]] = []
+    _index = 0
+    while _index < len(formatter):
+        if formatter[_index] == "%":
+            if _index + 1 >= len(formatter) or formatter[_index + 1] not in _Datetime_Directives:
+                return None
+            _tokens.append(("directive", formatter[_index + 1]))
+            _index += 2
+        else:
+            _tokens.append(("literal", formatter[_index]))
+            _index += 1
+
+    _datetimes = _numpy.datetime64(start, "s") + _numpy.arange(size, dtype="int64") * _numpy.timedelta64(period_seconds, "s")
+    _years = _datetimes.astype("datetime64[Y]").astype("int64") + 1970
+    if _years.min() < 1000 or _years.max() > 9999:
+        return None
+    _months = _datetimes.astype("datetime64[M]")
+    _days = _datetimes.astype("datetime64[D]")
+    _seconds_of_day = (_datetimes - _days).astype("int64")
+    _fields = (
+        _years,
+        _months.astype("int64") % 12 + 1,
+        (_days - _months).astype("int64") + 1,
+        _seconds_of_day // 3600,
+        _seconds_of_day // 60 % 60,
+        _seconds_of_day % 60,
+    )
+
+    _width = sum(_Datetime_Directives[_text][0] if _kind == "directive" else 1 for _kind, _text in _tokens)
+    _chars = _numpy.empty((size, _width), dtype=_numpy.uint32)
+    _column = 0
+    for _kind, _text in _tokens:
+        if _kind == "directive":
+            _digits, _get_field = _Datetime_Directives[_text]
+            _field = _get_field(_fields)
+            for _digit in range(_digits):
+                _chars[:, _column] = _field // (10 ** (_digits - _digit - 1)) % 10 + ord("0")
+                _column += 1
+        else:
+            _chars[:, _column] = ord(_text)
+            _column += 1
+
+    return _chars.view(f"U{_width}").ravel().tolist()
@@ -38,9 +38,9 @@ class AsyncHTTPRequest(AsyncHTTP):
     __Http_Response = None
 
     async def get(self, url: str, *args, **kwargs):
-        async with aiohttp.ClientSession() as _async_sess:
-            _resp = await _async_sess.get(url)
-            return _resp
+        # The session is shared by all the requests in the event loop.
+        _resp = await self.session.get(url)
+        return _resp
 
 
 
@@ -0,0 +1,132 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Set, Tuple
+import threading
+import gzip
+import time
+import sys
+
+
+Local_Example_HTML = b"<html><head><title>Example</title></head><body><h1>Example Domain</h1></body></html>"
+
+
+class _LocalHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.record(self.client_address, self.command, self.path)
+
+        _path, _, _query = self.path.partition("?")
+        _etag = f"\"{_path.split('/')[2]}\"" if _path.startswith("/etag/") else None
+        if _path.startswith("/delay/"):
+            time.sleep(int(_path.split("/")[2]) / 1000)
+        if _path.startswith("/slow-first/") and self.server.hit(self.path) == 1:
+            # Only the first request of the same URL is slow.
+            time.sleep(int(_path.split("/")[2]) / 1000)
+        if _path.startswith("/status/"):
+            _status = int(_path.split("/")[2])
+        elif _path.startswith("/flaky/"):
+            # It responds 503 for the first N requests of the same URL.
+            _status = 503 if self.server.hit(self.path) <= int(_path.split("/")[2]) else 200
+        elif _etag is not None and self.headers.get("If-None-Match") == _etag:
+            # It responds 304 if the client has the current version.
+            _status = 304
+        else:
+            _status = 200
+
+        self.send_response(_status)
+        if _etag is not None:
+            self.send_header("ETag", _etag)
+        if _status == 304:
+            self.end_headers()
+            return
+        if _path.startswith("/bytes/"):
+            # It responds a body of N bytes.
+            _body = b"x" * int(_path.split("/")[2])
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(_body)))
+            self.end_headers()
+            self.wfile.write(_body)
+            return
+        if _path.startswith("/gzip/"):
+            # It responds a body of N bytes which is compressed if the client accepts gzip.
+            _body = b"x" * int(_path.split("/")[2])
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                _body = gzip.compress(_body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(_body)))
+            self.end_headers()
+            self.wfile.write(_body)
+            return
+        if _status == 503 and _query.startswith("retry_after="):
+            self.send_header("Retry-After", _query.split("=")[1])
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(Local_Example_HTML)))
+        self.end_headers()
+        self.wfile.write(Local_Example_HTML)
+
+
+    do_POST = do_PUT = do_DELETE = do_OPTIONS = do_GET
+
+
+    def do_HEAD(self):
+        self.server.record(self.client_address, self.command, self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+    def log_message(self, format, *args):
+        pass
+
+
+
+class LocalHTTPServer(ThreadingHTTPServer):
+
+    """
+    A local HTTP/1.1 server with keep-alive for testing. It records every connection and request.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _LocalHandler)
+        self.connections: Set[Tuple[str, int]] = set()
+        self.requests: List[Tuple[str, str]] = []
+        self.hits: Dict[str, int] = {}
+        self._record_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+    def record(self, client_address: Tuple[str, int], method: str, path: str) -> None:
+        with self._record_lock:
+            self.connections.add(client_address)
+            self.requests.append((method, path))
+
+
+    def hit(self, path: str) -> int:
+        with self._record_lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            return self.hits[path]
+
+
+    def handle_error(self, request, client_address):
+        # The client may close the connection before the response is written, e.g., the cancelled hedged request.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        self.server_close()
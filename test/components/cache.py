@@ -0,0 +1,172 @@
+from smoothcrawler.components.cache import ResponseCache, DiskResponseCache
+from smoothcrawler.components.response import ResponseSnapshot, CachedResponse, AsyncCachedResponse, iter_chunks, aiter_chunks
+import multiprocessing
+import threading
+import tempfile
+import os
+import asyncio
+import time
+
+
+TEST_URL = "https://www.example.com/index"
+
+
+def _snapshot(url: str = TEST_URL, body: bytes = b"{\"data\": 1}", headers: tuple = ()) -> ResponseSnapshot:
+    return ResponseSnapshot(url=url, status=200, headers=(("Content-Type", "application/json; charset=utf-8"),) + headers, body=body)
+
+
+def _store_in_process(cache: DiskResponseCache, url: str) -> None:
+    cache.set(_snapshot(url=url, headers=(("ETag", "\"v1\""),)))
+
+
+
+class TestResponseCache:
+
+    def test_get_and_set(self):
+        cache = ResponseCache()
+        _key = cache.key("GET", TEST_URL)
+        assert cache.get(_key) is None, "It doesn't have the response yet."
+        cache.set(_key, _snapshot())
+        assert cache.get(_key) == _snapshot(), "It should get the response which has been cached."
+        assert (cache.hits, cache.misses) == (1, 1), "It should count the hits and the misses."
+
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_size=2)
+        for _index in range(2):
+            cache.set(cache.key("GET", f"{TEST_URL}?index={_index}"), _snapshot())
+        cache.get(cache.key("GET", f"{TEST_URL}?index=0"))
+        cache.set(cache.key("GET", f"{TEST_URL}?index=2"), _snapshot())
+        assert len(cache) == 2 and cache.evictions == 1, "It should evict a response if it's full."
+        assert cache.get(cache.key("GET", f"{TEST_URL}?index=1")) is None, "It should evict the least recently used response."
+        assert cache.get(cache.key("GET", f"{TEST_URL}?index=0")) is not None, "It should keep the recently used response."
+
+
+    def test_ttl(self):
+        cache = ResponseCache(ttl=0.05)
+        _key = cache.key("GET", TEST_URL)
+        cache.set(_key, _snapshot())
+        assert cache.get(_key) is not None, "The response hasn't expired."
+        time.sleep(0.06)
+        assert cache.get(_key) is None, "The response has expired."
+        assert len(cache) == 0, "It should remove the expired response."
+
+
+    def test_key_with_headers(self):
+        cache = ResponseCache(headers=["Accept-Language"])
+        assert cache.key("GET", TEST_URL, {"accept-language": "zh-TW"}) == cache.key("GET", TEST_URL, {"Accept-Language": "zh-TW"}), \
+            "The names of headers should be case-insensitive."
+        assert cache.key("GET", TEST_URL, {"Accept-Language": "zh-TW"}) != cache.key("GET", TEST_URL, {"Accept-Language": "en"}), \
+            "The requests with different values of the selected headers should be cached separately."
+        assert cache.key("GET", TEST_URL, {"Accept-Language": "en", "Cookie": "a"}) == cache.key("GET", TEST_URL, {"Accept-Language": "en"}), \
+            "The other headers shouldn't be part of the key."
+
+
+    def test_threads(self):
+        cache = ResponseCache(max_size=10)
+
+        def _use_cache(_index: int):
+            for _url_index in range(100):
+                _key = cache.key("GET", f"{TEST_URL}?index={(_index + _url_index) % 20}")
+                if cache.get(_key) is None:
+                    cache.set(_key, _snapshot())
+
+        _threads = [threading.Thread(target=_use_cache, args=(_index,)) for _index in range(8)]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+        assert cache.hits + cache.misses == 800, "It should count every lookup."
+        assert len(cache) == 10, "It shouldn't keep more responses than option *max_size*."
+
+
+    def test_invalid_options(self):
+        for _options in [dict(max_size=0), dict(ttl=0)]:
+            try:
+                ResponseCache(**_options)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
+
+
+
+class TestDiskResponseCache:
+
+    def test_get_and_set(self):
+        with tempfile.TemporaryDirectory() as _path:
+            cache = DiskResponseCache(_path)
+            assert cache.set(_snapshot()) is False, "It shouldn't store the response which doesn't have validators."
+            assert cache.set(_snapshot(headers=(("ETag", "\"v1\""),))) is True, "It should store the response which has header *ETag*."
+            cache.close()
+
+            cache = DiskResponseCache(_path)
+            _stored = cache.get(TEST_URL)
+            assert _stored is not None and _stored.body == b"{\"data\": 1}", "It should keep the response on disk."
+            assert cache.get(TEST_URL, method="HEAD") is None, "The responses of different HTTP methods are stored separately."
+            cache.close()
+
+
+    def test_content_addressed_body(self):
+        with tempfile.TemporaryDirectory() as _path:
+            cache = DiskResponseCache(_path)
+            for _index in range(3):
+                cache.set(_snapshot(url=f"{TEST_URL}?index={_index}", headers=(("ETag", "\"v1\""),)))
+            _bodies = [_file for _directory in os.listdir(os.path.join(_path, "bodies"))
+                       for _file in os.listdir(os.path.join(_path, "bodies", _directory))]
+            assert len(_bodies) == 1, "It should store the same body only once."
+            cache.close()
+
+
+    def test_revalidate(self):
+        with tempfile.TemporaryDirectory() as _path:
+            cache = DiskResponseCache(_path)
+            _stored = _snapshot(headers=(("ETag", "\"v1\""), ("Last-Modified", "Wed, 21 Oct 2015 07:28:00 GMT")))
+            assert DiskResponseCache.conditional_headers(_stored) == \
+                   {"If-None-Match": "\"v1\"", "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}, \
+                "It should send the validators of the stored response."
+            assert cache.revalidate(_stored, 304) is _stored, "It should serve the stored response if it isn't modified."
+            assert cache.revalidate(_stored, 200) is None, "It shouldn't serve the stored response if it has been modified."
+            assert (cache.hits, cache.misses) == (1, 1), "It should count the hits and misses."
+            cache.close()
+
+
+    def test_processes(self):
+        with tempfile.TemporaryDirectory() as _path:
+            cache = DiskResponseCache(_path)
+            _process = multiprocessing.Process(target=_store_in_process, args=(cache, TEST_URL))
+            _process.start()
+            _process.join()
+            assert cache.get(TEST_URL) is not None, "It should share the responses with the other processes."
+            cache.close()
+
+
+
+class TestCachedResponse:
+
+    def test_cached_response(self):
+        response = CachedResponse(_snapshot())
+        assert response.status == response.status_code == 200, "It should have the HTTP status."
+        assert response.headers["content-type"].startswith("application/json"), "The headers should be case-insensitive."
+        assert response.read(2) == b"{\"" and response.read() == b"data\": 1}", "It should read the body like a stream."
+        assert response.data == response.content == b"{\"data\": 1}", "It should have the whole body."
+        assert response.json() == {"data": 1} and response.text == "{\"data\": 1}", "It should decode the body."
+
+
+    def test_async_cached_response(self):
+        response = AsyncCachedResponse(_snapshot())
+
+        async def _read():
+            return await response.read(), await response.text(), await response.json()
+
+        assert asyncio.run(_read()) == (b"{\"data\": 1}", "{\"data\": 1}", {"data": 1}), "It should read the body asynchronously."
+
+
+    def test_iter_chunks(self):
+        assert list(iter_chunks(CachedResponse(_snapshot()), chunk_size=4)) == [b"{\"da", b"ta\":", b" 1}"], \
+            "It should stream the body chunk by chunk."
+
+        async def _chunks():
+            return [_chunk async for _chunk in aiter_chunks(AsyncCachedResponse(_snapshot()), chunk_size=4)]
+
+        assert asyncio.run(_chunks()) == [b"{\"da", b"ta\":", b" 1}"], "It should stream the body chunk by chunk asynchronously."
@@ -0,0 +1,82 @@
+from smoothcrawler.components.circuit import CircuitBreaker, CircuitOpenError
+from smoothcrawler.components.retry import RetryPolicy
+import time
+
+
+TEST_URL = "https://www.example.com/index"
+
+
+class _TestResponse:
+
+    def __init__(self, status: int):
+        self.status = status
+
+
+
+class TestCircuitBreaker:
+
+    def test_open_after_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, cool_down=60)
+        for _ in range(2):
+            assert breaker.allow(TEST_URL) is None, "It should let the requests through before the threshold."
+            breaker.record(TEST_URL, error=ConnectionError())
+        breaker.record(TEST_URL, response=_TestResponse(200))
+        assert breaker.state(TEST_URL) == "closed", "It should only count the consecutive failures."
+
+        for _ in range(3):
+            breaker.record(TEST_URL, error=ConnectionError())
+        _error = breaker.allow(TEST_URL)
+        assert breaker.state(TEST_URL) == "open", "It should open the circuit after the threshold."
+        assert isinstance(_error, CircuitOpenError) and 59 < _error.retry_after <= 60, \
+            "It should fail fast with the seconds until the cool-down ends."
+        assert breaker.allow("https://www.example.org/") is None, "The other hosts should have their own circuits."
+
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, cool_down=0.05)
+        breaker.record(TEST_URL, error=ConnectionError())
+        time.sleep(0.06)
+        assert breaker.allow(TEST_URL) is None, "It should let one probe through after the cool-down."
+        assert isinstance(breaker.allow(TEST_URL), CircuitOpenError), "It should only let one probe through at the same time."
+        breaker.record(TEST_URL, error=ConnectionError())
+        assert breaker.state(TEST_URL) == "open", "It should open the circuit again if the probe fails."
+
+        time.sleep(0.06)
+        assert breaker.allow(TEST_URL) is None, "It should let one probe through after the cool-down."
+        breaker.cancel(TEST_URL)
+        assert breaker.allow(TEST_URL) is None, "The next request should be the probe if the probe is cancelled."
+        breaker.record(TEST_URL, response=_TestResponse(200))
+        assert breaker.state(TEST_URL) == "closed", "It should close the circuit if the probe succeeds."
+
+
+    def test_wait_for_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, cool_down=0.05)
+        retry_policy = RetryPolicy(max_retries=3, backoff=0.01, jitter=False)
+        breaker.record(TEST_URL, error=ConnectionError())
+        time.sleep(0.06)
+        assert breaker.allow(TEST_URL) is None, "It should let one probe through after the cool-down."
+        _error = breaker.allow(TEST_URL)
+        assert isinstance(_error, CircuitOpenError) and _error.retry_after >= 0.05, \
+            "The other requests should wait while the probe is being sent."
+        assert retry_policy.delay(attempt=0, error=_error) >= 0.05, "The retry policy should defer the requests instead of retrying at once."
+
+        breaker.record(TEST_URL, response=_TestResponse(200))
+        time.sleep(_error.retry_after)
+        assert breaker.allow(TEST_URL) is None, "The deferred request should be sent with its first retry after the probe succeeds."
+
+
+    def test_failure_statuses(self):
+        breaker = CircuitBreaker(failure_threshold=2, statuses=[503])
+        breaker.record(TEST_URL, response=_TestResponse(503))
+        breaker.record(TEST_URL, response=_TestResponse(503))
+        assert breaker.state(TEST_URL) == "open", "It should regard the HTTP status of option *statuses* as failures."
+
+
+    def test_invalid_options(self):
+        for _options in [dict(failure_threshold=0), dict(cool_down=-1)]:
+            try:
+                CircuitBreaker(**_options)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
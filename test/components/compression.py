@@ -0,0 +1,46 @@
+from smoothcrawler.components.compression import ByteCounter, accept_encoding, _with_accept_encoding, _response_bytes
+import pickle
+
+
+class _TestResponse:
+
+    def __init__(self, body: bytes, wire_bytes: int):
+        self._body = body
+        self._wire_bytes = wire_bytes
+
+
+    def tell(self) -> int:
+        return self._wire_bytes
+
+
+
+class TestCompression:
+
+    def test_accept_encoding(self):
+        assert {"gzip", "deflate"} <= set(accept_encoding().split(", ")), "It should accept gzip and deflate at least."
+        assert _with_accept_encoding(None) == {"Accept-Encoding": accept_encoding()}, "It should add header *Accept-Encoding*."
+        assert _with_accept_encoding({"accept-encoding": "identity"}) == {"accept-encoding": "identity"}, \
+            "It shouldn't replace header *Accept-Encoding* of the request."
+
+
+    def test_response_bytes(self):
+        assert _response_bytes(_TestResponse(b"x" * 100, 10)) == (10, 100), "It should get the bytes on the wire and the decoded bytes."
+        assert _response_bytes(_TestResponse(None, 10)) is None, "It shouldn't count the body which hasn't been read."
+
+
+
+class TestByteCounter:
+
+    def test_record(self):
+        byte_counter = ByteCounter()
+        assert byte_counter.ratio == 1.0, "The ratio should be 1 if it hasn't received anything."
+        byte_counter.record(wire_bytes=10, decoded_bytes=100)
+        byte_counter.record(wire_bytes=10, decoded_bytes=60)
+        assert (byte_counter.wire_bytes, byte_counter.decoded_bytes, byte_counter.responses) == (20, 160, 2), \
+            "It should sum the sizes of the response bodies."
+        assert byte_counter.ratio == 8.0, "The ratio should be the decoded bytes divided by the bytes on the wire."
+
+        _copied_counter = pickle.loads(pickle.dumps(byte_counter))
+        assert _copied_counter.responses == 0, "Every process should have its own counts."
+        byte_counter.reset()
+        assert (byte_counter.wire_bytes, byte_counter.decoded_bytes, byte_counter.responses) == (0, 0, 0), "It should clear the counts."
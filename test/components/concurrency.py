@@ -0,0 +1,97 @@
+from smoothcrawler.components.concurrency import AIMDController, AsyncAIMDController
+import threading
+import asyncio
+import time
+
+
+WINDOW = 5
+
+
+def _record_window(controller: AIMDController, overloaded: bool = False, latency: float = 0.0) -> None:
+    for _ in range(WINDOW):
+        _started = controller.acquire()
+        controller.release(_started - latency, overloaded=overloaded)
+
+
+
+class TestAIMDController:
+
+    def test_additive_increase(self):
+        controller = AIMDController(initial_limit=2, max_limit=4, window=WINDOW, latency_threshold=1)
+        _record_window(controller)
+        assert controller.limit == 3, "It should increase the limit if the server isn't overloaded."
+        for _ in range(3):
+            _record_window(controller)
+        assert controller.limit == 4, "The limit shouldn't be bigger than option *max_limit*."
+
+
+    def test_multiplicative_decrease(self):
+        controller = AIMDController(initial_limit=8, min_limit=3, window=WINDOW, latency_threshold=1)
+        _record_window(controller, overloaded=True)
+        assert controller.limit == 4, "It should halve the limit if it gets too many errors."
+        _record_window(controller, latency=2)
+        assert controller.limit == 3, "It should decrease the limit if the latency is too high, but not lower than option *min_limit*."
+
+
+    def test_relative_latency(self):
+        controller = AIMDController(initial_limit=4, window=WINDOW)
+        _record_window(controller, latency=0.1)
+        assert controller.limit == 5, "It should regard the lowest latency it has seen as normal."
+        _record_window(controller, latency=0.5)
+        assert controller.limit == 2, "It should decrease the limit if the latency is double of the lowest one."
+
+
+    def test_limit_in_flight(self):
+        controller = AIMDController(initial_limit=2, max_limit=2, window=100)
+        _max_in_flight = 0
+        _lock = threading.Lock()
+
+        def _send():
+            nonlocal _max_in_flight
+            _started = controller.acquire()
+            with _lock:
+                _max_in_flight = max(_max_in_flight, controller.in_flight)
+            time.sleep(0.01)
+            controller.release(_started)
+
+        _threads = [threading.Thread(target=_send) for _ in range(10)]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+        assert _max_in_flight == 2, "It should limit how many requests are being sent at the same time."
+        assert controller.in_flight == 0, "All the requests have been done."
+
+
+    def test_invalid_options(self):
+        for _options in [dict(initial_limit=0), dict(initial_limit=5, max_limit=4), dict(decrease=1), dict(window=0)]:
+            try:
+                AIMDController(**_options)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
+
+
+
+class TestAsyncAIMDController:
+
+    def test_limit_in_flight(self):
+        controller = AsyncAIMDController(initial_limit=2, max_limit=3, window=WINDOW, latency_threshold=1)
+        _in_flight = []
+
+        async def _send(overloaded: bool):
+            _started = await controller.acquire()
+            _in_flight.append(controller.in_flight)
+            await asyncio.sleep(0.01)
+            await controller.release(_started, overloaded=overloaded)
+
+        async def _send_all(overloaded: bool):
+            await asyncio.gather(*[_send(overloaded) for _ in range(WINDOW)])
+
+        asyncio.run(_send_all(overloaded=False))
+        assert max(_in_flight) == 2, "It should limit how many coroutines are sending requests at the same time."
+        assert controller.limit == 3, "It should increase the limit if the server isn't overloaded."
+
+        asyncio.run(_send_all(overloaded=True))
+        assert controller.limit == 1, "It should decrease the limit in a new event loop if the server is overloaded."
@@ -1,4 +1,6 @@
 from smoothcrawler.components.data import BaseHTTPResponseParser, BaseDataHandler, BaseAsyncHTTPResponseParser, BaseAsyncDataHandler, T
+from smoothcrawler.components.data import BaseStreamHTTPResponseParser, BaseAsyncStreamHTTPResponseParser
+from smoothcrawler.components.httpio import PooledHTTP, AsyncHTTP
 
 from abc import ABCMeta, abstractmethod
 from bs4 import BeautifulSoup
@@ -9,6 +11,8 @@ import asyncio
 import aiohttp
 import sys
 
+from .._local_server import LocalHTTPServer
+
 
 Test_URL = "http://www.example.com/"
 
@@ -148,6 +152,35 @@ class _MyExampleAsyncDataHandler(BaseAsyncDataHandler):
 
 
 
+class _MyStreamHTTPResponseParser(BaseStreamHTTPResponseParser):
+
+    def get_status_code(self, response) -> int:
+        return int(response.status)
+
+
+    def handling_200_chunks(self, response, chunks) -> Any:
+        return [len(_chunk) for _chunk in chunks]
+
+
+
+class _MyStreamAsyncHTTPResponseParser(BaseAsyncStreamHTTPResponseParser):
+
+    async def get_status_code(self, response) -> int:
+        return int(response.status)
+
+
+    async def handling_200_chunks(self, response, chunks) -> Any:
+        return [len(_chunk) async for _chunk in chunks]
+
+
+
+class _StreamAsyncHTTP(AsyncHTTP):
+
+    async def get(self, url: str, *args, **kwargs):
+        return await self.session.get(url, *args, **kwargs)
+
+
+
 class BaseHTTPResponseParserTestSpec(metaclass=ABCMeta):
 
     @abstractmethod
@@ -338,3 +371,53 @@ class TestAsyncDataHandler(BaseDataHandleTestSpec):
 
         _run_async_func(_process)
 
+
+
+
+class TestStreamHTTPResponseParser:
+
+    def test_stream_chunks(self):
+        pooled_http = PooledHTTP(pool_size=1)
+        pooled_http.stream = True
+        parser = _MyStreamHTTPResponseParser()
+        parser.chunk_size = 1024
+        with LocalHTTPServer() as server:
+            _chunk_sizes = [parser.parse_content(response=pooled_http.request(url=f"{server.url}/bytes/10000")) for _ in range(2)]
+        assert _chunk_sizes[0] == _chunk_sizes[1], "It should stream the same body."
+        assert sum(_chunk_sizes[0]) == 10000, "It should read the whole body chunk by chunk."
+        assert max(_chunk_sizes[0]) <= 1024 and len(_chunk_sizes[0]) >= 10, "It should read the body in chunks of the chunk size."
+        assert len(server.connections) == 1, "It should release the connection after it reads the whole body."
+
+
+    def test_buffered_response(self):
+        pooled_http = PooledHTTP()
+        parser = _MyStreamHTTPResponseParser()
+        parser.chunk_size = 4096
+        with LocalHTTPServer() as server:
+            _chunk_sizes = parser.parse_content(response=pooled_http.request(url=f"{server.url}/bytes/10000"))
+        assert _chunk_sizes == [4096, 4096, 1808], "It should also split the body which has been read."
+
+        try:
+            parser.chunk_size = 0
+        except ValueError:
+            assert True, "It should raise ValueError if the chunk size isn't bigger than 0."
+        else:
+            assert False, "It should raise ValueError if the chunk size isn't bigger than 0."
+
+
+    def test_async_stream_chunks(self):
+        async_http = _StreamAsyncHTTP()
+        async_http.stream = True
+        parser = _MyStreamAsyncHTTPResponseParser()
+        parser.chunk_size = 1024
+
+        async def _process(url):
+            await async_http.open()
+            try:
+                return await parser.parse_content(response=await async_http.request(url=url))
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            _chunk_sizes = asyncio.run(_process(f"{server.url}/bytes/10000"))
+        assert sum(_chunk_sizes) == 10000 and max(_chunk_sizes) <= 1024, "It should read the body in chunks of the chunk size."
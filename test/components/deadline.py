@@ -0,0 +1,87 @@
+from smoothcrawler.components.deadline import Timeouts, Deadline, DeadlineExceededError, deadline_scope, check_deadline, _socket_timeouts, _in_current_context, _ThreadLocalVar
+from smoothcrawler.components import deadline as _deadline_module
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+
+class TestDeadline:
+
+    def test_remaining(self):
+        deadline = Deadline(0.2)
+        assert 0 < deadline.remaining() <= 0.2 and deadline.expired() is False, "It should have the seconds until the deadline."
+        assert deadline.cap(10) <= 0.2 and deadline.cap(None) <= 0.2, "It should cap the timeout by the remaining seconds."
+        assert deadline.cap(0.1) == 0.1, "It should keep the timeout which is shorter than the remaining seconds."
+        time.sleep(0.25)
+        assert deadline.remaining() == 0 and deadline.expired() is True, "The deadline should have been exceeded."
+
+        try:
+            deadline.check("parsing the HTTP response")
+        except DeadlineExceededError as e:
+            assert isinstance(e, TimeoutError) and e.step == "parsing the HTTP response", "It should raise the error with the step."
+        else:
+            assert False, "It should raise **DeadlineExceededError** if the deadline has been exceeded."
+
+
+    def test_deadline_scope(self):
+        assert Deadline.current() is None, "There isn't any deadline in default."
+        with deadline_scope(None) as _deadline:
+            assert _deadline is None and Deadline.current() is None, "It shouldn't change anything with None."
+
+        with deadline_scope(10) as _job_deadline:
+            assert Deadline.current() is _job_deadline, "It should keep the deadline of the block."
+            with deadline_scope(60) as _url_deadline:
+                assert _url_deadline is _job_deadline, "It should keep the earlier deadline."
+            with deadline_scope(0.05) as _url_deadline:
+                assert Deadline.current() is _url_deadline, "The earlier deadline should cap the outer one."
+                time.sleep(0.1)
+                try:
+                    check_deadline("the data process")
+                except DeadlineExceededError:
+                    assert True, "It should raise **DeadlineExceededError** if the deadline has been exceeded."
+                else:
+                    assert False, "It should raise **DeadlineExceededError** if the deadline has been exceeded."
+            assert Deadline.current() is _job_deadline, "It should restore the outer deadline after the block."
+        assert Deadline.current() is None, "It should restore the deadline after the block."
+
+
+    def test_socket_timeouts(self):
+        timeouts = Timeouts(connect=3, read=10)
+        assert _socket_timeouts(timeouts) == (3, 10), "It should use the timeouts if there isn't any deadline."
+        assert _socket_timeouts(None) == (None, None), "It shouldn't have any timeout in default."
+        with deadline_scope(5):
+            _connect, _read = _socket_timeouts(timeouts)
+            assert _connect == 3 and _read <= 5, "The timeouts should be capped by the deadline."
+            assert _socket_timeouts(None)[1] <= 5, "The deadline should be the timeout if there isn't any other timeout."
+
+
+    def test_in_current_context(self, monkeypatch):
+        with deadline_scope(10) as _deadline, ThreadPoolExecutor(max_workers=1) as _executor:
+            assert _executor.submit(_in_current_context(Deadline.current)).result() is _deadline, \
+                "The function should run with the deadline in the other thread."
+
+        # Python 3.6 doesn't have *contextvars*.
+        monkeypatch.setattr(_deadline_module, "copy_context", None)
+        monkeypatch.setattr(_deadline_module, "_Current_Deadline", _ThreadLocalVar("smoothcrawler_deadline", default=None))
+        with deadline_scope(10) as _deadline, ThreadPoolExecutor(max_workers=1) as _executor:
+            assert _executor.submit(Deadline.current).result() is None, "Every thread should have its own deadline without *contextvars*."
+            assert _executor.submit(_in_current_context(Deadline.current)).result() is _deadline, \
+                "The function should run with the deadline in the other thread without *contextvars*."
+            assert _executor.submit(Deadline.current).result() is None, "It should restore the deadline of the other thread."
+        assert Deadline.current() is None, "It should restore the deadline after the block without *contextvars*."
+
+
+    def test_invalid_options(self):
+        for _options in [dict(connect=0), dict(read=-1), dict(total=0)]:
+            try:
+                Timeouts(**_options)
+            except ValueError:
+                assert True, "It should raise ValueError if the timeouts are invalid."
+            else:
+                assert False, "It should raise ValueError if the timeouts are invalid."
+
+        try:
+            Deadline(0)
+        except ValueError:
+            assert True, "It should raise ValueError if the seconds of deadline isn't bigger than 0."
+        else:
+            assert False, "It should raise ValueError if the seconds of deadline isn't bigger than 0."
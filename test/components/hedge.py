@@ -0,0 +1,37 @@
+from smoothcrawler.components.hedge import HedgePolicy
+import pickle
+
+
+class TestHedgePolicy:
+
+    def test_delay(self):
+        hedge_policy = HedgePolicy(percentile=0.9, initial_delay=0.5, window=10, min_samples=5)
+        assert hedge_policy.delay() == 0.5, "It should use option *initial_delay* before it has enough latencies."
+        for _latency in range(1, 11):
+            hedge_policy.record(_latency / 10)
+        assert hedge_policy.delay() == 0.9, "It should wait for the latency percentile of the recent requests."
+        for _ in range(10):
+            hedge_policy.record(0.1)
+        assert hedge_policy.delay() == 0.1, "It should only keep the latencies of the recent requests."
+
+
+    def test_min_delay(self):
+        hedge_policy = HedgePolicy(initial_delay=0, min_delay=0.2)
+        assert hedge_policy.delay() == 0.2, "It shouldn't wait shorter than option *min_delay*."
+
+
+    def test_submit(self):
+        hedge_policy = HedgePolicy(max_workers=2)
+        assert hedge_policy.submit(lambda _value: _value * 2, 21).result() == 42, "It should run the function with its threads."
+        _copied_policy = pickle.loads(pickle.dumps(hedge_policy))
+        assert _copied_policy.submit(lambda: "run").result() == "run", "It should create its own threads after being pickled."
+
+
+    def test_invalid_options(self):
+        for _options in [dict(percentile=1), dict(initial_delay=-1), dict(window=5, min_samples=10), dict(max_workers=0)]:
+            try:
+                HedgePolicy(**_options)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
@@ -1,11 +1,25 @@
-from smoothcrawler.components.httpio import HTTP
+from smoothcrawler.components.httpio import HTTP, AsyncHTTP, PooledHTTP, HTTPMethod
+from smoothcrawler.components.ratelimit import TokenBucketRateLimiter, AsyncTokenBucketRateLimiter
+from smoothcrawler.components.concurrency import AIMDController, AsyncAIMDController
+from smoothcrawler.components.cache import ResponseCache, DiskResponseCache
+from smoothcrawler.components.circuit import CircuitBreaker, CircuitOpenError
+from smoothcrawler.components.hedge import HedgePolicy
+from smoothcrawler.components.deadline import Timeouts, DeadlineExceededError, deadline_scope
+from smoothcrawler.components.compression import ByteCounter
+from multirunnable.api._retry import _RetryTimeoutError
 from abc import ABCMeta, abstractmethod
 import urllib3
+import threading
+import asyncio
+import tempfile
 import logging
 import random
+import time
 import pytest
 import http
 
+from .._local_server import LocalHTTPServer
+
 
 HTTP_METHOD = "GET"
 TEST_URL = "https://www.google.com"
@@ -731,3 +745,682 @@ class TestHttp(BaseHttpTestSpec):
         else:
             return False
 
+
+
+
+class TestPooledHttp:
+
+    def test_keep_alive(self):
+        with LocalHTTPServer() as server:
+            pooled_http = PooledHTTP(pool_size=1)
+            pooled_http.open()
+            for _index in range(5):
+                response = pooled_http.request(url=f"{server.url}/?index={_index}")
+                assert response.status == 200, "It should get the HTTP response successfully."
+            pooled_http.close()
+            assert len(server.requests) == 5, "It should send all the HTTP requests."
+            assert len(server.connections) == 1, "It should reuse the connection which is kept alive."
+
+
+    def test_methods(self):
+        with LocalHTTPServer() as server:
+            pooled_http = PooledHTTP()
+            for _method in ["GET", "POST", "PUT", "DELETE", "HEAD", "OPTION"]:
+                pooled_http.request(url=server.url, method=_method)
+            assert [_request[0] for _request in server.requests] == ["GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS"], \
+                "It should send HTTP request with the HTTP method."
+
+
+    def test_request_many(self):
+        pooled_http = PooledHTTP(pool_size=1)
+        with LocalHTTPServer() as server:
+            _requests = [("GET", f"{server.url}/?index={_index}", None) for _index in range(5)] + [("POST", server.url, {"body": b"data"})]
+            _results = list(pooled_http.request_many(iter(_requests)))
+        assert [_request for _request, _ in _results] == _requests, "It should send the requests one by one in default."
+        assert all(_response.status == 200 for _, _response in _results), "It should get all the responses."
+        assert [_request[0] for _request in server.requests] == ["GET"] * 5 + ["POST"], "It should send the requests with their HTTP methods."
+        assert len(server.connections) == 1, "All the requests should share the connection pool."
+        assert pooled_http._pool_managers == {}, "It should close the pools after the batch."
+
+
+    def test_request_many_as_completed(self):
+        pooled_http = PooledHTTP()
+        with LocalHTTPServer() as server:
+            _urls = [f"{server.url}/delay/{_delay}" for _delay in (300, 10, 100)]
+            _results = list(pooled_http.request_many([("GET", _url, None) for _url in _urls], concurrency=3))
+        assert [_request[1] for _request, _ in _results] == [_urls[1], _urls[2], _urls[0]], "It should return the responses as they complete."
+
+        try:
+            list(pooled_http.request_many([], concurrency=0))
+        except ValueError:
+            assert True, "It should raise ValueError if the concurrency isn't bigger than 0."
+        else:
+            assert False, "It should raise ValueError if the concurrency isn't bigger than 0."
+
+
+    def test_request_many_break_early(self):
+        pooled_http = PooledHTTP()
+        with LocalHTTPServer() as server:
+            _urls = [f"{server.url}/delay/{_delay}" for _delay in (0, 300, 300)]
+            with pooled_http.request_many([("GET", _url, None) for _url in _urls], concurrency=2) as _responses:
+                for _request, _response in _responses:
+                    break
+            assert _responses.closed is True, "It should close the batch when it exits the block."
+            assert pooled_http._pool_managers == {}, "It should close the pools even if it stops iterating early."
+            assert list(_responses) == [], "It shouldn't iterate any response after it's closed."
+        assert len(server.requests) <= 2, "It shouldn't send the requests after it's closed."
+
+
+    def test_hedge_policy(self):
+        pooled_http = PooledHTTP()
+        pooled_http.hedge_policy = HedgePolicy(initial_delay=0.05)
+        with LocalHTTPServer() as server:
+            _started = time.monotonic()
+            response = pooled_http.request(url=f"{server.url}/slow-first/1000")
+            _elapsed = time.monotonic() - _started
+            pooled_http.request(url=server.url, method="POST")
+            time.sleep(1)
+            assert len(server.requests) == 2 + 1, "It should send a duplicate request if it's slow, but never hedge POST."
+        assert response.status == 200 and _elapsed < 0.5, "It should use the response which arrives first."
+        assert pooled_http.hedge_policy.hedges == 1, "It should count the duplicate requests."
+
+        try:
+            pooled_http.hedge_policy = object()
+        except TypeError:
+            assert True, "It should raise TypeError if it isn't a **HedgePolicy** object."
+        else:
+            assert False, "It should raise TypeError if it isn't a **HedgePolicy** object."
+
+
+    def test_timeouts(self):
+        pooled_http = PooledHTTP(retries=False)
+        pooled_http.timeouts = Timeouts(connect=1, read=0.1)
+        with LocalHTTPServer() as server:
+            try:
+                pooled_http.request(url=f"{server.url}/delay/1000")
+            except urllib3.exceptions.ReadTimeoutError:
+                assert True, "It should pass the read timeout to urllib3."
+            else:
+                assert False, "It should pass the read timeout to urllib3."
+
+            pooled_http.timeouts = None
+            _started = time.monotonic()
+            with deadline_scope(0.2):
+                try:
+                    pooled_http.request(url=f"{server.url}/delay/1000")
+                except urllib3.exceptions.ReadTimeoutError:
+                    assert time.monotonic() - _started < 0.5, "The read timeout should be capped by the deadline."
+                else:
+                    assert False, "The read timeout should be capped by the deadline."
+
+        try:
+            pooled_http.timeouts = 10
+        except TypeError:
+            assert True, "It should raise TypeError if it isn't a **Timeouts** object."
+        else:
+            assert False, "It should raise TypeError if it isn't a **Timeouts** object."
+
+
+    def test_compression(self):
+        pooled_http = PooledHTTP()
+        pooled_http.byte_counter = ByteCounter()
+        with LocalHTTPServer() as server:
+            response = pooled_http.request(url=f"{server.url}/gzip/100000")
+            assert response.headers["Content-Encoding"] == "gzip", "It should accept the compressed HTTP response."
+            assert response.data == b"x" * 100000, "It should decode the body before it's parsed."
+            assert pooled_http.byte_counter.decoded_bytes == 100000, "It should count the decoded bytes."
+            assert pooled_http.byte_counter.wire_bytes * 10 < 100000, "It should count the compressed bytes on the wire."
+
+            pooled_http.byte_counter.reset()
+            response = pooled_http.request(url=f"{server.url}/gzip/1000", headers={"accept-encoding": "identity"})
+            assert "Content-Encoding" not in response.headers, "It shouldn't replace header *Accept-Encoding* of the request."
+            assert pooled_http.byte_counter.wire_bytes == pooled_http.byte_counter.decoded_bytes == 1000, \
+                "The bytes on the wire should be the decoded bytes if it isn't compressed."
+
+        try:
+            pooled_http.byte_counter = object()
+        except TypeError:
+            assert True, "It should raise TypeError if it isn't a **ByteCounter** object."
+        else:
+            assert False, "It should raise TypeError if it isn't a **ByteCounter** object."
+
+
+    def test_pool_sizes(self):
+        pooled_http = PooledHTTP(pool_size=2, pool_sizes={"www.example.com": 20})
+        assert pooled_http._get_pool_manager("https://www.example.com/").connection_pool_kw["maxsize"] == 20, \
+            "The host should use its own pool size."
+        assert pooled_http._get_pool_manager("https://www.example.org/").connection_pool_kw["maxsize"] == 2, \
+            "The other hosts should use the default pool size."
+
+        try:
+            PooledHTTP(pool_size=0)
+        except ValueError:
+            assert True, "It should raise ValueError if the pool size isn't bigger than 0."
+        else:
+            assert False, "It should raise ValueError if the pool size isn't bigger than 0."
+
+
+    def test_open_and_close(self):
+        pooled_http = PooledHTTP()
+        pooled_http.open()
+        pooled_http.open()
+        pool_manager = pooled_http._get_pool_manager("https://www.example.com/")
+        pooled_http.close()
+        assert pooled_http._get_pool_manager("https://www.example.com/") is pool_manager, \
+            "It should keep the pools until the last worker closes it."
+        pooled_http.close()
+        assert pooled_http._pool_managers == {}, "It should clear the pools after the last worker closes it."
+
+
+
+class _TestSessionAsyncHTTP(AsyncHTTP):
+
+    async def get(self, url: str, *args, **kwargs):
+        _response = await self.session.get(url, *args, **kwargs)
+        await _response.read()
+        return _response
+
+
+
+class _TestUnreadAsyncHTTP(AsyncHTTP):
+
+    async def get(self, url: str, *args, **kwargs):
+        return await self.session.get(url, *args, **kwargs)
+
+
+
+class TestAsyncHttpSession:
+
+    def test_session_per_event_loop(self):
+        async_http = _TestSessionAsyncHTTP(limit_per_host=2)
+
+        async def _crawl(urls):
+            await async_http.open()
+            try:
+                _session = async_http.session
+                _responses = await asyncio.gather(*[async_http.get(_url) for _url in urls])
+                assert async_http.session is _session, "It should use the same session in the event loop."
+                assert _session.connector.limit_per_host == 2, "It should limit the connections per host."
+                return _session, _responses
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            session, responses = asyncio.run(_crawl([f"{server.url}/?index={_index}" for _index in range(10)]))
+            assert [_response.status for _response in responses] == [200] * 10, "It should get the HTTP responses successfully."
+            assert len(server.connections) <= 2, "It should reuse the connections in the limit per host."
+            assert session.closed, "It should close the session after the last worker closes it."
+
+            other_session, _ = asyncio.run(_crawl([server.url]))
+            assert other_session is not session, "Every event loop should have its own session."
+
+
+    def test_open_and_close(self):
+        async_http = _TestSessionAsyncHTTP()
+
+        async def _open_and_close():
+            await async_http.open()
+            await async_http.open()
+            _session = async_http.session
+            await async_http.close()
+            assert not _session.closed and async_http.session is _session, "It should keep the session until the last worker closes it."
+            await async_http.close()
+            assert _session.closed, "It should close the session after the last worker closes it."
+
+        asyncio.run(_open_and_close())
+
+
+    def test_request(self):
+        async_http = _TestSessionAsyncHTTP()
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                return await async_http.request(url=url, method="GET")
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            response = asyncio.run(_request(server.url))
+            assert response.status == 200, "It should send HTTP request via the retry pipeline of AsyncHTTP."
+
+
+    def test_response_cache(self):
+        async_http = _TestSessionAsyncHTTP()
+        async_http.response_cache = ResponseCache()
+        async_http.coalesce_requests = True
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                return await asyncio.gather(*[async_http.request(url=url) for _ in range(3)])
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            asyncio.run(_request(server.url))
+            responses = asyncio.run(_request(server.url))
+            assert len(server.requests) == 1, "It should coalesce the concurrent requests and serve the responses from the cache in the other event loop."
+        assert all(asyncio.run(_response.text()).startswith("<html>") for _response in responses), "It should keep the body of the response."
+        assert async_http.response_cache.hits >= 3, "It should count the hits."
+
+
+    def test_disk_cache(self):
+        async_http = _TestSessionAsyncHTTP()
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                return await async_http.request(url=url)
+            finally:
+                await async_http.close()
+
+        with tempfile.TemporaryDirectory() as _path:
+            async_http.disk_cache = DiskResponseCache(_path)
+            with LocalHTTPServer() as server:
+                asyncio.run(_request(f"{server.url}/etag/v1"))
+                response = asyncio.run(_request(f"{server.url}/etag/v1"))
+            async_http.disk_cache.close()
+        assert response.status == 200 and asyncio.run(response.text()).startswith("<html>"), "It should serve the response 304 as 200."
+        assert async_http.disk_cache.hits == 1, "It should count the response 304."
+
+
+    def test_request_many(self):
+        async_http = _TestSessionAsyncHTTP()
+
+        async def _requests(urls):
+            for _url in urls:
+                yield "GET", _url, None
+
+        async def _request_many(urls):
+            return [_request[1] async for _request, _response in async_http.request_many(_requests(urls), concurrency=3)]
+
+        with LocalHTTPServer() as server:
+            _urls = [f"{server.url}/delay/{_delay}" for _delay in (300, 10, 100, 0)]
+            _completed_urls = asyncio.run(_request_many(_urls))
+            assert len(server.connections) <= 3, "All the requests should share the session."
+        assert _completed_urls == [_urls[1], _urls[3], _urls[2], _urls[0]], "It should return the responses as they complete."
+
+
+    def test_request_many_break_early(self):
+        async_http = _TestSessionAsyncHTTP()
+
+        async def _request_first(urls):
+            async with async_http.request_many([("GET", _url, None) for _url in urls], concurrency=2) as _responses:
+                async for _request, _response in _responses:
+                    break
+            return _responses
+
+        with LocalHTTPServer() as server:
+            _responses = asyncio.run(_request_first([f"{server.url}/delay/{_delay}" for _delay in (0, 300, 300)]))
+        assert _responses.closed is True, "It should close the batch when it exits the block."
+        assert not async_http._Sessions, "It should close the session even if it stops iterating early."
+
+
+    def test_hedge_policy(self):
+        async_http = _TestSessionAsyncHTTP()
+        async_http.hedge_policy = HedgePolicy(initial_delay=0.05)
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                _started = time.monotonic()
+                return await async_http.request(url=url), time.monotonic() - _started
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            response, _elapsed = asyncio.run(_request(f"{server.url}/slow-first/1000"))
+            assert len(server.requests) == 2, "It should send a duplicate request if it's slow."
+        assert response.status == 200 and _elapsed < 0.5, "It should use the response which arrives first and cancel the other one."
+
+
+    def test_timeouts(self):
+        async_http = _TestSessionAsyncHTTP()
+        async_http.timeouts = Timeouts(connect=1, read=5, total=0.2)
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                assert async_http.session.timeout.sock_read == 5, "The session should use the connect and read timeouts."
+                return await async_http.request(url=url)
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            _started = time.monotonic()
+            try:
+                asyncio.run(_request(f"{server.url}/delay/1000"))
+            except DeadlineExceededError:
+                assert time.monotonic() - _started < 0.5, "It should cancel the HTTP request at the deadline."
+            else:
+                assert False, "It should raise **DeadlineExceededError** if the HTTP request is still being sent at the deadline."
+
+
+    def test_byte_counter(self):
+        async_http = _TestUnreadAsyncHTTP()
+        async_http.byte_counter = ByteCounter()
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                _response = await async_http.request(url=url)
+                return await _response.read()
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            body = asyncio.run(_request(f"{server.url}/gzip/100000"))
+        assert body == b"x" * 100000, "It should decode the body before it's parsed."
+        assert async_http.byte_counter.decoded_bytes == 100000, "It should read the body and count the decoded bytes."
+        assert async_http.byte_counter.wire_bytes * 10 < 100000, "It should count the compressed bytes on the wire."
+
+
+    def test_coalesce_requests(self):
+        async_http = _TestSessionAsyncHTTP()
+        async_http.coalesce_requests = True
+
+        async def _request(url):
+            await async_http.open()
+            try:
+                return await asyncio.gather(*[async_http.request(url=url) for _ in range(5)])
+            finally:
+                await async_http.close()
+
+        with LocalHTTPServer() as server:
+            responses = asyncio.run(_request(f"{server.url}/delay/100"))
+            assert len(server.requests) == 1, "It should only send one of the concurrent duplicate requests."
+            async_http.coalesce_requests = False
+            asyncio.run(_request(f"{server.url}/delay/100"))
+            assert len(server.requests) == 1 + 5, "It should send all the requests if it doesn't coalesce them."
+        _bodies = [asyncio.run(_response.text()) for _response in responses]
+        assert _bodies == [_bodies[0]] * 5 and _bodies[0].startswith("<html>"), "All the requests should get the same body."
+
+
+
+class _TestCountingHTTP(HTTP):
+
+    def __init__(self, fail_times: int = 0):
+        super().__init__()
+        self.fail_times = fail_times
+        self.calls = []
+
+
+    def get(self, url, *args, **kwargs):
+        self.calls.append("get")
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("For testing")
+        return "GET"
+
+
+    def head(self, url, *args, **kwargs):
+        self.calls.append("head")
+        return "HEAD"
+
+
+    def before_request(self, *args, **kwargs):
+        self.calls.append("before")
+
+
+    def request_done(self, result):
+        self.calls.append("done")
+        return result
+
+
+    def request_fail(self, error: Exception):
+        self.calls.append("fail")
+        return error
+
+
+    def request_final(self):
+        self.calls.append("final")
+
+
+
+class _TestRaisingHTTP(_TestCountingHTTP):
+
+    request_fail = HTTP.request_fail
+
+
+
+class _TestSlowRaisingHTTP(_TestRaisingHTTP):
+
+    def get(self, url, *args, **kwargs):
+        time.sleep(0.2)
+        return super().get(url, *args, **kwargs)
+
+
+
+class _TestSlowCountingHTTP(_TestCountingHTTP):
+
+    def get(self, url, *args, **kwargs):
+        time.sleep(0.2)
+        return super().get(url, *args, **kwargs)
+
+
+
+class TestHttpRequestPipeline:
+
+    def test_dispatch_method(self):
+        http_cls = _TestCountingHTTP()
+        assert http_cls.request(url=TEST_URL, method="get") == "GET", "It should match the HTTP method case-insensitively."
+        assert http_cls.request(url=TEST_URL, method="$%#HeAdYou") == "HEAD", "It should match the HTTP method in the string."
+        assert http_cls.request(url=TEST_URL, method=HTTPMethod.HEAD) == "HEAD", "It should accept a member of HTTPMethod."
+
+        response = http_cls.request(url=TEST_URL, method="$%##%NowYouSeeME")
+        assert type(response) is TypeError, "It should return TypeError if the HTTP method is invalid."
+
+
+    def test_retry_hooks(self):
+        http_cls = _TestCountingHTTP(fail_times=1)
+        response = http_cls.request(url=TEST_URL, timeout=2)
+        assert response == "GET", "It should get the response after retrying."
+        assert http_cls.calls == ["before", "get", "fail", "final", "before", "get", "done", "final"], \
+            "It should run the hooks in order in every retry."
+
+        http_cls = _TestCountingHTTP(fail_times=3)
+        response = http_cls.request(url=TEST_URL, timeout=2)
+        assert type(response) is TimeoutError, "It should return TimeoutError if it fails in every retry."
+        assert http_cls.calls.count("final") == 2, "It should retry as many times as option *timeout*."
+
+        try:
+            http_cls.request(url=TEST_URL, timeout=0)
+        except ValueError:
+            assert True, "It should raise ValueError if option *timeout* isn't bigger than 0."
+        else:
+            assert False, "It should raise ValueError if option *timeout* isn't bigger than 0."
+
+
+    def test_retry_timeout(self):
+        http_cls = _TestCountingHTTP(fail_times=3)
+        assert http_cls.request(url=TEST_URL, timeout=2) is _RetryTimeoutError, \
+            "It should return the same timeout error as the retry decorator of *multirunnable* when the retries run out."
+        assert http_cls.calls.count("get") == 2, "It should only retry as many times as option *timeout*."
+
+
+    def test_request_fail_raises(self):
+        http_cls = _TestRaisingHTTP(fail_times=3)
+        try:
+            http_cls.request(url=TEST_URL, timeout=3)
+        except ConnectionError:
+            assert http_cls.calls == ["before", "get", "final"], "It should stop retrying if *request_fail* raises the exception."
+        else:
+            assert False, "It should raise the exception which *request_fail* raises."
+
+
+    def test_rate_limiter(self):
+        http_cls = _TestCountingHTTP()
+        try:
+            http_cls.rate_limiter = AsyncTokenBucketRateLimiter(rate=1)
+        except TypeError:
+            assert True, "It should raise TypeError if the rate limiter isn't for HTTP."
+        else:
+            assert False, "It should raise TypeError if the rate limiter isn't for HTTP."
+
+        http_cls.rate_limiter = TokenBucketRateLimiter(rate=20, burst=1)
+        _start = time.monotonic()
+        for _ in range(3):
+            http_cls.request(url=TEST_URL)
+        assert time.monotonic() - _start >= 2 / 20 * 0.9, "It should wait for the rate limiter before sending request."
+
+
+    def test_concurrency_controller(self):
+        pooled_http = PooledHTTP()
+        try:
+            pooled_http.concurrency_controller = AsyncAIMDController()
+        except TypeError:
+            assert True, "It should raise TypeError if the concurrency controller isn't for HTTP."
+        else:
+            assert False, "It should raise TypeError if the concurrency controller isn't for HTTP."
+
+        pooled_http.concurrency_controller = AIMDController(initial_limit=4, window=5, latency_threshold=1)
+        with LocalHTTPServer() as server:
+            for _ in range(5):
+                response = pooled_http.request(url=f"{server.url}/status/429")
+                assert response.status == 429, "It should get the HTTP response with status 429."
+        assert pooled_http.concurrency_controller.limit == 2, "It should decrease the limit if it gets HTTP status 429."
+        assert pooled_http.concurrency_controller.in_flight == 0, "All the requests have been done."
+
+
+    def test_circuit_breaker(self):
+        counting_http = _TestCountingHTTP(fail_times=10)
+        counting_http.circuit_breaker = CircuitBreaker(failure_threshold=2, cool_down=60)
+        _responses = [counting_http.request(url=f"https://www.example.com/?index={_index}", timeout=1) for _index in range(4)]
+        assert counting_http.calls.count("get") == 2, "It shouldn't send HTTP request after the circuit opens."
+        assert all(isinstance(_response, CircuitOpenError) for _response in _responses[2:]), \
+            "It should fail fast with **CircuitOpenError** if the circuit of the host is open."
+        assert counting_http.circuit_breaker.allow("https://www.example.org/") is None, "The other hosts should keep being sent."
+
+        try:
+            counting_http.circuit_breaker = object()
+        except TypeError:
+            assert True, "It should raise TypeError if it isn't a **CircuitBreaker** object."
+        else:
+            assert False, "It should raise TypeError if it isn't a **CircuitBreaker** object."
+
+
+    def test_total_timeout(self):
+        counting_http = _TestSlowCountingHTTP(fail_times=10)
+        counting_http.timeouts = Timeouts(total=0.5)
+        response = counting_http.request(url=TEST_URL, timeout=10)
+        assert isinstance(response, DeadlineExceededError), "It should return **DeadlineExceededError** if the deadline has been exceeded."
+        assert counting_http.calls.count("get") == 3, "It shouldn't retry after the deadline."
+
+        counting_http = _TestCountingHTTP(fail_times=1)
+        with deadline_scope(60):
+            assert counting_http.request(url=TEST_URL, timeout=2) == "GET", "It should retry before the deadline."
+
+
+    def test_response_cache(self):
+        pooled_http = PooledHTTP()
+        pooled_http.response_cache = ResponseCache(max_size=10)
+        with LocalHTTPServer() as server:
+            responses = [pooled_http.request(url=f"{server.url}/?index={_index % 2}") for _index in range(4)]
+            pooled_http.request(url=server.url, method="POST")
+            pooled_http.request(url=server.url, method="POST")
+        assert [_response.read() for _response in responses] == [responses[0].data] * 4, "It should serve the same body from the cache."
+        assert len(server.requests) == 2 + 2, "It should only send the first request of every URL and never cache POST."
+        assert (pooled_http.response_cache.hits, pooled_http.response_cache.misses) == (2, 2), "It should count the hits and the misses."
+
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as _path:
+            pooled_http = PooledHTTP()
+            pooled_http.disk_cache = DiskResponseCache(_path)
+            with LocalHTTPServer() as server:
+                responses = [pooled_http.request(url=f"{server.url}/etag/v1") for _ in range(2)]
+                pooled_http.request(url=f"{server.url}/etag/v2")
+            pooled_http.disk_cache.close()
+            assert len(server.requests) == 3, "It should revalidate the stored response with the server."
+            assert [_response.status for _response in responses] == [200, 200], "It should serve the response 304 as 200."
+            assert responses[1].data == responses[0].data != b"", "It should serve the stored body."
+            assert (pooled_http.disk_cache.hits, pooled_http.disk_cache.misses) == (1, 0), "It should count the response 304."
+
+            try:
+                pooled_http.disk_cache = ResponseCache()
+            except TypeError:
+                assert True, "It should raise TypeError if it isn't a **DiskResponseCache** object."
+            else:
+                assert False, "It should raise TypeError if it isn't a **DiskResponseCache** object."
+
+
+    def test_coalesce_requests(self):
+        pooled_http = PooledHTTP()
+        pooled_http.coalesce_requests = True
+        _responses = []
+
+        def _request(url):
+            _responses.append(pooled_http.request(url=url))
+
+        with LocalHTTPServer() as server:
+            _threads = [threading.Thread(target=_request, args=(f"{server.url}/delay/200",)) for _ in range(5)]
+            for _thread in _threads:
+                _thread.start()
+            for _thread in _threads:
+                _thread.join()
+            pooled_http.request(url=f"{server.url}/delay/200", method="POST")
+            pooled_http.request(url=f"{server.url}/delay/200", method="POST")
+        assert len(server.requests) == 1 + 2, "It should only send one of the concurrent duplicate requests, but never coalesce POST."
+        assert [_response.data for _response in _responses] == [_responses[0].data] * 5, "All the requests should get the same body."
+
+        try:
+            pooled_http.coalesce_requests = "yes"
+        except TypeError:
+            assert True, "It should raise TypeError if it isn't a bool type value."
+        else:
+            assert False, "It should raise TypeError if it isn't a bool type value."
+
+
+    def test_native_responses_under_contention(self):
+        pooled_http = PooledHTTP()
+        _content_types = []
+
+        def _parse(url):
+            # A parser which uses the API of urllib3 only.
+            _content_types.append(pooled_http.request(url=url).getheader("Content-Type"))
+
+        with LocalHTTPServer() as server:
+            _threads = [threading.Thread(target=_parse, args=(f"{server.url}/delay/200",)) for _ in range(5)]
+            for _thread in _threads:
+                _thread.start()
+            for _thread in _threads:
+                _thread.join()
+        assert len(_content_types) == 5, "It should return the HTTP response objects of urllib3 if it doesn't coalesce the requests in default."
+        assert len(server.requests) == 5, "It shouldn't coalesce the concurrent duplicate requests in default."
+
+        pooled_http.coalesce_requests = True
+        _responses = []
+
+        def _request(url):
+            _responses.append(pooled_http.request(url=url))
+
+        with LocalHTTPServer() as server:
+            _threads = [threading.Thread(target=_request, args=(f"{server.url}/delay/200",)) for _ in range(5)]
+            for _thread in _threads:
+                _thread.start()
+            for _thread in _threads:
+                _thread.join()
+        assert len(server.requests) == 1, "It should only send one of the concurrent duplicate requests."
+        assert [isinstance(_response, urllib3.HTTPResponse) for _response in _responses].count(True) == 1, \
+            "The first request should get the HTTP response object of urllib3 even if the others wait for it."
+
+
+    def test_coalesce_failed_requests(self):
+        raising_http = _TestSlowRaisingHTTP(fail_times=3)
+        raising_http.coalesce_requests = True
+        _errors = []
+
+        def _request():
+            try:
+                raising_http.request(url="https://www.example.com/")
+            except Exception as e:
+                _errors.append(e)
+
+        _threads = [threading.Thread(target=_request) for _ in range(3)]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+        assert len(_errors) == 3, "All the requests should get the exception of the request they wait for."
+        assert raising_http.calls.count("get") == 1, "It should only send one of the concurrent duplicate requests."
@@ -0,0 +1,148 @@
+from smoothcrawler.components.ratelimit import (
+    BaseRateLimiter, TokenBucketRateLimiter, SharedTokenBucketRateLimiter, AsyncTokenBucketRateLimiter
+)
+from abc import ABCMeta, abstractmethod
+import multiprocessing
+import threading
+import pickle
+import asyncio
+import pytest
+import time
+
+
+TEST_URL = "https://www.example.com/index"
+TEST_OTHER_URL = "https://www.example.org/index"
+
+RATE = 20
+BURST = 2
+
+
+def _acquire_urls(rate_limiter: BaseRateLimiter, url: str, times: int) -> None:
+    for _ in range(times):
+        rate_limiter.acquire(url)
+
+
+
+class BaseRateLimiterTestSpec(metaclass=ABCMeta):
+
+    @pytest.fixture
+    @abstractmethod
+    def rate_limiter(self) -> BaseRateLimiter:
+        pass
+
+
+    def test_burst(self, rate_limiter: BaseRateLimiter):
+        _start = time.monotonic()
+        _acquire_urls(rate_limiter, TEST_URL, BURST)
+        assert time.monotonic() - _start < 0.5 / RATE, "It should send the burst requests without waiting."
+
+
+    def test_rate(self, rate_limiter: BaseRateLimiter):
+        _start = time.monotonic()
+        _acquire_urls(rate_limiter, TEST_URL, BURST + 10)
+        _spent = time.monotonic() - _start
+        assert 10 / RATE * 0.9 <= _spent < 10 / RATE * 2, "It should send the requests after the burst at the option *rate*."
+
+
+    def test_per_host(self, rate_limiter: BaseRateLimiter):
+        _acquire_urls(rate_limiter, TEST_URL, BURST)
+        _start = time.monotonic()
+        _acquire_urls(rate_limiter, TEST_OTHER_URL, BURST)
+        assert time.monotonic() - _start < 0.5 / RATE, "Every host should have its own bucket."
+
+
+    def test_pickle(self, rate_limiter: BaseRateLimiter):
+        _copied = pickle.loads(pickle.dumps(rate_limiter))
+        _start = time.monotonic()
+        _acquire_urls(_copied, TEST_URL, BURST + 2)
+        assert time.monotonic() - _start >= 2 / RATE * 0.9, "The pickled copy should still limit the requests."
+
+
+
+class TestTokenBucketRateLimiter(BaseRateLimiterTestSpec):
+
+    @pytest.fixture
+    def rate_limiter(self) -> BaseRateLimiter:
+        return TokenBucketRateLimiter(rate=RATE, burst=BURST)
+
+
+    def test_rates(self):
+        rate_limiter = TokenBucketRateLimiter(rate=RATE, burst=1, rates={"www.example.org": RATE / 5})
+        _start = time.monotonic()
+        _acquire_urls(rate_limiter, TEST_OTHER_URL, 3)
+        assert time.monotonic() - _start >= 2 / (RATE / 5) * 0.9, "The host should have its own requests per second."
+
+
+    def test_threads(self, rate_limiter: BaseRateLimiter):
+        _threads = [threading.Thread(target=_acquire_urls, args=(rate_limiter, TEST_URL, 3)) for _ in range(4)]
+        _start = time.monotonic()
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+        assert time.monotonic() - _start >= (12 - BURST) / RATE * 0.9, "The threads should share the bucket of host."
+
+
+    def test_invalid_options(self):
+        for _rate, _burst, _rates in [(0, 1, None), (1, 0, None), (1, 1, {"www.example.com": 0})]:
+            try:
+                TokenBucketRateLimiter(rate=_rate, burst=_burst, rates=_rates)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
+
+
+
+class TestSharedTokenBucketRateLimiter(BaseRateLimiterTestSpec):
+
+    @pytest.fixture
+    def rate_limiter(self) -> BaseRateLimiter:
+        return SharedTokenBucketRateLimiter(rate=RATE, burst=BURST)
+
+
+    def test_shared_between_processes(self, rate_limiter: BaseRateLimiter):
+        _processes = [multiprocessing.Process(target=_acquire_urls, args=(rate_limiter, TEST_URL, 6)) for _ in range(2)]
+        _start = time.monotonic()
+        for _process in _processes:
+            _process.start()
+        for _process in _processes:
+            _process.join()
+        assert time.monotonic() - _start >= (12 - BURST) / RATE * 0.9, "The processes should share the bucket of host."
+
+
+    def test_shared_with_pickled_copy(self, rate_limiter: BaseRateLimiter):
+        _acquire_urls(pickle.loads(pickle.dumps(rate_limiter)), TEST_URL, BURST)
+        _start = time.monotonic()
+        _acquire_urls(rate_limiter, TEST_URL, 2)
+        assert time.monotonic() - _start >= 2 / RATE * 0.9, "The pickled copy should share the bucket of host."
+
+
+    def test_max_hosts(self):
+        rate_limiter = SharedTokenBucketRateLimiter(rate=RATE, burst=BURST, max_hosts=1)
+        rate_limiter.acquire(TEST_URL)
+        try:
+            rate_limiter.acquire(TEST_OTHER_URL)
+        except ValueError:
+            assert True, "It should raise ValueError if it keeps more hosts than option *max_hosts*."
+        else:
+            assert False, "It should raise ValueError if it keeps more hosts than option *max_hosts*."
+
+
+
+class TestAsyncTokenBucketRateLimiter:
+
+    def test_rate(self):
+        rate_limiter = AsyncTokenBucketRateLimiter(rate=RATE, burst=BURST)
+
+        async def _acquire(url: str):
+            await rate_limiter.acquire(url)
+            return time.monotonic()
+
+        async def _acquire_concurrently():
+            return await asyncio.gather(*[_acquire(TEST_URL) for _ in range(BURST + 10)], _acquire(TEST_OTHER_URL))
+
+        _start = time.monotonic()
+        _done_times = asyncio.run(_acquire_concurrently())
+        assert max(_done_times[:-1]) - _start >= 10 / RATE * 0.9, "It should send the requests after the burst at the option *rate*."
+        assert _done_times[-1] - _start < 0.5 / RATE, "The other host shouldn't wait for the waiting coroutines."
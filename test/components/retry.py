@@ -0,0 +1,77 @@
+from smoothcrawler.components.retry import RetryPolicy, RetryTimerQueue
+from smoothcrawler.components.circuit import CircuitOpenError
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import time
+
+
+class _TestResponse:
+
+    def __init__(self, status: int, headers: dict = None):
+        self.status = status
+        self.headers = headers or {}
+
+
+
+class TestRetryPolicy:
+
+    def test_should_retry(self):
+        retry_policy = RetryPolicy(max_retries=2, statuses=[503], exceptions=(ConnectionError,))
+        assert retry_policy.should_retry(0, response=_TestResponse(503)) is True, "It should retry the retryable HTTP status."
+        assert retry_policy.should_retry(0, response=_TestResponse(404)) is False, "It shouldn't retry the other HTTP status."
+        assert retry_policy.should_retry(1, error=ConnectionResetError()) is True, "It should retry the subclass of retryable exceptions."
+        assert retry_policy.should_retry(1, error=ValueError()) is False, "It shouldn't retry the other exceptions."
+        assert retry_policy.should_retry(2, response=_TestResponse(503)) is False, "It shouldn't retry more than option *max_retries*."
+
+
+    def test_exponential_backoff(self):
+        retry_policy = RetryPolicy(backoff=0.5, multiplier=2, max_backoff=3, jitter=False)
+        assert [retry_policy.delay(_attempt) for _attempt in range(4)] == [0.5, 1, 2, 3], \
+            "The backoff should be multiplied in every retry, but not longer than option *max_backoff*."
+
+        retry_policy = RetryPolicy(backoff=0.5, multiplier=2, jitter=True)
+        assert all(0 <= retry_policy.delay(2) <= 2 for _ in range(100)), "The jitter should be between 0 and the backoff."
+
+
+    def test_retry_after(self):
+        retry_policy = RetryPolicy(backoff=0.5, jitter=False)
+        assert retry_policy.delay(0, response=_TestResponse(429, {"Retry-After": "7"})) == 7, \
+            "It should wait the seconds of header *Retry-After*."
+
+        _date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        assert 25 < retry_policy.delay(0, response=_TestResponse(503, {"Retry-After": _date})) <= 30, \
+            "It should wait until the date of header *Retry-After*."
+
+        assert retry_policy.delay(0, response=_TestResponse(503, {"Retry-After": "soon"})) == 0.5, \
+            "It should use the backoff if the header *Retry-After* is invalid."
+
+        assert retry_policy.delay(0, error=CircuitOpenError("www.example.com", 12)) == 12, \
+            "It should wait until the circuit of the host lets a probe through."
+
+        retry_policy = RetryPolicy(backoff=0.5, jitter=False, respect_retry_after=False)
+        assert retry_policy.delay(0, response=_TestResponse(429, {"Retry-After": "7"})) == 0.5, \
+            "It shouldn't respect the header *Retry-After* if option *respect_retry_after* is False."
+
+
+    def test_invalid_options(self):
+        for _options in [dict(max_retries=-1), dict(backoff=-1), dict(multiplier=0.5)]:
+            try:
+                RetryPolicy(**_options)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
+
+
+
+class TestRetryTimerQueue:
+
+    def test_pop_due(self):
+        timers = RetryTimerQueue()
+        timers.push("https://www.example.com/b", 1, 0.05)
+        timers.push("https://www.example.com/a", 2, 0)
+        assert timers.pop_due() == [("https://www.example.com/a", 2)], "It should only take the URLs which are due."
+        assert 0 < timers.next_delay() <= 0.05, "It should know how long the next URL would be due."
+        time.sleep(timers.next_delay())
+        assert timers.pop_due() == [("https://www.example.com/b", 1)], "It should take the URL after it's due."
+        assert len(timers) == 0 and timers.next_delay() == 0, "The queue should be empty."
@@ -0,0 +1,99 @@
+from smoothcrawler.components.visited import BaseVisitedSet, ExactVisitedSet, BloomVisitedSet
+from smoothcrawler.components.shared import attach_shared_objects
+from abc import ABCMeta, abstractmethod
+import multiprocessing
+import pickle
+import pytest
+
+
+TEST_URLS = [f"https://www.example.com?index={_index}" for _index in range(1000)]
+TEST_OTHER_URLS = [f"https://www.example.org?index={_index}" for _index in range(10000)]
+
+
+def _add_urls(visited_set: BaseVisitedSet, urls: list) -> None:
+    for _url in urls:
+        visited_set.add(_url)
+
+
+
+class BaseVisitedSetTestSpec(metaclass=ABCMeta):
+
+    @pytest.fixture
+    @abstractmethod
+    def visited_set(self) -> BaseVisitedSet:
+        pass
+
+
+    def test_add(self, visited_set: BaseVisitedSet):
+        assert all(visited_set.add(_url) for _url in TEST_URLS), "The URLs haven't been visited before."
+        assert not any(visited_set.add(_url) for _url in TEST_URLS), "The URLs have been visited."
+        assert all(_url in visited_set for _url in TEST_URLS), "The URLs have been visited."
+        assert len(visited_set) == len(TEST_URLS), "It should count the visited URLs."
+
+
+    def test_pickle(self, visited_set: BaseVisitedSet):
+        _add_urls(visited_set, TEST_URLS[:10])
+        _copied_visited_set = pickle.loads(pickle.dumps(visited_set))
+        assert all(_url in _copied_visited_set for _url in TEST_URLS[:10]), "The copy should have the visited URLs."
+        assert _copied_visited_set.add(TEST_URLS[10]) is True, "The copy should could be used to add URLs."
+
+
+
+class TestExactVisitedSet(BaseVisitedSetTestSpec):
+
+    @pytest.fixture
+    def visited_set(self) -> BaseVisitedSet:
+        return ExactVisitedSet()
+
+
+    def test_contains(self, visited_set: BaseVisitedSet):
+        _add_urls(visited_set, TEST_URLS)
+        assert not any(_url in visited_set for _url in TEST_OTHER_URLS), "The exact set doesn't have any false positive."
+
+
+
+class TestBloomVisitedSet(BaseVisitedSetTestSpec):
+
+    @pytest.fixture
+    def visited_set(self) -> BaseVisitedSet:
+        # Much lower filling than the capacity, so it almost doesn't have any false positive.
+        return BloomVisitedSet(capacity=len(TEST_URLS) * 10, error_rate=0.0001)
+
+
+    def test_false_positive_rate(self):
+        visited_set = BloomVisitedSet(capacity=len(TEST_URLS), error_rate=0.01)
+        _add_urls(visited_set, TEST_URLS)
+        _false_positive_rate = sum(_url in visited_set for _url in TEST_OTHER_URLS) / len(TEST_OTHER_URLS)
+        assert _false_positive_rate < visited_set.error_rate * 2, "The false positive rate should be about the option *error_rate*."
+
+
+    def test_memory_size(self):
+        _small_visited_set = BloomVisitedSet(capacity=10000, error_rate=0.01)
+        _large_visited_set = BloomVisitedSet(capacity=10000, error_rate=0.0001)
+        assert _small_visited_set.size < _large_visited_set.size, "The lower false positive rate it has, the more memory it needs."
+        assert _large_visited_set.size < 10000 * 3, "It should only need several bytes for every URL."
+
+
+    def test_shared_between_processes(self, visited_set: BloomVisitedSet):
+        _process = multiprocessing.Process(target=_add_urls, args=(visited_set, TEST_URLS))
+        _process.start()
+        _process.join()
+        assert all(_url in visited_set for _url in TEST_URLS), "It should see the URLs which are added by the other process."
+        assert len(visited_set) > 0, "It should see the count of the other process."
+
+
+    def test_shared_with_pool(self, visited_set: BloomVisitedSet):
+        with multiprocessing.Pool(processes=1, initializer=attach_shared_objects, initargs=(visited_set,)) as _pool:
+            _pool.apply(_add_urls, (visited_set, TEST_URLS))
+        assert all(_url in visited_set for _url in TEST_URLS), "It should see the URLs which are added by the process of pool."
+        assert len(visited_set) == len(TEST_URLS), "It should see the count of the process of pool."
+
+
+    def test_invalid_options(self):
+        for _capacity, _error_rate in [(0, 0.01), (100, 0), (100, 1)]:
+            try:
+                BloomVisitedSet(capacity=_capacity, error_rate=_error_rate)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
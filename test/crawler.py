@@ -1,17 +1,28 @@
 from abc import ABCMeta, abstractmethod
 from typing import TypeVar
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
 import pytest
+import time
+import os
 
 from smoothcrawler.crawler import (
     BaseCrawler,
+    MultiRunnableCrawler,
     SimpleCrawler,
     AsyncSimpleCrawler,
     ExecutorCrawler,
     PoolCrawler,
-    RunAsConcurrent, RunAsCoroutine)
-from smoothcrawler.urls import URL
+    RunAsParallel, RunAsConcurrent, RunAsCoroutine)
+from smoothcrawler.urls import URL, URLFrontier
+from smoothcrawler.components.visited import ExactVisitedSet, BloomVisitedSet
+from smoothcrawler.components.retry import RetryPolicy
+from smoothcrawler.components.ratelimit import TokenBucketRateLimiter, SharedTokenBucketRateLimiter
+from smoothcrawler.components.deadline import DeadlineExceededError, deadline_scope
 from smoothcrawler.factory import CrawlerFactory, AsyncCrawlerFactory
 
+from smoothcrawler.components.httpio import PooledHTTP, AsyncHTTP
+from ._local_server import LocalHTTPServer
 from ._components import (
     Urllib3HTTPRequest, RequestsHTTPRequest, AsyncHTTPRequest,
     Urllib3HTTPResponseParser, RequestsHTTPResponseParser, AsyncHTTPResponseParser,
@@ -57,6 +68,383 @@ class BaseCrawlerTestSpec(metaclass=ABCMeta):
 
 
 
+class TestMultiRunnableCrawler:
+
+    def test_divide_urls(self):
+        _urls = [f"{Test_Example_URL}?index={i}" for i in range(11)]
+        _urls_collection = MultiRunnableCrawler._divide_urls(urls=_urls, executor_number=3)
+        assert len(_urls_collection) == 3, "It should divide the URLs to be the same amount as the executor number."
+        assert [_url for _urls_chunk in _urls_collection for _url in _urls_chunk] == _urls, "It should keep all the URLs in order."
+        assert max(map(len, _urls_collection)) - min(map(len, _urls_collection)) <= 1, "The sizes of slices should differ by at most one."
+
+
+    def test_divide_urls_with_sequence(self):
+        _urls_seq = URL(base="http://www.example.com?index={index}", start=1, end=100).sequence()
+        _urls_collection = MultiRunnableCrawler._divide_urls(urls=_urls_seq, executor_number=3)
+        assert [type(_urls_chunk) for _urls_chunk in _urls_collection] == [type(_urls_seq)] * 3, "The slices of URLSequence should also be URLSequence objects."
+        assert [_url for _urls_chunk in _urls_collection for _url in _urls_chunk] == list(_urls_seq), "It should keep all the URLs in order."
+
+
+    def test_filter_visited(self):
+        _crawler = ExecutorCrawler(mode=RunAsConcurrent, executors=3, factory=CrawlerFactory())
+        _urls = [f"{Test_Example_URL}?index={i}" for i in range(5)]
+        assert _crawler._filter_visited(_urls + _urls) == _urls + _urls, "It shouldn't filter anything without visited set."
+
+        _crawler.visited = ExactVisitedSet()
+        assert _crawler._filter_visited(_urls + _urls) == _urls, "It should remove the duplicated URLs."
+        assert _crawler._filter_visited(_urls) == [], "It should remove the URLs which have been visited."
+        try:
+            _crawler.visited = set()
+        except TypeError:
+            assert True, "It should raise TypeError if the visited set isn't a BaseVisitedSet type object."
+        else:
+            assert False, "It should raise TypeError if the visited set isn't a BaseVisitedSet type object."
+
+
+    def test_visited_with_parallel_pool(self):
+        for _visited_set in (ExactVisitedSet(), BloomVisitedSet(capacity=1000)):
+            _factory = CrawlerFactory()
+            _factory.http_factory = PooledHTTP()
+            _factory.parser_factory = Urllib3HTTPResponseParser()
+            _factory.data_handling_factory = ExampleWebDataHandler()
+            _crawler = PoolCrawler(mode=RunAsParallel, pool_size=2, factory=_factory)
+            _crawler.visited = _visited_set
+            with LocalHTTPServer() as _server, _crawler:
+                _urls = [f"{_server.url}/?index={i}" for i in range(8)]
+                _data = _crawler.map(method="GET", urls=_urls + _urls)
+            assert len(_data) == len(_urls), f"It should crawl every URL once with {type(_visited_set).__name__} in processes."
+            assert len(_server.requests) == len(_urls), "It should skip the duplicated URLs."
+
+
+    def test_rate_limiter_with_parallel_pool(self):
+        for _rate_limiter in (TokenBucketRateLimiter(rate=100, burst=4), SharedTokenBucketRateLimiter(rate=100, burst=4)):
+            _factory = CrawlerFactory()
+            _factory.http_factory = PooledHTTP()
+            _factory.http_factory.rate_limiter = _rate_limiter
+            _factory.parser_factory = Urllib3HTTPResponseParser()
+            _factory.data_handling_factory = ExampleWebDataHandler()
+            _crawler = PoolCrawler(mode=RunAsParallel, pool_size=2, factory=_factory)
+            with LocalHTTPServer() as _server, _crawler:
+                _urls = [f"{_server.url}/?index={i}" for i in range(8)]
+                _data = _crawler.map(method="GET", urls=_urls)
+            assert len(_data) == len(_urls), f"It should crawl every URL with {type(_rate_limiter).__name__} in processes."
+            assert len(_server.requests) == len(_urls), "It should send every request."
+
+
+    def test_http_io_lifecycle(self):
+        class _CountingPooledHTTP(PooledHTTP):
+            opened = 0
+            closed = 0
+
+            def open(self):
+                _CountingPooledHTTP.opened += 1
+                super().open()
+
+            def close(self):
+                _CountingPooledHTTP.closed += 1
+                super().close()
+
+        _factory = CrawlerFactory()
+        _factory.http_factory = _CountingPooledHTTP()
+        _factory.parser_factory = Urllib3HTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebDataHandler()
+        _crawler = ExecutorCrawler(mode=RunAsConcurrent, executors=2, factory=_factory)
+        with LocalHTTPServer() as _server:
+            _urls = [f"{_server.url}/?index={i}" for i in range(10)]
+            _data = _crawler.run(method="GET", url=iter(_urls), chunk_size=5)
+        assert _data is not None, "It should get some data finally."
+        assert len(_server.requests) == len(_urls), "It should crawl all the URLs."
+        assert _CountingPooledHTTP.opened == _CountingPooledHTTP.closed, "Every opening should be closed."
+        assert _CountingPooledHTTP.opened == 1 + 2 + 2 * 2 * 2, \
+            "It should open once for the run, every chunk, every worker and its batch of requests, not every request."
+        assert len(_server.connections) <= 2, "The workers should reuse the connections which are kept alive."
+
+
+    def test_run_with_urls_iterator_in_default_chunks(self):
+        _factory = CrawlerFactory()
+        _factory.http_factory = PooledHTTP()
+        _factory.parser_factory = Urllib3HTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebDataHandler()
+        _crawler = ExecutorCrawler(mode=RunAsConcurrent, executors=3, factory=_factory)
+        with LocalHTTPServer() as _server:
+            _urls = [f"{_server.url}/?index={i}" for i in range(7)]
+            _list_data = _crawler.run(method="GET", url=_urls)
+            _iter_data = _crawler.run(method="GET", url=iter(_urls))
+        assert len(_server.requests) == 2 * len(_urls), "It should crawl all the URLs."
+        assert len(_iter_data) == len(_list_data) == 3, "The iterator should be run as one chunk like the list of URLs."
+
+
+    def test_run_with_urls_frontier_after_failures(self, tmp_path):
+        class _FailingPooledHTTP(PooledHTTP):
+            failing = True
+
+            def request(self, url, method="GET", timeout=1, *args, **kwargs):
+                if _FailingPooledHTTP.failing is True and "fail" in url:
+                    return TimeoutError("Retry to run the target function running timeout.")
+                return super().request(url, method, timeout, *args, **kwargs)
+
+        class _StatusParser(Urllib3HTTPResponseParser):
+            def get_status_code(self, response):
+                return getattr(response, "status", None)
+
+        _factory = CrawlerFactory()
+        _factory.http_factory = _FailingPooledHTTP()
+        _factory.parser_factory = _StatusParser()
+        _factory.data_handling_factory = ExampleWebDataHandler()
+        _crawler = ExecutorCrawler(mode=RunAsConcurrent, executors=2, factory=_factory)
+        with LocalHTTPServer() as _server, URLFrontier(path=str(tmp_path / "frontier.db")) as _frontier:
+            _frontier.extend([f"{_server.url}/?index={i}" for i in range(6)] + [f"{_server.url}/?fail={i}" for i in range(2)])
+            _crawler.run(method="GET", url=_frontier, chunk_size=3)
+            assert _frontier.count(state=URLFrontier.Done) == 6, "Only the URLs which have been crawled successfully should be done."
+            assert len(_frontier) == 2, "The URLs which get fail should be pending again."
+
+            _FailingPooledHTTP.failing = False
+            _crawler.run(method="GET", url=_frontier, chunk_size=3)
+            assert _frontier.count(state=URLFrontier.Done) == 8, "The URLs which got fail should be crawled after resuming."
+        assert len(_server.requests) == 8, "It shouldn't crawl the URLs which are done again."
+
+
+    def test_async_http_io_lifecycle(self):
+        class _CountingAsyncHTTP(AsyncHTTP):
+            sessions = set()
+            opened = 0
+            closed = 0
+
+            async def request(self, url, method="GET", timeout=1, *args, **kwargs):
+                _CountingAsyncHTTP.sessions.add(id(self.session))
+                return await self.session.get(url)
+
+            async def open(self):
+                _CountingAsyncHTTP.opened += 1
+                await super().open()
+
+            async def close(self):
+                _CountingAsyncHTTP.closed += 1
+                await super().close()
+
+        _factory = AsyncCrawlerFactory()
+        _factory.http_factory = _CountingAsyncHTTP()
+        _factory.parser_factory = AsyncHTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebAsyncDataHandler()
+        _crawler = AsyncSimpleCrawler(executors=3, factory=_factory)
+        with LocalHTTPServer() as _server:
+            _crawler.run("GET", [f"{_server.url}/?index={i}" for i in range(12)])
+        assert len(_server.requests) == 12, "It should crawl all the URLs."
+        assert len(_CountingAsyncHTTP.sessions) == 1, "All the workers should share one session in the event loop."
+        assert _CountingAsyncHTTP.opened == _CountingAsyncHTTP.closed, "Every opening should be closed."
+        assert len(_server.connections) <= 3, "The workers should reuse the connections of the session."
+
+
+    def test_async_http_io_shared_by_map_and_run(self):
+        class _StubAsyncHTTP(AsyncHTTP):
+            sessions = set()
+
+            async def request(self, url, method="GET", timeout=1, *args, **kwargs):
+                # It responds at once, so every worker finishes before the next one starts.
+                _StubAsyncHTTP.sessions.add(self.session)
+                return url
+
+        class _StubAsyncParser(AsyncHTTPResponseParser):
+            async def get_status_code(self, response):
+                return 200
+
+            async def handling_200_response(self, response):
+                return response
+
+        _factory = AsyncCrawlerFactory()
+        _factory.http_factory = _StubAsyncHTTP()
+        _factory.parser_factory = _StubAsyncParser()
+        _factory.data_handling_factory = ExampleWebAsyncDataHandler()
+        _crawler = AsyncSimpleCrawler(executors=3, factory=_factory)
+        _urls = [f"{Test_Example_URL}?index={i}" for i in range(9)]
+
+        _data = _crawler.map("GET", _urls)
+        assert len(_data) == len(_urls), "It should crawl all the URLs."
+        assert len(_StubAsyncHTTP.sessions) == 1, "All the workers of map should share one session."
+        assert all(_session.closed for _session in _StubAsyncHTTP.sessions), "The session should be closed after map."
+        assert not _factory.http_factory._Sessions, "The last worker of map should close the session before the event loop finishes."
+
+        _StubAsyncHTTP.sessions.clear()
+        _crawler.run("GET", iter(_urls), chunk_size=len(_urls))
+        _crawler.run("GET", iter(_urls[:2]))
+        assert len(_StubAsyncHTTP.sessions) == 2, "All the workers of one run should share one session."
+        assert all(_session.closed for _session in _StubAsyncHTTP.sessions), "The sessions should be closed after run."
+
+
+    def test_retry_policy(self):
+        _factory = CrawlerFactory()
+        _factory.http_factory = PooledHTTP()
+        _factory.parser_factory = Urllib3HTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebDataHandler()
+        _crawler = SimpleCrawler(factory=_factory)
+        _crawler.retry_policy = RetryPolicy(max_retries=2, backoff=0.2, jitter=False)
+        with LocalHTTPServer() as _server:
+            _urls = [f"{_server.url}/flaky/2"] + [f"{_server.url}/?index={i}" for i in range(3)]
+            _data = _crawler.run("GET", _urls)
+        assert len(_data) == len(_urls), "It should crawl all the URLs finally."
+        assert [_path for _, _path in _server.requests] == ["/flaky/2", "/?index=0", "/?index=1", "/?index=2", "/flaky/2", "/flaky/2"], \
+            "The other URLs should be crawled while the URL waits for retrying."
+
+
+    def test_async_retry_policy(self):
+        _factory = AsyncCrawlerFactory()
+        _factory.http_factory = AsyncHTTPRequest()
+        _factory.parser_factory = AsyncHTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebAsyncDataHandler()
+        _crawler = AsyncSimpleCrawler(executors=1, factory=_factory)
+        _crawler.retry_policy = RetryPolicy(max_retries=1, backoff=10, jitter=False)
+        with LocalHTTPServer() as _server:
+            _urls = [f"{_server.url}/flaky/1?retry_after=0"] + [f"{_server.url}/?index={i}" for i in range(2)]
+            _start = time.monotonic()
+            _crawler.run("GET", _urls)
+        assert time.monotonic() - _start < 5, "It should wait the seconds of header *Retry-After* instead of the backoff."
+        assert [_path for _, _path in _server.requests].count("/flaky/1?retry_after=0") == 2, "It should retry the URL once."
+
+
+    def test_deadline(self):
+        _factory = CrawlerFactory()
+        _factory.http_factory = PooledHTTP(retries=False)
+        _factory.parser_factory = Urllib3HTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebDataHandler()
+        _crawler = SimpleCrawler(factory=_factory)
+        _crawler.retry_policy = RetryPolicy(max_retries=3, backoff=0.05, jitter=False)
+        _crawler.deadline = 0.3
+        with LocalHTTPServer() as _server:
+            _start = time.monotonic()
+            _data = _crawler.run("GET", [f"{_server.url}/delay/2000", f"{_server.url}/?index=0"])
+            assert time.monotonic() - _start < 1.5, "It should give up the URL which hangs at its deadline."
+            assert len(_data) == 1, "It should skip the URL which exceeds its deadline and crawl the others."
+
+            _crawler.deadline = None
+            with deadline_scope(0.3):
+                try:
+                    _crawler.run("GET", [f"{_server.url}/delay/2000", f"{_server.url}/?index=1"])
+                except DeadlineExceededError:
+                    assert True, "It should stop if the deadline of the whole job has been exceeded."
+                else:
+                    assert False, "It should stop if the deadline of the whole job has been exceeded."
+
+        try:
+            _crawler.deadline = 0
+        except ValueError:
+            assert True, "It should raise ValueError if the deadline isn't bigger than 0."
+        else:
+            assert False, "It should raise ValueError if the deadline isn't bigger than 0."
+
+
+    def test_parse_executor(self):
+        _factory = CrawlerFactory()
+        _factory.http_factory = PooledHTTP()
+        _factory.parser_factory = Urllib3HTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebDataHandler()
+        _crawler = SimpleCrawler(factory=_factory)
+        with LocalHTTPServer() as _server, ProcessPoolExecutor(max_workers=2) as _executor:
+            _urls = [f"{_server.url}/?index={i}" for i in range(6)]
+            _crawler.parse_executor = _executor
+            _data = _crawler.run("GET", _urls)
+            _crawler.retry_policy = RetryPolicy(max_retries=1, backoff=0.05, jitter=False)
+            _retried_data = _crawler.run("GET", [f"{_server.url}/flaky/1"] + _urls)
+        assert len(_data) == len(_urls), "The executor should parse and handle every HTTP response."
+        assert all(str(_titles) == "[<h1>Example Domain</h1>]" for _titles in _data), "It should parse the body in the executor."
+        assert len(_retried_data) == len(_urls) + 1, "It should parse the HTTP responses with the retry policy."
+
+        try:
+            _crawler.parse_executor = object()
+        except TypeError:
+            assert True, "It should raise TypeError if it isn't a *concurrent.futures.Executor* object."
+        else:
+            assert False, "It should raise TypeError if it isn't a *concurrent.futures.Executor* object."
+
+
+    def test_parse_backlog(self):
+        class _SlowDataHandler(ExampleWebDataHandler):
+            def process(self, result):
+                time.sleep(0.05)
+                return super().process(result)
+
+        class _CountingExecutor(ThreadPoolExecutor):
+            pending = 0
+            max_pending = 0
+
+            def submit(self, *args, **kwargs):
+                _future = super().submit(*args, **kwargs)
+                _CountingExecutor.pending += 1
+                _CountingExecutor.max_pending = max(_CountingExecutor.max_pending, _CountingExecutor.pending)
+                _future.add_done_callback(self._done)
+                return _future
+
+            @staticmethod
+            def _done(_future):
+                _CountingExecutor.pending -= 1
+
+        _factory = CrawlerFactory()
+        _factory.http_factory = PooledHTTP()
+        _factory.parser_factory = Urllib3HTTPResponseParser()
+        _factory.data_handling_factory = _SlowDataHandler()
+        _crawler = SimpleCrawler(factory=_factory)
+        assert _crawler.parse_backlog == 2 * (os.cpu_count() or 1), "It should be 2 times of the CPU count in default."
+        _crawler.parse_backlog = 2
+        with LocalHTTPServer() as _server, _CountingExecutor(max_workers=4) as _executor:
+            _urls = [f"{_server.url}/?index={i}" for i in range(8)]
+            _crawler.parse_executor = _executor
+            _data = _crawler.run("GET", _urls)
+        assert len(_data) == len(_urls), "The executor should parse and handle every HTTP response."
+        assert _CountingExecutor.max_pending <= 2, "It should wait for the executor if there're too many HTTP responses waiting for it."
+
+        for _backlog, _error in [("2", TypeError), (0, ValueError)]:
+            try:
+                _crawler.parse_backlog = _backlog
+            except _error:
+                assert True, f"It should raise {_error.__name__} if the parse backlog is invalid."
+            else:
+                assert False, f"It should raise {_error.__name__} if the parse backlog is invalid."
+
+
+    def test_async_parse_executor(self):
+        _factory = AsyncCrawlerFactory()
+        _factory.http_factory = AsyncHTTPRequest()
+        _factory.parser_factory = AsyncHTTPResponseParser()
+        _factory.data_handling_factory = ExampleWebAsyncDataHandler()
+        _crawler = AsyncSimpleCrawler(executors=1, factory=_factory)
+        with LocalHTTPServer() as _server, ProcessPoolExecutor(max_workers=2) as _executor:
+            _crawler.parse_executor = _executor
+            _data = _crawler.run("GET", [f"{_server.url}/?index={i}" for i in range(6)])[0].data
+        assert len(_data) == 6, "The executor should parse and handle every HTTP response."
+        assert all(str(_titles) == "[<h1>Example Domain</h1>]" for _titles in _data), "It should run the asynchronous parser in the executor."
+
+
+    def test_async_parse_executor_event_loop(self):
+        class _LoopRecordingParser(AsyncHTTPResponseParser):
+            loops = set()
+
+            async def handling_200_response(self, response):
+                _LoopRecordingParser.loops.add(id(asyncio.get_running_loop()))
+                return await super().handling_200_response(response)
+
+        _factory = AsyncCrawlerFactory()
+        _factory.http_factory = AsyncHTTPRequest()
+        _factory.parser_factory = _LoopRecordingParser()
+        _factory.data_handling_factory = ExampleWebAsyncDataHandler()
+        _crawler = AsyncSimpleCrawler(executors=1, factory=_factory)
+        with LocalHTTPServer() as _server, ThreadPoolExecutor(max_workers=1) as _executor:
+            _crawler.parse_executor = _executor
+            _data = _crawler.run("GET", [f"{_server.url}/?index={i}" for i in range(6)])[0].data
+        assert len(_data) == 6, "The executor should parse and handle every HTTP response."
+        assert len(_LoopRecordingParser.loops) == 1, "The worker of the executor should reuse its event loop."
+
+
+    def test_iter_async_url_chunks(self):
+        async def _symbols():
+            for _symbol in ["2330", "2317", "2454", "2412", "6505"]:
+                yield _symbol
+
+        _urls = URL(base="http://www.example.com?code={iterator}", iter=_symbols()).aiter_urls()
+        _urls_chunks = list(MultiRunnableCrawler._iter_async_url_chunks(urls=_urls, chunk_size=2))
+        assert list(map(len, _urls_chunks)) == [2, 2, 1], "It should take the URLs chunk by chunk."
+        assert _urls_chunks[-1] == ["http://www.example.com?code=6505"], "It should keep all the URLs in order."
+
+
+
 class TestSimpleCrawler(BaseCrawlerTestSpec):
 
     @pytest.fixture
@@ -80,6 +468,11 @@ class TestSimpleCrawler(BaseCrawlerTestSpec):
         assert result is not None, f"It should get some data finally."
 
 
+    def test_run_with_urls_iterator(self, crawler: SimpleCrawler, urls: list):
+        result = crawler.run("GET", iter(urls))
+        assert len(result) == len(urls), f"It should crawl all the URLs from the iterator."
+
+
     @pytest.mark.skip(reason="[TestSimpleCrawler.run_and_save] doesn't implement testing code.")
     def test_run_and_save(self, crawler: SimpleCrawler):
         result = crawler.run("GET", Test_Example_URL)
@@ -140,6 +533,16 @@ class TestAsyncSimpleCrawler(BaseCrawlerTestSpec):
         assert result is not None, f"It should get some data finally."
 
 
+    def test_run_with_urls_async_iterator(self, crawler: AsyncSimpleCrawler, urls: list):
+        async def _urls():
+            for _url in urls:
+                yield _url
+
+        result = crawler.run("GET", _urls())
+        assert len(result) == len(crawler.run("GET", urls)), \
+            "It should get the same result as the list of URLs from the asynchronous iterator."
+
+
     @pytest.mark.skip(reason="[TestAsyncSimpleCrawler.process_with_queue] doesn't implement testing code.")
     def test_run_with_urls_queue(self, crawler: AsyncSimpleCrawler, urls: list):
         result = crawler.run("GET", urls)
@@ -200,6 +603,31 @@ class TestExecutorCrawler(BaseCrawlerTestSpec):
         assert data is not None, f"It should get some data finally."
 
 
+    def test_run_with_urls_iterator(self, crawler: ExecutorCrawler, urls: list):
+        data = crawler.run(method="GET", url=iter(urls), lock=False, sema_value=3)
+        assert len(data) == len(crawler.run(method="GET", url=urls, lock=False, sema_value=3)), \
+            f"It should get the same result as the list of URLs from the iterator."
+
+
+    def test_run_with_urls_sequence(self, crawler: ExecutorCrawler):
+        _url = URL(base=Test_Example_URL_With_Option, start="20210801", end="20211201", formatter="yyyymmdd")
+        _url.set_period(days=31)
+        data = crawler.run(method="GET", url=_url.sequence(), lock=False, sema_value=3)
+        assert data is not None, f"It should get some data finally."
+
+
+    def test_run_with_urls_frontier(self, crawler: ExecutorCrawler, tmp_path):
+        with LocalHTTPServer() as _server, URLFrontier(path=str(tmp_path / "frontier.db")) as frontier:
+            _urls = [f"{_server.url}/?index={i}" for i in range(8)]
+            frontier.extend(_urls)
+            data = crawler.run(method="GET", url=frontier, lock=False, sema_value=3, chunk_size=3)
+            assert data is not None, f"It should crawl all the URLs from the frontier."
+            assert frontier.count(state=URLFrontier.Done) == len(_urls), f"All the URLs in the frontier should be done."
+            assert len(frontier) == 0, f"There shouldn't be any pending URL in the frontier."
+            crawler.run(method="GET", url=frontier, lock=False, sema_value=3, chunk_size=3)
+        assert len(_server.requests) == len(_urls), f"It shouldn't crawl the URLs which are done again."
+
+
     @pytest.mark.skip(reason="[TestExecutorCrawler.process_with_queue] doesn't implement testing code.")
     def test_run_with_urls_queue(self, crawler: ExecutorCrawler, urls: list):
         data = crawler.run(method="GET", url=urls, lock=False, sema_value=3)
@@ -260,6 +688,17 @@ class TestPoolCrawler(BaseCrawlerTestSpec):
         assert data is not None, f"It should get some data finally."
 
 
+    def test_map_with_urls_iterator(self, crawler: PoolCrawler):
+        with LocalHTTPServer() as _server:
+            _urls = [f"{_server.url}/?index={i}" for i in range(12)]
+            crawler.init(lock=False, sema_value=3)
+            data = crawler.map(method="GET", urls=iter(_urls), chunk_size=5)
+            crawler.close()
+
+        assert len(data) == len(_urls), f"It should crawl all the URLs from the iterator."
+        assert len(_server.requests) == len(_urls), f"It should send the HTTP request of every URL once."
+
+
     def test_map_by_python_keyword_with(self, crawler: PoolCrawler, urls: list):
         with crawler as _pc:
             _pc.init(lock=False, sema_value=3)
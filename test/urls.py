@@ -1,5 +1,11 @@
 from smoothcrawler import URL
+from smoothcrawler.urls import URLSequence, URLFrontier
+import smoothcrawler.urls as urls_module
 from datetime import datetime, date, timedelta
+import asyncio
+import types
+import io
+import sys
 import re
 
 
@@ -10,6 +16,7 @@ TEST_TARGET_URL_WITH_DATETIME = "https://www.google.com?datetime={datetime}"
 TEST_TARGET_URL_WITH_ITERATOR = "https://www.google.com?option={iterator}"
 TEST_TARGET_URL_WITH_DICT_ITERATOR = "https://www.google.com?{iterator}"
 TEST_TARGET_URL_WITH_INVALID_OPTION = "https://www.google.com?test={test}"
+TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS = "https://www.google.com?date={date}&option={iterator}"
 
 START_INDEX = 1
 END_INDEX = 10
@@ -108,6 +115,210 @@ class TestURLs:
         assert set(iter_urls_options) == set(all_dict_options), "Date options list and URL list should be the same."
 
 
+    def test_generate_with_multiple_options(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS, start=START_DATE, end=END_DATE, formatter="yyyymmdd", iter=TEST_ITERATOR_LIST)
+        multiple_options_urls = urls.generate()
+        date_urls = URL(base=TEST_TARGET_URL_WITH_DATE, start=START_DATE, end=END_DATE, formatter="yyyymmdd").generate()
+        all_dates = [TestURLs._get_url_option(url=_url, option_format=r"date=[0-9]{8}").group(0) for _url in date_urls]
+        expected_urls = [f"https://www.google.com?{_date}&option={_option}" for _date in all_dates for _option in TEST_ITERATOR_LIST]
+        assert multiple_options_urls == expected_urls, "It should generate the cartesian product of all the options and the former option is the outer one."
+
+        urls_seq = urls.sequence()
+        assert len(urls_seq) == len(expected_urls), "The size of sequence should be the product of the sizes of all the options."
+        assert list(urls_seq) == expected_urls, "The URLs of sequence should be the same as the generated ones."
+        assert urls_seq[len(TEST_ITERATOR_LIST) + 1] == expected_urls[len(TEST_ITERATOR_LIST) + 1], "It should get the URL by index."
+
+
+    def test_generate_with_repeated_option(self):
+        urls = URL(base="https://www.test.com?start={index}&end={index}&page={page}", start=START_INDEX, end=END_INDEX)
+        index_urls = urls.generate()
+        assert index_urls == [f"https://www.test.com?start={i}&end={i}&page={{page}}" for i in range(START_INDEX, END_INDEX + 1)], \
+            "The same option should be rendered by the same value and other characters should be kept."
+
+
+    def test_generate_with_multiple_range_options(self):
+        urls = URL(base="https://www.test.com?date={date}&index={index}", start=START_INDEX, end=END_INDEX)
+        index_urls = urls.generate()
+        assert index_urls == [f"https://www.test.com?date={{date}}&index={i}" for i in range(START_INDEX, END_INDEX + 1)], \
+            "The index option should be generated and the other options which use *start* and *end* should be kept."
+
+
+    def test_resolve_formatter(self):
+        for formatter in ["yyyymmdd", "yyyy/mm/dd", "yyyy-mm-dd HH:MM:SS", "%Y%m%d"]:
+            if URL._is_py_datetime_format(formatter=formatter):
+                expected_format = formatter
+            else:
+                expected_format = URL._convert_formatter(formatter=formatter)
+            assert URL._resolve_formatter(formatter=formatter, rule="DATE") == (expected_format, "%Y%m%d"), "It should resolve the same format as before."
+            assert URL._resolve_formatter(formatter=formatter, rule="DATETIME") == (expected_format, "%Y%m%d%H%M%S"), "It should resolve the same format as before."
+
+        hits = URL._resolve_formatter.cache_info().hits
+        for _ in range(3):
+            URL(base=TEST_TARGET_URL_WITH_DATE, start=START_DATE, end=END_DATE).generate()
+        assert URL._resolve_formatter.cache_info().hits > hits, "It should resolve the same formatter from cache."
+
+    def test_iter_urls(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_DATE, start=START_DATE, end=END_DATE, formatter="yyyymmdd")
+        urls_iter = urls.iter_urls()
+        assert isinstance(urls_iter, types.GeneratorType), "It should return a generator which generates URLs lazily."
+        assert list(urls_iter) == urls.generate(), "The URLs from generator should be the same as the list one."
+
+        urls = URL(base=TEST_TARGET_URL_WITH_ITERATOR, iter=TEST_ITERATOR_LIST)
+        assert list(urls.iter_urls()) == urls.generate(), "The URLs from generator should be the same as the list one."
+
+
+    def test_iter_urls_over_recursion_limit(self):
+        end_index = sys.getrecursionlimit() * 3
+        urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=end_index)
+        index_urls = list(urls.iter_urls())
+        assert len(index_urls) == end_index, "It should generate all the URLs without any recursion limitation."
+        assert index_urls[-1] == TEST_TARGET_URL_WITH_INDEX.replace("{index}", str(end_index)), "The last URL should be the end index one."
+
+        urls = URL(base=TEST_TARGET_URL_WITH_DATETIME, start="2021/10/01 00:00:00", end="2021/10/01 02:00:00", formatter="yyyy/mm/dd HH:MM:SS")
+        urls.set_period(days=0, hours=0, minutes=0, seconds=1)
+        datetime_urls = urls.generate()
+        assert len(datetime_urls) == 2 * 60 * 60 + 1, "It should generate all the URLs without any recursion limitation."
+        assert datetime_urls[-1] == TEST_TARGET_URL_WITH_DATETIME.replace("{datetime}", "20211001020000"), "The last URL should be the end datetime one."
+
+
+    def test_sequence(self):
+        index_urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX)
+        date_urls = URL(base=TEST_TARGET_URL_WITH_DATE, start=START_DATE, end=END_DATE, formatter="yyyymmdd")
+        date_urls.set_period(days=3)
+        datetime_urls = URL(base=TEST_TARGET_URL_WITH_DATETIME, start=START_DATETIME, end=END_DATETIME, formatter="yyyy/mm/dd HH:MM:SS")
+        datetime_urls.set_period(days=0, hours=0, minutes=20, seconds=0)
+        iterator_urls = URL(base=TEST_TARGET_URL_WITH_ITERATOR, iter=TEST_ITERATOR_LIST)
+        dict_iterator_urls = URL(base=TEST_TARGET_URL_WITH_DICT_ITERATOR, iter=TEST_ITERATOR_DICT)
+
+        for urls in [index_urls, date_urls, datetime_urls, iterator_urls, dict_iterator_urls]:
+            urls_seq = urls.sequence()
+            all_urls = list(urls.iter_urls())
+            assert isinstance(urls_seq, URLSequence), "It should return a URLSequence object."
+            assert len(urls_seq) == len(all_urls), "The size of sequence should be the same as the amount of URLs."
+            assert list(urls_seq) == all_urls, "The URLs of sequence should be the same as the generated ones."
+            assert urls_seq[0] == all_urls[0] and urls_seq[-1] == all_urls[-1], "It should get the URL by index."
+            assert isinstance(urls_seq[1:5], URLSequence), "The slice of sequence should also be a URLSequence object."
+            assert list(urls_seq[1:5]) == all_urls[1:5], "The URLs of slice should be the same as the slice of generated ones."
+            assert list(urls_seq[::2]) == all_urls[::2], "The URLs of slice should be the same as the slice of generated ones."
+
+
+    def test_sequence_with_large_range(self):
+        end_index = 10 ** 12
+        urls_seq = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=end_index).sequence()
+        assert len(urls_seq) == end_index, "It should calculate the size without generating the URLs."
+        assert urls_seq[-1] == TEST_TARGET_URL_WITH_INDEX.replace("{index}", str(end_index)), "It should calculate the URL by index."
+        assert urls_seq[10 ** 6] == TEST_TARGET_URL_WITH_INDEX.replace("{index}", str(10 ** 6 + 1)), "It should calculate the URL by index."
+        assert len(urls_seq[10:end_index:3]) == len(range(10, end_index, 3)), "It should calculate the size of slice without generating the URLs."
+
+
+    def test_shard(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_DATE, start=START_DATE, end=END_DATE, formatter="yyyymmdd")
+        all_urls = urls.generate()
+        shard_count = 3
+
+        for strided in [False, True]:
+            shards = [urls.shard(shard_index=i, shard_count=shard_count, strided=strided) for i in range(shard_count)]
+            sharded_urls = [_url for _shard in shards for _url in _shard]
+            assert len(sharded_urls) == len(all_urls), "All the shards should cover all the URLs without any duplicated one."
+            assert set(sharded_urls) == set(all_urls), "All the shards should cover all the URLs without any duplicated one."
+            assert max(map(len, shards)) - min(map(len, shards)) <= 1, "The sizes of shards should differ by at most one."
+
+        assert list(urls.shard(shard_index=0, shard_count=shard_count)) == all_urls[:7], "The contiguous shard should be a slice of URLs."
+        assert list(urls.shard(shard_index=1, shard_count=shard_count, strided=True)) == all_urls[1::shard_count], "The strided shard should take the URL every *shard_count* URLs."
+
+
+    def test_shard_with_invalid_options(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX)
+        for shard_index, shard_count in [(-1, 3), (3, 3), (0, 0)]:
+            try:
+                urls.shard(shard_index=shard_index, shard_count=shard_count)
+            except ValueError:
+                assert True, "It should raise ValueError if the options are invalid."
+            else:
+                assert False, "It should raise ValueError if the options are invalid."
+
+
+
+    def test_iter_url_chunks(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_DATETIME, start=START_DATETIME, end=END_DATETIME, formatter="yyyy/mm/dd HH:MM:SS")
+        urls.set_period(days=0, hours=0, minutes=0, seconds=7)
+        urls_chunks = list(urls.iter_url_chunks(chunk_size=1000))
+        assert all(len(_chunk) == 1000 for _chunk in urls_chunks[:-1]), "Every chunk except the last one should be full."
+        assert [_url for _chunk in urls_chunks for _url in _chunk] == urls.generate(), "The URLs of all chunks should be the same as generate."
+
+        date_urls = URL(base=TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS, start=START_DATE, end=END_DATE, iter=TEST_ITERATOR_LIST)
+        date_urls_chunks = list(date_urls.iter_url_chunks(chunk_size=7))
+        assert [_url for _chunk in date_urls_chunks for _url in _chunk] == date_urls.generate(), "The URLs of all chunks should be the same as generate."
+
+
+    def test_iter_url_chunks_without_numpy(self):
+        numpy = urls_module._numpy
+        urls_module._numpy = None
+        try:
+            urls = URL(base=TEST_TARGET_URL_WITH_DATETIME, start=START_DATETIME, end=END_DATETIME, formatter="yyyy/mm/dd HH:MM:SS")
+            urls.set_period(days=0, hours=0, minutes=0, seconds=7)
+            fallback_urls = [_url for _chunk in urls.iter_url_chunks(chunk_size=1000) for _url in _chunk]
+        finally:
+            urls_module._numpy = numpy
+        urls_seq = urls.sequence()
+        assert fallback_urls == [urls_seq[_index] for _index in range(len(urls_seq))], "The URLs in pure Python should be the same as the ones calculated one by one."
+        assert fallback_urls == urls.generate(), "The URLs in pure Python should be the same as generate."
+
+
+
+    def test_iter_urls_with_generator(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS, start=START_DATE, end=END_DATE, iter=(_i for _i in TEST_ITERATOR_LIST))
+        generator_urls = list(urls.iter_urls())
+        all_urls = URL(base=TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS, start=START_DATE, end=END_DATE, iter=TEST_ITERATOR_LIST).generate()
+        assert len(generator_urls) == len(all_urls), "It should generate the cartesian product with the generator."
+        assert set(generator_urls) == set(all_urls), "It should generate the same URLs as the list."
+        assert generator_urls[0].endswith(f"option={TEST_ITERATOR_LIST[0]}") and generator_urls[1].endswith(f"option={TEST_ITERATOR_LIST[0]}"), \
+            "The generator should be the outermost loop because it could only be iterated once."
+        assert list(urls.iter_urls()) == [], "The generator could only be consumed once."
+
+
+    def test_iter_urls_with_file(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_ITERATOR, iter=io.StringIO("".join(f"{_i}\n" for _i in TEST_ITERATOR_LIST)))
+        urls_chunks = list(urls.iter_url_chunks(chunk_size=4))
+        assert list(map(len, urls_chunks)) == [4, 4, 1], "It should take the URLs chunk by chunk."
+        assert [_url for _chunk in urls_chunks for _url in _chunk] == [f"{TEST_TARGET_URL}?option={_i}" for _i in TEST_ITERATOR_LIST], \
+            "It should use the lines of file without line endings."
+
+
+    def test_iter_urls_with_generator_of_values_with_line_endings(self):
+        _values = ["a\n", "b\r\n", "c"]
+        urls = URL(base=TEST_TARGET_URL_WITH_ITERATOR, iter=(_value for _value in _values))
+        assert list(urls.iter_urls()) == URL(base=TEST_TARGET_URL_WITH_ITERATOR, iter=_values).generate(), \
+            "The generator should generate the same URLs as the list of the same values."
+
+
+    def test_aiter_urls(self):
+        async def _options():
+            for _i in TEST_ITERATOR_LIST:
+                yield _i
+
+        async def _collect(urls: URL):
+            return [_url async for _url in urls.aiter_urls()]
+
+        urls = URL(base=TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS, start=START_DATE, end=END_DATE, iter=_options())
+        async_urls = asyncio.run(_collect(urls))
+        all_urls = URL(base=TEST_TARGET_URL_WITH_MULTIPLE_OPTIONS, start=START_DATE, end=END_DATE, iter=TEST_ITERATOR_LIST).generate()
+        assert set(async_urls) == set(all_urls) and len(async_urls) == len(all_urls), "It should generate the same URLs as the list."
+
+        index_urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX)
+        assert asyncio.run(_collect(index_urls)) == index_urls.generate(), "It should also work without asynchronous iterable object."
+
+
+    def test_sequence_with_generator(self):
+        urls = URL(base=TEST_TARGET_URL_WITH_ITERATOR, iter=(_i for _i in TEST_ITERATOR_LIST))
+        try:
+            urls.sequence()
+        except TypeError:
+            assert True, "It should raise TypeError because a generator cannot be accessed randomly."
+        else:
+            assert False, "It should raise TypeError because a generator cannot be accessed randomly."
+
+
     @staticmethod
     def _get_url_options(urls, option_format):
         urls_options = []
@@ -145,3 +356,74 @@ class TestURLs:
         d2 = date(e_year, e_month, e_day)
         return d1, d2
 
+
+
+
+class TestURLFrontier:
+
+    def test_extend_and_take(self, tmp_path):
+        urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX)
+        with URLFrontier(path=str(tmp_path / "frontier.db"), batch_size=3) as frontier:
+            assert frontier.extend(urls.iter_urls()) == END_INDEX, "It should take all the URLs."
+            assert frontier.extend(urls.generate()) == END_INDEX, "It should take all the URLs."
+            assert frontier.count() == END_INDEX, "It should ignore the URLs which already are in the frontier."
+
+            taken_urls = frontier.take(4)
+            assert taken_urls == urls.generate()[:4], "It should take the URLs in the order they were added."
+            assert frontier.count(state=URLFrontier.In_Flight) == 4, "The taken URLs should be in-flight."
+            frontier.complete(taken_urls[:2])
+            frontier.release(taken_urls[2:])
+            assert frontier.count(state=URLFrontier.Done) == 2, "The completed URLs should be done."
+            assert len(frontier) == END_INDEX - 2, "The released URLs should be pending again."
+
+
+    def test_iter_batches(self, tmp_path):
+        urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX)
+        with URLFrontier(path=str(tmp_path / "frontier.db")) as frontier:
+            frontier.extend(urls.sequence())
+            batches = []
+            for _batch in frontier.iter_batches(batch_size=4):
+                assert frontier.count(state=URLFrontier.In_Flight) == len(_batch), "Only current batch should be in-flight."
+                batches.append(_batch)
+            assert [_url for _batch in batches for _url in _batch] == urls.generate(), "It should take all the URLs in order."
+            assert frontier.count(state=URLFrontier.Done) == END_INDEX, "All the URLs should be done."
+
+            frontier.extend([f"{TEST_TARGET_URL}?index=0"])
+            batches = frontier.iter_batches(batch_size=4)
+            next(batches)
+            batches.close()
+            assert len(frontier) == 1, "The batch should be pending again if it's closed early."
+
+
+    def test_iter_batches_with_released_urls(self, tmp_path):
+        urls = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX)
+        with URLFrontier(path=str(tmp_path / "frontier.db")) as frontier:
+            frontier.extend(urls.sequence())
+            batches = []
+            for _batch in frontier.iter_batches(batch_size=4):
+                frontier.release(_batch[:1])
+                batches.append(_batch)
+            assert [_url for _batch in batches for _url in _batch] == urls.generate(), "It shouldn't take the released URLs again."
+            assert frontier.count(state=URLFrontier.Done) == END_INDEX - len(batches), "Only the URLs which aren't released should be done."
+
+            resumed_urls = [_url for _batch in frontier.iter_batches(batch_size=4) for _url in _batch]
+            assert resumed_urls == [_batch[0] for _batch in batches], "The released URLs should be taken after resuming."
+            assert frontier.count(state=URLFrontier.Done) == END_INDEX, "All the URLs should be done."
+
+
+    def test_resume(self, tmp_path):
+        path = str(tmp_path / "frontier.db")
+        urls_seq = URL(base=TEST_TARGET_URL_WITH_INDEX, start=START_INDEX, end=END_INDEX).sequence()
+
+        frontier = URLFrontier(path=path, batch_size=3)
+        assert frontier.extend(urls_seq[:5], cursor="index") == 5, "It should take the URLs of the slice."
+        assert frontier.take(2) == list(urls_seq[:2]), "It should take the URLs in the order they were added."
+        frontier.close()
+
+        with URLFrontier(path=path, batch_size=3) as frontier:
+            assert len(frontier) == 5, "The in-flight URLs should be pending again after it's opened."
+            assert frontier.cursor("index") == 5, "It should record the resume cursor."
+            assert frontier.extend(urls_seq, cursor="index") == END_INDEX - 5, "It should resume from the cursor."
+            assert frontier.cursor("index") == END_INDEX, "It should record the resume cursor."
+            assert frontier.extend(iter(urls_seq), cursor="index") == 0, "It should skip all the taken URLs."
+            assert frontier.count() == END_INDEX, "It should have all the URLs."